@@ -0,0 +1,184 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Running many compiled programs, e.g. to re-validate a stored dataset.
+
+A job is self-contained: the Wasm bytes, the initial memory and the host functions to import besides the memory. Jobs
+are run in chunks on a pool of workers and the results are streamed back in the order of the jobs. Worker processes
+isolate crashes of the runtime, a chunk whose worker died is run again job by job, so only the job that crashes is
+reported as failed. Worker threads avoid the process overhead. wasmtime releases the GIL while it compiles and runs
+code, but host functions and the Python glue around every call still hold it.
+"""
+
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Generator, Iterable, List
+from wasmtime import Func, FuncType, Instance, Memory, MemoryType, Limits, ValType
+from core.module_cache import ModuleCache
+from core.runner import WasmRunner, invoke
+
+VALUE_TYPES = {"i32": ValType.i32, "i64": ValType.i64, "f32": ValType.f32, "f64": ValType.f64,
+               "funcref": ValType.funcref, "externref": ValType.externref}
+
+
+class ImportSpec:
+    """
+    A host function imported from the env module. The callback must be picklable to run in worker processes, e.g. a
+    module level function.
+    """
+
+    def __init__(self, name: str, params: List[str], results: List[str], callback: Callable):
+        self.name = name
+        self.params = params
+        self.results = results
+        self.callback = callback
+
+
+class ExecutionJob:
+    """
+    A compiled program to run. The key identifies the job in its result, e.g. the seed of the program.
+    """
+
+    def __init__(self, wasm: bytes, initial_memory: bytes, imports: List[ImportSpec] = None,
+                 start_function: str = "run", key: Any = None):
+        self.wasm = wasm
+        self.initial_memory = initial_memory
+        self.imports = imports or []
+        self.start_function = start_function
+        self.key = key
+
+
+class ExecutionResult:
+    """
+    The result of a job. The memory diff lists the (offset, initial byte, final byte) of every byte of the initial
+    memory that the program changed. If the job failed, error holds the reason and the other fields are empty.
+    """
+
+    def __init__(self, key: Any, fuel: int | None, return_values: tuple, memory_diff: List[tuple[int, int, int]],
+                 error: str | None = None):
+        self.key = key
+        self.fuel = fuel
+        self.return_values = return_values
+        self.memory_diff = memory_diff
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def job_from_result(result) -> ExecutionJob:
+    """
+    Returns the job that runs a stored generator result again, keyed by its seed.
+    """
+    return ExecutionJob(bytes(result.byte_code), bytes(result.initial_memory), key=result.seed)
+
+
+def memory_diff(initial: bytes, final: bytes) -> List[tuple[int, int, int]]:
+    if initial == final:
+        return []
+    return [(offset, before, after) for offset, (before, after) in enumerate(zip(initial, final)) if before != after]
+
+
+def execute_job(job: ExecutionJob, runner: WasmRunner) -> ExecutionResult:
+    """
+    Runs a job on a runner. Traps and invalid modules are reported in the result.
+    """
+    try:
+        module = runner.compile(job.wasm)
+        store = runner.get_store()
+        memory = Memory(store, MemoryType(Limits(1, 1)))
+        memory.write(store, job.initial_memory, 0)
+        imports = [Func(store, FuncType([VALUE_TYPES[t]() for t in spec.params],
+                                        [VALUE_TYPES[t]() for t in spec.results]), spec.callback)
+                   for spec in job.imports]
+        imports.append(memory)
+        instance = Instance(store, module, imports)
+        fuel, return_values = invoke(store, instance, job.start_function)
+        final_memory = memory.read(store, 0, len(job.initial_memory))
+    except Exception as e:
+        runner.discard_store()
+        return ExecutionResult(job.key, None, (), [], f"{type(e).__name__}: {e}")
+    return ExecutionResult(job.key, fuel, return_values, memory_diff(job.initial_memory, final_memory))
+
+
+_local = threading.local()
+
+
+def _execute_chunk(jobs: List[ExecutionJob], module_cache_dir: str | None) -> List[ExecutionResult]:
+    """
+    Runs a chunk of jobs in a worker. Stores can not be shared between threads, so every worker has its own runner.
+    """
+    runner = getattr(_local, "runner", None)
+    if runner is None:
+        runner = _local.runner = WasmRunner(
+            module_cache=None if module_cache_dir is None else ModuleCache(module_cache_dir))
+    return [execute_job(job, runner) for job in jobs]
+
+
+def run_batch(jobs: Iterable[ExecutionJob], workers: int = None, use_threads: bool = False,
+              chunk_size: int = 32, module_cache_dir: str = None) -> Generator[ExecutionResult, Any, None]:
+    """
+    Runs the jobs on a pool of workers and yields their results in the order of the jobs. The jobs are split into
+    chunks of chunk_size and only a few chunks per worker are pending at any time, so the jobs may be an endless or
+    lazily read stream. If module_cache_dir is given, the workers share an on-disk cache of the compiled modules
+    there, see core.module_cache, otherwise the configured cache is used. With processes, the workers are spawned, so
+    scripts using this need an if __name__ == "__main__" guard.
+    """
+    workers = workers or os.cpu_count()
+    jobs = iter(jobs)
+
+    def new_executor() -> Executor:
+        if use_threads:
+            return ThreadPoolExecutor(workers)
+        # Forking a process that already ran wasmtime can deadlock, so the workers are started fresh
+        return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def next_chunk() -> List[ExecutionJob]:
+        chunk = []
+        for job in jobs:
+            chunk.append(job)
+            if len(chunk) == chunk_size:
+                break
+        return chunk
+
+    executor = new_executor()
+    max_pending = workers * 4
+    pending = deque()
+
+    def submit_chunks():
+        while len(pending) < max_pending:
+            chunk = next_chunk()
+            if not chunk:
+                return
+            pending.append((chunk, executor.submit(_execute_chunk, chunk, module_cache_dir)))
+
+    try:
+        submit_chunks()
+        while pending:
+            chunk, future = pending.popleft()
+            try:
+                results = future.result()
+            except BrokenProcessPool:
+                # The pool is unusable once a worker died, rerun the pending chunks in a new one
+                executor.shutdown(cancel_futures=True)
+                executor = new_executor()
+                results = []
+                for job in chunk:
+                    try:
+                        results.extend(executor.submit(_execute_chunk, [job], module_cache_dir).result())
+                    except BrokenProcessPool:
+                        executor.shutdown(cancel_futures=True)
+                        executor = new_executor()
+                        results.append(ExecutionResult(job.key, None, (), [], "Worker crashed"))
+                pending = deque((pending_chunk, executor.submit(_execute_chunk, pending_chunk, module_cache_dir))
+                                for pending_chunk, _ in pending)
+            yield from results
+            submit_chunks()
+    finally:
+        executor.shutdown(cancel_futures=True)
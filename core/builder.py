@@ -1,23 +1,30 @@
 # SPDX-License-Identifier: MIT
 # SPDX-FileCopyrightText: 2025 Siemens AG
 
+import multiprocessing
+import os
 import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import count
 from typing import Generator, Any, List, Type
-from config.config import MEMORY_MAX_WRITE_INDEX
-from core.constraints import ByteCodeSizeConstraint, FuelConstraint, ConstraintsViolatedError
+from core.config.config import MEMORY_MAX_WRITE_INDEX
+from core.constraints import ByteCodeSizeConstraint, FuelConstraint, ResponseTimeConstraint, ConstraintsViolatedError
 from core.converter import global_state_to_wat_program
+from core.dedup import SeenSet, canonical_program_hash
 from core.debug.debugger import print_trace
 from core.formater import add_line_numbers_to_code
 from core.loader import TileLoader
-from core.runner import run_global_state, wat_code_to_wasm, AbstractRunResult
+from core.runner import run_global_state, global_state_to_wasm_bytes, check_response_time, AbstractRunResult, \
+    PerformanceMetric
 from core.state.stack import StackOverflowError, StackValueError
 from core.state.state import GlobalState
-from core.strategy import AbstractSelectionStrategy
-from core.util import generate_function, apply_function
+from core.strategy import AbstractSelectionStrategy, RandomSelectionStrategy
+from core.util import generate_function, apply_function, NoTilesLeftException
 from core.value import Val
 
 random.seed(0)
-tile_loader = TileLoader("core/instructions/")
+tile_loader = TileLoader("core/instructions/", RandomSelectionStrategy())
 
 
 class GeneratorResult:
@@ -25,7 +32,7 @@ class GeneratorResult:
     Represents the result of a code generation attempt, including metadata.
     """
     def __init__(self, seed: int, code_str: str, byte_code: bytearray, run_result: AbstractRunResult,
-                 initial_memory: bytearray, canary_output=None):
+                 initial_memory: bytearray, canary_output=None, program_hash: bytes = None):
         if canary_output is None:
             canary_output = []
         self.seed = seed
@@ -34,6 +41,12 @@ class GeneratorResult:
         self.initial_memory = initial_memory
         self.abstract_run_result = run_result
         self.canary_output = canary_output
+        # Canonical hash of the program, only set if it was checked against a seen set
+        self.program_hash = program_hash
+
+    def __reduce__(self):
+        return GeneratorResult, (self.seed, self.code_str, self.byte_code, self.abstract_run_result,
+                                 self.initial_memory, self.canary_output, self.program_hash)
 
     def __dict__(self):
         return {
@@ -45,63 +58,162 @@ class GeneratorResult:
             "canary_output": self.canary_output
         }
 
-def generate_code(start_seed: int, min_byte_code_size: int = 20, max_byte_code_size: int = 512, min_fuel: int = 0,
-                  max_fuel: int = 2000, verbose: bool = False, selection_strategy: AbstractSelectionStrategy = None,
-                  input_types: List[Type[Val]] = None, output_types: List[Type[Val]] = None) -> \
-Generator[GeneratorResult, Any, None]:
+def generate_program(seed: int, min_byte_code_size: int = 20, max_byte_code_size: int = 512, min_fuel: int = 0,
+                     max_fuel: int = 2000, verbose: bool = False, selection_strategy: AbstractSelectionStrategy = None,
+                     input_types: List[Type[Val]] = None, output_types: List[Type[Val]] = None,
+                     seen_set: SeenSet = None, retry_budget: int = None,
+                     metric: PerformanceMetric = PerformanceMetric.FUEL, min_response_time: float = 0,
+                     max_response_time: float = float("inf")) -> GeneratorResult | None:
     """
-    Generator that yields generated code snippets along with their metadata.
-    Each generated code snippet adheres to the specified constraints on bytecode size and fuel consumption.
+    Generates a single program from the given seed. Returns None if the seed is rejected by the constraints. The
+    result only depends on the seed and the arguments. If a seen set is given, programs that are structurally equal to
+    a program in it are rejected as well, before they are compiled and run. retry_budget overrides
+    GENERATION_RETRY_BUDGET, the number of failed nested blocks and functions that are regenerated before the seed is
+    rejected. With PerformanceMetric.RESPONSE_TIME, the response time of the program is measured and the seed is
+    rejected if it is outside [min_response_time, max_response_time] seconds.
     """
-
+    if metric == PerformanceMetric.ENERGY:
+        raise ValueError("Energy can not be measured, use PerformanceMetric.FUEL or RESPONSE_TIME")
     if input_types is None:
         input_types = []
 
     if output_types is None:
         output_types = []
 
-    while True:
-        start_seed = start_seed + 1
+    if selection_strategy is None:
+        selection_strategy = tile_loader.selection_strategy
+
+    if verbose:
+        print(f"Seed: {seed}")
+    try:
+        random.seed(seed)
+        global_state = GlobalState()
+        if retry_budget is not None:
+            global_state.retry_budget = retry_budget
+        global_state.constraints.add(ByteCodeSizeConstraint(min_byte_code_size, max_byte_code_size))
+        global_state.constraints.add(FuelConstraint(min_fuel, max_fuel))
+        if metric == PerformanceMetric.RESPONSE_TIME:
+            global_state.constraints.add(ResponseTimeConstraint(min_response_time, max_response_time))
+        global_state.stack.push_frame(params=None, stack=[], name="origin")
+        generate_function(tile_loader, "run", input_types, global_state, selection_strategy=selection_strategy,
+                          is_entry=True, fixed_output_types=output_types)
+        program_hash = None
+        if seen_set is not None:
+            program_hash = canonical_program_hash(global_state)
+            if not seen_set.add(program_hash):
+                if verbose:
+                    print("Duplicate program")
+                return None
+
+        global_state.memory.reinit_memory()
+        code_str = global_state_to_wat_program(global_state)
+        apply_function(global_state.functions.get("run"),global_state)
+
         if verbose:
-            print(f"Seed: {start_seed}")
-        try:
-            random.seed(start_seed)
-            global_state = GlobalState()
-            global_state.constraints.add(ByteCodeSizeConstraint(min_byte_code_size, max_byte_code_size))
-            global_state.constraints.add(FuelConstraint(min_fuel, max_fuel))
-            global_state.stack.push_frame(params=None, stack=[], name="origin")
-            f=generate_function(tile_loader, "run", input_types, global_state, selection_strategy=selection_strategy,
-                              is_entry=True, fixed_output_types=output_types)
-
-            global_state.memory.reinit_memory()
-            code_str = global_state_to_wat_program(global_state)
-            print(code_str)
-            apply_function(global_state.functions.get("run"),global_state)
             print(global_state.memory)
+            print(add_line_numbers_to_code(code_str))
+        try:
+            result = run_global_state(global_state, metric=metric)
+        except Exception as e:
+            print(f"Error: {e}")
+            global_state.memory.memory = bytearray(global_state.memory.initial_values[:MEMORY_MAX_WRITE_INDEX])
+            print_trace(global_state, entry_function="run", start_seed=seed)
+            raise e
+        check_response_time(global_state, result)
+        byte_code = global_state_to_wasm_bytes(global_state)
+        if verbose:
+            print(f"Fuel consumption: {result}")
+            print(f"Byte code size: {len(byte_code)}")
 
-            if verbose:
-                print(code_str)
-                print(add_line_numbers_to_code(code_str))
-            try:
-                result = run_global_state(global_state)
-            except Exception as e:
-                print(f"Error: {e}")
-                global_state.memory.memory = bytearray(global_state.memory.initial_values[:MEMORY_MAX_WRITE_INDEX])
-                print_trace(global_state, entry_function="run", start_seed=start_seed)
-                raise e
-            byte_code = wat_code_to_wasm(code_str)
-            if verbose:
-                print(f"Fuel consumption: {result}")
-                print(f"Byte code size: {len(byte_code)}")
+        canary_output = global_state.canary_output
 
+        return GeneratorResult(seed, code_str, byte_code, result,
+                               global_state.memory.initial_values[:MEMORY_MAX_WRITE_INDEX], canary_output, program_hash)
+    except (ConstraintsViolatedError, NoTilesLeftException, StackOverflowError, StackValueError):
+        if verbose:
+            print("Constraints violated")
+        return None
 
 
-            canary_output = global_state.canary_output
+def generate_code(start_seed: int, min_byte_code_size: int = 20, max_byte_code_size: int = 512, min_fuel: int = 0,
+                  max_fuel: int = 2000, verbose: bool = False, selection_strategy: AbstractSelectionStrategy = None,
+                  input_types: List[Type[Val]] = None, output_types: List[Type[Val]] = None,
+                  seen_set: SeenSet = None, retry_budget: int = None,
+                  metric: PerformanceMetric = PerformanceMetric.FUEL, min_response_time: float = 0,
+                  max_response_time: float = float("inf")) -> Generator[GeneratorResult, Any, None]:
+    """
+    Generator that yields generated code snippets along with their metadata.
+    Each generated code snippet adheres to the specified constraints on bytecode size and fuel consumption.
+    Duplicates of programs in the seen set, if given, are skipped. The metric and the response time window are
+    passed to generate_program.
+    """
+    while True:
+        start_seed = start_seed + 1
+        result = generate_program(start_seed, min_byte_code_size, max_byte_code_size, min_fuel, max_fuel, verbose,
+                                  selection_strategy, input_types, output_types, seen_set, retry_budget, metric,
+                                  min_response_time, max_response_time)
+        if result is not None:
+            yield result
 
-            yield GeneratorResult(start_seed, code_str, byte_code, result,
-                                  global_state.memory.initial_values[:MEMORY_MAX_WRITE_INDEX], canary_output)
-        except (ConstraintsViolatedError, StackOverflowError, StackValueError):
-            if verbose:
-                print("Constraints violated")
-            continue
 
+def _generate_shard(seeds: range, kwargs: dict, dedup: bool) -> List[GeneratorResult]:
+    """
+    Generates the programs of a shard of seeds in a worker process. With dedup, the programs are hashed and duplicates
+    within the shard are dropped. Duplicates across shards are dropped by the parent.
+    """
+    if dedup:
+        kwargs = dict(kwargs, seen_set=SeenSet(capacity=len(seeds)))
+    results = []
+    for seed in seeds:
+        result = generate_program(seed, **kwargs)
+        if result is not None:
+            results.append(result)
+    return results
+
+
+def generate_code_parallel(start_seed: int, seed_count: int = None, processes: int = None, shard_size: int = 8,
+                           ordered: bool = True, seen_set: SeenSet = None,
+                           **kwargs) -> Generator[GeneratorResult, Any, None]:
+    """
+    Like generate_code, but generates the programs in a pool of worker processes. The seeds after start_seed are split
+    into shards of shard_size consecutive seeds. Idle workers pick up the next pending shard, so seeds with many rejected
+    attempts do not hold up the other workers. Every result only depends on its seed, so the programs are the same as
+    with generate_code. If ordered is true, the results are yielded in seed order, otherwise as soon as their shard
+    is finished. Generates seed_count seeds, or runs forever if seed_count is None. The keyword arguments are passed to
+    generate_program and must be picklable. The workers are spawned, so scripts using this need an
+    if __name__ == "__main__" guard. The seen set is only written by this process: the workers hash their programs and
+    duplicates are dropped here as the results come back. Unlike with generate_code, programs that are rejected after
+    hashing do not enter the seen set.
+    """
+    end_seed = None if seed_count is None else start_seed + 1 + seed_count
+    firsts = count(start_seed + 1, shard_size) if end_seed is None else range(start_seed + 1, end_seed, shard_size)
+    shards = (range(first, first + shard_size if end_seed is None else min(first + shard_size, end_seed))
+              for first in firsts)
+    processes = processes or os.cpu_count()
+    # Forking a process that already ran wasmtime can deadlock, so the workers are started fresh
+    with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn")) as executor:
+        # Only a few shards per worker are pending at any time, so an endless run does not queue up endless work
+        max_pending = processes * 4
+        pending = deque()
+
+        def submit_shards():
+            while len(pending) < max_pending:
+                shard = next(shards, None)
+                if shard is None:
+                    return
+                pending.append(executor.submit(_generate_shard, shard, kwargs, seen_set is not None))
+
+        submit_shards()
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [future for future in pending if future in finished]
+                for future in done:
+                    pending.remove(future)
+            for future in done:
+                for result in future.result():
+                    if seen_set is None or seen_set.add(result.program_hash):
+                        yield result
+            submit_shards()
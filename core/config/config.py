@@ -25,6 +25,19 @@ BOUNDED_LOOP_MIN = 10 # The minimum repetition count for bounded loops
 BOUNDED_LOOP_MAX = 100 # The maximum repetition count for bounded loops
 UNBOUNDED_LOOP_MIN = 1
 UNBOUNDED_LOOP_MAX = 100
+FEASIBILITY_CACHE_SIZE = 4096 # The maximum number of cached function call feasibility results per module
+GENERATION_RETRY_BUDGET = 0 # How often a failed nested block or function may be regenerated per program. 0 restarts the whole program instead
+MIN_TILE_BYTE_CODE_SIZE = 1 # Lower bound of the byte code size of any tile, used to prune tiles that can not lead to a finished program
+MIN_TILE_FUEL_COST = 1 # Lower bound of the fuel cost of any tile, used to prune tiles that can not lead to a finished program
+TILE_MANIFEST_DIR = None # Directory of the cached tile manifests, None uses wasmweaver in $XDG_CACHE_HOME or ~/.cache
+RUNNER_STORE_REUSE_LIMIT = 64 # How many programs run in one wasmtime store before it is replaced, a store keeps all its instances alive
+RUNNER_CRANELIFT_OPT_LEVEL = "speed" # Cranelift optimization level of the runner engine, "none" compiles faster but runs slower
+MODULE_CACHE_DIR = None # Directory of the on-disk cache of compiled modules used by the runner, None disables the cache
+MODULE_CACHE_MAX_SIZE = 1 << 30 # Size in bytes of the compiled-module cache above which the least recently used modules are evicted
+RESPONSE_TIME_WARMUP_RUNS = 3 # Untimed runs before the response time of a program is measured
+RESPONSE_TIME_REPETITIONS = 30 # Timed runs per program when measuring its response time
+RESPONSE_TIME_TRIM = 0.1 # Fraction of the fastest and of the slowest timed runs dropped as outliers
+RESPONSE_TIME_CONFIDENCE = 0.95 # Confidence level of the interval around the measured mean response time
 
 # Embedder Settings (for DRL agent)
 MAX_CONSTRAINTS = 3 # The maximum number of constraints (e.g. bytecode size, fuel, etc.) for the DRL agent to consider
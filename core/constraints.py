@@ -3,6 +3,7 @@
 
 from enum import Enum
 from typing import List, Type
+from core.state.journal import Journal
 
 
 class ConstraintsViolatedError(Exception):
@@ -23,6 +24,7 @@ class AbstractConstraint:
     """
     An abstract class for constraints.
     """
+    journal: Journal | None = None
 
     def __init__(self, min_target=0, max_target=100, initial: float = 0):
         self.resource = initial
@@ -35,7 +37,15 @@ class AbstractConstraint:
         """
         Resets the constraint to its initial state.
         """
-        self.resource = self.initial
+        self.set_resource(self.initial)
+
+    def set_resource(self, value: float):
+        """
+        Sets the resource value.
+        """
+        if self.journal is not None:
+            self.journal.record(setattr, self, "resource", self.resource)
+        self.resource = value
 
     def get_remaining_resource(self) -> float:
         """
@@ -59,7 +69,7 @@ class AbstractConstraint:
         """
         Updates the resource value.
         """
-        self.resource += delta
+        self.set_resource(self.resource + delta)
         return self.resource
 
     def __str__(self):
@@ -110,10 +120,21 @@ class Constraints:
     """
 
     def __init__(self, constraints: List[AbstractConstraint] = None):
+        self._journal: Journal | None = None
         self.constraints = []
         if constraints:
             self.constraints = constraints
 
+    @property
+    def journal(self) -> Journal | None:
+        return self._journal
+
+    @journal.setter
+    def journal(self, journal: Journal | None):
+        self._journal = journal
+        for constraint in self.constraints:
+            constraint.journal = journal
+
     def get_all_by_type(self, constraint_type: ConstraintType):
         return_metrics = []
         for constraint in self.constraints:
@@ -128,10 +149,13 @@ class Constraints:
         for constraint in constraints:
             for i, existing_constraint in enumerate(self.constraints):
                 if isinstance(existing_constraint, type(constraint)):
+                    constraint.journal = self._journal
+                    if self._journal is not None:
+                        self._journal.record(self.constraints.__setitem__, i, existing_constraint)
                     self.constraints[i] = constraint
                     break
             else:
-                self.constraints.append(constraint)
+                self.add(constraint)
 
     def reset_all(self):
         """
@@ -146,13 +170,16 @@ class Constraints:
         """
         for constraint in self.get_all_by_type(constraint_type):
             remaining_resources = constraint.get_remaining_resource()
-            constraint.resource = constraint.min_target+(remaining_resources / divisor)
+            constraint.set_resource(constraint.min_target+(remaining_resources / divisor))
 
 
     def add(self, constraint: AbstractConstraint):
         """
         Adds a constraint to the state.
         """
+        constraint.journal = self._journal
+        if self._journal is not None:
+            self._journal.record(self.constraints.pop)
         self.constraints.append(constraint)
 
     def __getitem__(self, item: Type[AbstractConstraint]):
@@ -1,83 +1,65 @@
 # SPDX-License-Identifier: MIT
 # SPDX-FileCopyrightText: 2025 Siemens AG
 
+from typing import List
+from core.formater import CodeWriter
 from core.state.state import GlobalState
 
 
-def _generate_functions(global_state: GlobalState, external=False) -> str:
+def program_version(global_state: GlobalState) -> tuple:
     """
-    Generates a strings for all external and internal functions.
+    Returns a key that changes whenever the code of the program changes. The arena of the state is rebuilt whenever a
+    tile array changes, and tiles are immutable once generated. Locals, globals, tables and external functions are only
+    ever added.
     """
-    function_str = ""
-    for function in global_state.functions.functions.values():
-        if function.is_external != external:
-            continue
-        function_str += function.generate_code(global_state, function)
+    functions = global_state.functions.functions.values()
+    return (global_state.get_arena(), tuple(len(function.local_types) for function in functions),
+            len(global_state.globals.globals), len(global_state.tables.tables), len(global_state.ext_functions.functions))
 
-    return function_str
 
-def _generate_ext_functions(global_state: GlobalState) -> str:
+def _write_module(global_state: GlobalState, buffer: List[str]):
     """
-    Generates a strings for all external functions.
+    Writes the code of a module into a buffer.
     """
-    function_str = ""
+    buffer.append("(module\n")
+    # Signatures
+    for function in global_state.functions.functions.values():
+        buffer.append(function.generate_signature())
+        buffer.append("\n")
+    # Function imports
+    for function in global_state.functions.functions.values():
+        if function.is_external:
+            buffer.append(function.generate_code(global_state, function))
+    # External functions
     for function in global_state.ext_functions.functions.values():
-        function_str += function.generate_code()
-
-    return function_str
-
-def _generate_tables(global_state: GlobalState) -> str:
-    """
-    Generates a strings for all tables.
-    """
-    table_str = ""
+        buffer.append(function.generate_code())
+    # Memory
+    buffer.append('(import "env" "memory" (memory 1))\n')
+    # Tables
     for table in global_state.tables.tables.values():
-        table_str += table.generate_code() + "\n"
-
-    return table_str
-def _generate_globals(global_state: GlobalState) -> str:
-    """
-    Generates a strings for all global variables.
-    """
-    global_str = ""
+        buffer.append(table.generate_code())
+        buffer.append("\n")
+    # Globals
     for global_var in global_state.globals.globals:
-        global_str += global_var.generate_code() + "\n"
-
-    return global_str
-
-
-def _generate_signatures(global_state: GlobalState) -> str:
-    """
-    Generates a strings for all function signatures.
-    """
-    signature_str = ""
+        buffer.append(global_var.generate_code())
+        buffer.append("\n")
     for function in global_state.functions.functions.values():
-        signature_str += function.generate_signature() + "\n"
-    return signature_str
+        if not function.is_external:
+            CodeWriter(global_state, function, buffer).write_parts(function.generate_code_parts(global_state), [])
+    buffer.append("\n)")
 
 
-def global_state_to_wat_program(global_state: GlobalState) -> str:
+def global_state_to_wat_program(global_state: GlobalState, memoize: bool = True) -> str:
     """
-    Converts a global state to a wat program.
+    Converts a global state to a wat program. The module is written in a single pass into one buffer. If memoize is
+    true, the program is cached on the global state and only written again once its code changed, see program_version.
     """
-    template = f"(module\n"
-    #Signatures
-    if _generate_signatures(global_state):
-        template += f'{_generate_signatures(global_state)}'
-    #Function imports
-    if _generate_functions(global_state, external=True):
-        template += f'{_generate_functions(global_state, external=True)}'
-    #External functions
-    if _generate_ext_functions(global_state):
-        template += f'{_generate_ext_functions(global_state)}'
-    #Memory
-    template += '(import "env" "memory" (memory 1))\n'
-    # Tables
-    if _generate_tables(global_state):
-        template += f'{_generate_tables(global_state)}'
-    #Globals
-    if _generate_globals(global_state):
-        template += f'{_generate_globals(global_state)}'
-    template += f"{_generate_functions(global_state, external=False)}"
-    template += "\n)"
-    return template
+    version = program_version(global_state) if memoize else None
+    if memoize and global_state.wat_cache is not None and global_state.wat_cache[0] == version:
+        return global_state.wat_cache[1]
+    buffer: List[str] = []
+    _write_module(global_state, buffer)
+    program = "".join(buffer)
+    if memoize:
+        global_state.wat_cache = (version, program)
+    return program
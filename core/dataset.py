@@ -0,0 +1,233 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Sharded on-disk datasets of generated programs.
+
+A dataset is a directory with shard files, a binary index and a manifest. Every record is compressed on its own, so a
+single program can be read without decompressing the rest of its shard:
+
+    shard-00000.bin   frames of <u32 compressed length><zlib(record)>
+    index.bin         one <q seed><I shard><Q offset><I length> entry per record
+    manifest.json     format version, shard names and record count
+
+A record is <I meta length><I byte code length><I memory length> followed by the JSON metadata, the raw Wasm bytes and
+the raw initial memory.
+"""
+
+import json
+import os
+import queue
+import shutil
+import struct
+import threading
+import zlib
+from typing import Iterator, List
+from core.builder import GeneratorResult
+from core.runner import AbstractRunResult, ExternalComputeResource
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+INDEX_NAME = "index.bin"
+FRAME = struct.Struct("<I")
+RECORD_HEADER = struct.Struct("<III")
+INDEX_ENTRY = struct.Struct("<qIQI")
+
+
+def encode_result(result: GeneratorResult) -> bytes:
+    """
+    Encodes a generator result as an uncompressed record.
+    """
+    run_result = result.abstract_run_result
+    meta = json.dumps({
+        "seed": result.seed,
+        "code_str": result.code_str,
+        "canary_output": result.canary_output,
+        "fuel": run_result.fuel,
+        "return_values": list(run_result.return_values),
+        "ext_resources": [[resource.cpu_cycles, resource.gpu_cycles] for resource in run_result.ext_resources],
+    }, default=str).encode("utf-8")
+    byte_code = bytes(result.byte_code)
+    memory = bytes(result.initial_memory)
+    return RECORD_HEADER.pack(len(meta), len(byte_code), len(memory)) + meta + byte_code + memory
+
+
+def decode_result(record: bytes) -> GeneratorResult:
+    """
+    Decodes an uncompressed record back into a generator result. Post processors are not stored.
+    """
+    meta_length, byte_code_length, memory_length = RECORD_HEADER.unpack_from(record)
+    start = RECORD_HEADER.size
+    meta = json.loads(record[start:start + meta_length])
+    start += meta_length
+    byte_code = bytearray(record[start:start + byte_code_length])
+    start += byte_code_length
+    memory = record[start:start + memory_length]
+    run_result = AbstractRunResult(meta["fuel"], [ExternalComputeResource(cpu, gpu)
+                                                  for cpu, gpu in meta["ext_resources"]])
+    run_result.return_values = tuple(meta["return_values"])
+    return GeneratorResult(meta["seed"], meta["code_str"], byte_code, run_result, memory, meta["canary_output"])
+
+
+def sync_and_close(f):
+    """
+    Writes a file to disk and closes it.
+    """
+    f.flush()
+    os.fsync(f.fileno())
+    f.close()
+
+
+def fsync_directory(path: str):
+    """
+    Writes the entries of a directory to disk, e.g. after a file was moved into it.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class DatasetWriter:
+    """
+    Appends generator results to size bounded, compressed shards.
+
+    Encoding, compression and writing happen in a background thread, write only hands the result over. The dataset is
+    built in a staging directory next to the target and moved into place by finalize, so a dataset directory is either
+    complete or does not exist. Use as a context manager to finalize on success and discard the staging directory on
+    errors.
+    """
+
+    def __init__(self, path: str, max_shard_size: int = 256 * 1024 * 1024, compression_level: int = 6,
+                 max_pending: int = 1024):
+        if os.path.exists(path):
+            raise FileExistsError(f"Dataset {path} already exists")
+        self.path = path
+        self.staging_path = path + ".partial"
+        self.max_shard_size = max_shard_size
+        self.compression_level = compression_level
+        shutil.rmtree(self.staging_path, ignore_errors=True)
+        os.makedirs(self.staging_path)
+        self.shard_names: List[str] = []
+        self.record_count = 0
+        self._shard = None
+        self._index = open(os.path.join(self.staging_path, INDEX_NAME), "wb")
+        self._error: BaseException | None = None
+        self._queue: queue.Queue = queue.Queue(max_pending)
+        self._thread = threading.Thread(target=self._run, name="DatasetWriter", daemon=True)
+        self._thread.start()
+
+    def write(self, result: GeneratorResult):
+        """
+        Queues a result to be written. Blocks if the background thread falls too far behind.
+        """
+        self._raise_error()
+        self._queue.put(result)
+
+    def finalize(self) -> str:
+        """
+        Writes all pending results and the manifest, and moves the dataset into place. Returns the dataset path.
+        """
+        self._stop()
+        self._raise_error()
+        manifest_path = os.path.join(self.staging_path, MANIFEST_NAME)
+        with open(manifest_path, "w") as f:
+            json.dump({"version": FORMAT_VERSION, "shards": self.shard_names, "records": self.record_count}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self.staging_path, self.path)
+        fsync_directory(os.path.dirname(os.path.abspath(self.path)))
+        return self.path
+
+    def abort(self):
+        """
+        Stops writing and removes the staging directory.
+        """
+        self._stop()
+        shutil.rmtree(self.staging_path, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.finalize()
+        else:
+            self.abort()
+
+    def _stop(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError("Writing the dataset failed") from self._error
+
+    def _run(self):
+        stopped = False
+        try:
+            while True:
+                result = self._queue.get()
+                if result is None:
+                    stopped = True
+                    break
+                self._append(zlib.compress(encode_result(result), self.compression_level), result.seed)
+            for f in (self._shard, self._index):
+                if f is not None:
+                    sync_and_close(f)
+        except BaseException as e:
+            self._error = e
+            # Keep consuming until the sentinel, so write does not block forever
+            while not stopped:
+                stopped = self._queue.get() is None
+
+    def _append(self, frame: bytes, seed: int):
+        if self._shard is None or self._shard.tell() + FRAME.size + len(frame) > self.max_shard_size:
+            if self._shard is not None:
+                sync_and_close(self._shard)
+            self.shard_names.append(f"shard-{len(self.shard_names):05d}.bin")
+            self._shard = open(os.path.join(self.staging_path, self.shard_names[-1]), "wb")
+        offset = self._shard.tell()
+        self._shard.write(FRAME.pack(len(frame)))
+        self._shard.write(frame)
+        self._index.write(INDEX_ENTRY.pack(seed, len(self.shard_names) - 1, offset, FRAME.size + len(frame)))
+        self.record_count += 1
+
+
+class DatasetReader:
+    """
+    Reads a finalized dataset, sequentially or by record number.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        if manifest["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported dataset version {manifest['version']}")
+        self.shard_names: List[str] = manifest["shards"]
+        with open(os.path.join(path, INDEX_NAME), "rb") as f:
+            self.index = list(INDEX_ENTRY.iter_unpack(f.read()))
+        if len(self.index) != manifest["records"]:
+            raise ValueError("Index does not match the manifest")
+
+    def __len__(self):
+        return len(self.index)
+
+    def seeds(self) -> List[int]:
+        return [seed for seed, _, _, _ in self.index]
+
+    def __getitem__(self, i: int) -> GeneratorResult:
+        _, shard, offset, length = self.index[i]
+        with open(os.path.join(self.path, self.shard_names[shard]), "rb") as f:
+            f.seek(offset)
+            return decode_result(zlib.decompress(f.read(length)[FRAME.size:]))
+
+    def __iter__(self) -> Iterator[GeneratorResult]:
+        for shard_name in self.shard_names:
+            with open(os.path.join(self.path, shard_name), "rb") as f:
+                while header := f.read(FRAME.size):
+                    (length,) = FRAME.unpack(header)
+                    yield decode_result(zlib.decompress(f.read(length)))
@@ -7,7 +7,7 @@ import numpy as np
 from core.config.config import MEMORY_MAX_WRITE_INDEX
 from core.state.functions import Function, Block
 from core.state.state import GlobalState
-from core.tile import global_apply_callbacks, global_end_callbacks
+from core.hooks import subscribe
 from core.util import apply_function
 
 
@@ -39,10 +39,9 @@ def print_trace(global_state: GlobalState, entry_function="run", start_seed=0):
 
 
         instruction_counter+=1
-    global_apply_callbacks.append(dummy_apply_callback)
     print("------------TRACE START------------")
-    apply_function(global_state.functions.get(entry_function), global_state)
-    global_apply_callbacks.remove(dummy_apply_callback)
+    with subscribe(global_state, apply_callback=dummy_apply_callback):
+        apply_function(global_state.functions.get(entry_function), global_state)
     print("------------TRACE END------------")
 
 def generate_trace_list(global_state: GlobalState, entry_function="run"):
@@ -71,9 +70,6 @@ def generate_trace_list(global_state: GlobalState, entry_function="run"):
         nonlocal instruction_counter, trace
         trace.append("END_"+instance.__class__.__name__)
 
-    global_apply_callbacks.append(dummy_apply_callback)
-    global_end_callbacks.append(dummy_apply_end_callback)
-    apply_function(global_state.functions.get(entry_function), global_state)
-    global_apply_callbacks.remove(dummy_apply_callback)
-    global_end_callbacks.remove(dummy_apply_end_callback)
+    with subscribe(global_state, apply_callback=dummy_apply_callback, end_callback=dummy_apply_end_callback):
+        apply_function(global_state.functions.get(entry_function), global_state)
     return trace
\ No newline at end of file
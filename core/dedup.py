@@ -0,0 +1,158 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Detection of structurally duplicate programs.
+
+Two programs are duplicates if they only differ in the random names of their functions, globals, tables and blocks.
+The canonical hash replaces every name by the position of its first appearance, so it can be computed right after
+generation, before a program is emitted, compiled or run.
+"""
+
+import hashlib
+import os
+import struct
+from typing import Dict
+from core.state.state import GlobalState
+
+DIGEST_SIZE = 16
+# Immediates that refer to a named entity of the module
+NAME_ATTRIBUTES = {"function_name": "functions", "global_name": "globals", "table_name": "tables"}
+SEEN_SET_HEADER = struct.Struct("<QQ")
+
+
+class DuplicateProgramError(Exception):
+    """
+    Raised if a generated program is a duplicate of a program seen before.
+    """
+    pass
+
+
+def canonical_program_hash(global_state: GlobalState) -> bytes:
+    """
+    Returns a hash of the code of a program that does not depend on the random names it uses. The initial memory is not
+    part of the hash, it is input data rather than code. The hash is computed in one walk over the finished program,
+    not updated while tiles are placed and rolled back.
+    """
+    names: Dict[str, Dict[str, int]] = {kind: {} for kind in NAME_ATTRIBUTES.values()}
+
+    def canonical(kind: str, name: str) -> int:
+        return names[kind].setdefault(name, len(names[kind]))
+
+    for name in global_state.functions.functions:
+        canonical("functions", name)
+    for global_var in global_state.globals.globals:
+        canonical("globals", global_var.name)
+    for name in global_state.tables.tables:
+        canonical("tables", name)
+
+    h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+    def update(*parts):
+        h.update(repr(parts).encode("utf-8"))
+
+    for global_var in global_state.globals.globals:
+        update("global", global_var.value.get_wasm_type(), global_var.mutable, repr(global_var.init_value.value))
+    for table in global_state.tables.tables.values():
+        update("table", table.size)
+    for function in global_state.functions.functions.values():
+        update("function", function.name == "run", [t.get_wasm_type() for t in function.inputs],
+               [t.get_wasm_type() for t in function.outputs], [t.get_wasm_type() for t in function.local_types])
+
+    arena = global_state.get_arena()
+    constants = [tuple((attribute, canonical(NAME_ATTRIBUTES[attribute], value) if attribute in NAME_ATTRIBUTES
+                        else repr(value)) for attribute, value in constant) for constant in arena.constants]
+    for block_id, block in enumerate(arena.blocks):
+        update("block", arena.block_parent[block_id], arena.block_type[block_id],
+               [t.get_wasm_type() for t in getattr(block, "inputs", [])],
+               [t.get_wasm_type() for t in getattr(block, "outputs", [])])
+        update(*((arena.opcode_names[arena.opcodes[node]],
+                  constants[arena.immediates[node]] if arena.immediates[node] != -1 else None)
+                 for node in range(arena.block_start[block_id], arena.block_end[block_id])))
+    return h.digest()
+
+
+class SeenSet:
+    """
+    A bounded set of program hashes that is kept on disk, so runs can skip programs generated by earlier runs.
+
+    The file is a ring buffer of digests behind a header with the capacity and the number of digests ever added. Once
+    the capacity is reached, the oldest digest is forgotten. Without a path the set only lives in memory.
+    """
+
+    def __init__(self, path: str | None = None, capacity: int = 1 << 20):
+        self.path = path
+        self.capacity = capacity
+        self.added = 0
+        self._slots: Dict[bytes, int] = {}
+        self._ring = [b""] * capacity
+        self._file = None
+        if path is None:
+            return
+        if os.path.exists(path):
+            self._file = open(path, "r+b")
+            stored_capacity, self.added = SEEN_SET_HEADER.unpack(self._file.read(SEEN_SET_HEADER.size))
+            if stored_capacity != capacity:
+                raise ValueError(f"Seen set {path} has capacity {stored_capacity}, not {capacity}")
+            data = self._file.read(min(self.added, capacity) * DIGEST_SIZE)
+            for slot in range(len(data) // DIGEST_SIZE):
+                digest = data[slot * DIGEST_SIZE:(slot + 1) * DIGEST_SIZE]
+                self._ring[slot] = digest
+                self._slots[digest] = slot
+        else:
+            self._file = open(path, "w+b")
+            self._file.write(SEEN_SET_HEADER.pack(capacity, 0))
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return digest in self._slots
+
+    def add(self, digest: bytes) -> bool:
+        """
+        Adds a digest. Returns False if it was already in the set.
+        """
+        if digest in self._slots:
+            return False
+        slot = self.added % self.capacity
+        if self._slots.get(self._ring[slot]) == slot:
+            del self._slots[self._ring[slot]]
+        self._ring[slot] = digest
+        self._slots[digest] = slot
+        self.added += 1
+        if self._file is not None:
+            self._file.seek(SEEN_SET_HEADER.size + slot * DIGEST_SIZE)
+            self._file.write(digest)
+            self._file.seek(0)
+            self._file.write(SEEN_SET_HEADER.pack(self.capacity, self.added))
+        return True
+
+    def check(self, global_state: GlobalState):
+        """
+        Adds the hash of a program and raises a DuplicateProgramError if it was seen before.
+        """
+        if not self.add(canonical_program_hash(global_state)):
+            raise DuplicateProgramError("Program is a duplicate")
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __getstate__(self):
+        # An unpickled set loads the digests from its file again
+        return {"path": self.path, "capacity": self.capacity}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["capacity"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,484 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Binary encoding of generated programs.
+
+The module structure (types, imports, tables, globals, functions and exports) is encoded directly from the global
+state. Instruction tiles are encoded from their fields, see AbstractTile.instruction and AbstractTile.encode, without
+rendering any code. Only structured tiles (blocks, conditionals, loops) still emit the lines of their headers and loop
+counters as text, see generate_code_parts, which are encoded line by line. Apart from the name section, the output is
+the same as wasmtime.wat2wasm of global_state_to_wat_program.
+
+Several programs can be packed into one module, so they are compiled and instantiated once. Every program keeps its
+own index range of functions, globals and tables, and its imports and exports are prefixed.
+"""
+
+import struct
+from typing import Dict, List, Tuple
+import numpy as np
+from core.converter import program_version
+from core.formater import CodeBody
+from core.state.functions import Function
+from core.state.state import GlobalState
+
+MAGIC = b"\x00asm\x01\x00\x00\x00"
+VALUE_TYPES = {"i32": 0x7F, "i64": 0x7E, "f32": 0x7D, "f64": 0x7C, "funcref": 0x70, "externref": 0x6F}
+EMPTY_BLOCK_TYPE = 0x40
+END = 0x0B
+
+# Instructions without immediates
+_PLAIN = {"unreachable": 0x00, "nop": 0x01, "else": 0x05, "end": END, "return": 0x0F, "drop": 0x1A, "select": 0x1B,
+          "ref.is_null": 0xD1}
+for _offset, _name in enumerate(["eqz", "eq", "ne", "lt_s", "lt_u", "gt_s", "gt_u", "le_s", "le_u", "ge_s", "ge_u"]):
+    _PLAIN["i32." + _name] = 0x45 + _offset
+    _PLAIN["i64." + _name] = 0x50 + _offset
+for _offset, _name in enumerate(["eq", "ne", "lt", "gt", "le", "ge"]):
+    _PLAIN["f32." + _name] = 0x5B + _offset
+    _PLAIN["f64." + _name] = 0x61 + _offset
+for _offset, _name in enumerate(["clz", "ctz", "popcnt", "add", "sub", "mul", "div_s", "div_u", "rem_s", "rem_u", "and",
+                                 "or", "xor", "shl", "shr_s", "shr_u", "rotl", "rotr"]):
+    _PLAIN["i32." + _name] = 0x67 + _offset
+    _PLAIN["i64." + _name] = 0x79 + _offset
+for _offset, _name in enumerate(["abs", "neg", "ceil", "floor", "trunc", "nearest", "sqrt", "add", "sub", "mul", "div",
+                                 "min", "max", "copysign"]):
+    _PLAIN["f32." + _name] = 0x8B + _offset
+    _PLAIN["f64." + _name] = 0x99 + _offset
+for _offset, _name in enumerate(["i32.wrap_i64", "i32.trunc_f32_s", "i32.trunc_f32_u", "i32.trunc_f64_s",
+                                 "i32.trunc_f64_u", "i64.extend_i32_s", "i64.extend_i32_u", "i64.trunc_f32_s",
+                                 "i64.trunc_f32_u", "i64.trunc_f64_s", "i64.trunc_f64_u", "f32.convert_i32_s",
+                                 "f32.convert_i32_u", "f32.convert_i64_s", "f32.convert_i64_u", "f32.demote_f64",
+                                 "f64.convert_i32_s", "f64.convert_i32_u", "f64.convert_i64_s", "f64.convert_i64_u",
+                                 "f64.promote_f32", "i32.reinterpret_f32", "i64.reinterpret_f64", "f32.reinterpret_i32",
+                                 "f64.reinterpret_i64", "i32.extend8_s", "i32.extend16_s", "i64.extend8_s",
+                                 "i64.extend16_s", "i64.extend32_s"]):
+    _PLAIN[_name] = 0xA7 + _offset
+PLAIN_OPCODES = {name: bytes([opcode]) for name, opcode in _PLAIN.items()}
+
+# Memory instructions with their natural alignment, they are encoded with offset 0
+MEMORY_OPCODES: Dict[str, Tuple[int, int]] = {}
+for _offset, (_name, _align) in enumerate([
+        ("i32.load", 2), ("i64.load", 3), ("f32.load", 2), ("f64.load", 3), ("i32.load8_s", 0), ("i32.load8_u", 0),
+        ("i32.load16_s", 1), ("i32.load16_u", 1), ("i64.load8_s", 0), ("i64.load8_u", 0), ("i64.load16_s", 1),
+        ("i64.load16_u", 1), ("i64.load32_s", 2), ("i64.load32_u", 2), ("i32.store", 2), ("i64.store", 3),
+        ("f32.store", 2), ("f64.store", 3), ("i32.store8", 0), ("i32.store16", 1), ("i64.store8", 0),
+        ("i64.store16", 1), ("i64.store32", 2)]):
+    MEMORY_OPCODES[_name] = (0x28 + _offset, _align)
+BLOCK_OPCODES = {"block": 0x02, "loop": 0x03, "if": 0x04}
+# Encodings of the instructions without module dependent immediates, by their text
+INSTRUCTION_ENCODINGS: Dict[str, bytes] = dict(PLAIN_OPCODES)
+INSTRUCTION_ENCODINGS.update((name, bytes([opcode, align, 0])) for name, (opcode, align) in MEMORY_OPCODES.items())
+INSTRUCTION_ENCODINGS["memory.size"] = b"\x3F\x00"
+LOCAL_OPCODES = {"local.get": 0x20, "local.set": 0x21, "local.tee": 0x22}
+
+# Encodings of lines that do not depend on the module or on their position, shared by all encoders
+SHARED_INSTRUCTION_CACHE: Dict[str, bytes] = {}
+SHARED_INSTRUCTION_CACHE_SIZE = 1 << 16
+
+
+class EncodingError(Exception):
+    """
+    Raised if a tile emits an instruction the encoder does not support.
+    """
+    pass
+
+
+def unsigned_leb128(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def signed_leb128(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if (value == 0 and not byte & 0x40) or (value == -1 and byte & 0x40):
+            out.append(byte)
+            return bytes(out)
+        out.append(byte | 0x80)
+
+
+def encode_name(name: str) -> bytes:
+    data = name.encode("utf-8")
+    return unsigned_leb128(len(data)) + data
+
+
+def encode_vector(items: List[bytes]) -> bytes:
+    return unsigned_leb128(len(items)) + b"".join(items)
+
+
+def encode_section(section_id: int, items: List[bytes]) -> bytes:
+    if not items:
+        return b""
+    content = encode_vector(items)
+    return bytes([section_id]) + unsigned_leb128(len(content)) + content
+
+
+def encode_const(wasm_type: str, literal: str | int | float) -> bytes:
+    """
+    Encodes a const instruction from its literal or its value.
+    """
+    if wasm_type == "i32":
+        value = int(literal)
+        return b"\x41" + signed_leb128(value - (1 << 32) if value >= 1 << 31 else value)
+    if wasm_type == "i64":
+        value = int(literal)
+        return b"\x42" + signed_leb128(value - (1 << 64) if value >= 1 << 63 else value)
+    if wasm_type == "f32":
+        return b"\x43" + np.float32(literal).tobytes()
+    if wasm_type == "f64":
+        return b"\x44" + struct.pack("<d", float(literal))
+    raise EncodingError(f"Unsupported const type {wasm_type}")
+
+
+def encode_init_expression(init: str) -> bytes:
+    """
+    Encodes the constant expression of a global, a const or a null reference.
+    """
+    mnemonic, literal = init.split()
+    if mnemonic == "ref.null":
+        return b"\xD0" + bytes([VALUE_TYPES[literal + "ref"]]) + bytes([END])
+    return encode_const(mnemonic[:3], literal) + bytes([END])
+
+
+def parse_type_use(tokens: List[str]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Returns the parameter and result types of the (param ...) and (result ...) clauses in the tokens.
+    """
+    params, results, current = [], [], None
+    for token in tokens:
+        if token == "param":
+            current = params
+        elif token == "result":
+            current = results
+        elif current is not None and token in VALUE_TYPES:
+            current.append(token)
+    return tuple(params), tuple(results)
+
+
+class ProgramLayout:
+    """
+    Where the functions, globals and tables of one program are placed in the index spaces of a module. The names of
+    its imports and exports are prefixed, so several programs can share a module.
+    """
+
+    def __init__(self, global_state: GlobalState, prefix: str = ""):
+        self.global_state = global_state
+        self.prefix = prefix
+        functions = list(global_state.functions.functions.values())
+        self.imported_functions = [function for function in functions if function.is_external]
+        self.internal_functions = [function for function in functions if not function.is_external]
+        self.ext_functions = list(global_state.ext_functions.functions.values())
+        self.function_indices: Dict[str, int] = {}
+        self.global_indices: Dict[str, int] = {}
+        self.table_indices: Dict[str, int] = {}
+        self.signature_indices: Dict[str, int] = {}
+        # Instructions that depend on the program but not on their position, by their text
+        self.instruction_cache: Dict[str, bytes] = {}
+
+
+class ModuleEncoder:
+    """
+    Encodes the programs of global states as a binary module. A single program without prefix is encoded like its WAT
+    code, packed programs need distinct prefixes for their import and export names, see pack_prefix.
+    """
+
+    def __init__(self, global_states: List[GlobalState], prefixes: List[str] | None = None):
+        if prefixes is None:
+            prefixes = [""] * len(global_states)
+        self.layouts = [ProgramLayout(global_state, prefix) for global_state, prefix in zip(global_states, prefixes)]
+        self.types: List[Tuple[Tuple[str, ...], Tuple[str, ...]]] = []
+        # Imported functions of all programs come first in the function index space
+        function_count = 0
+        for layout in self.layouts:
+            for function in layout.imported_functions + layout.ext_functions:
+                layout.function_indices[function.name] = function_count
+                function_count += 1
+        global_count = table_count = 0
+        for layout in self.layouts:
+            for function in layout.internal_functions:
+                layout.function_indices[function.name] = function_count
+                function_count += 1
+            for global_var in layout.global_state.globals.globals:
+                layout.global_indices[global_var.name] = global_count
+                global_count += 1
+            for name in layout.global_state.tables.tables:
+                layout.table_indices[name] = table_count
+                table_count += 1
+        # The program whose code is encoded
+        self.layout = self.layouts[0]
+
+    def function_index(self, name: str) -> int:
+        """
+        Returns the index of a function of the encoded program in the module. The same holds for the other indices.
+        """
+        return self.layout.function_indices[name]
+
+    def global_index(self, name: str) -> int:
+        return self.layout.global_indices[name]
+
+    def table_index(self, name: str) -> int:
+        return self.layout.table_indices[name]
+
+    def signature_index(self, signature_name: str) -> int:
+        return self.layout.signature_indices[signature_name]
+
+    def type_index(self, params: Tuple[str, ...], results: Tuple[str, ...]) -> int:
+        """
+        Returns the index of a function type, adding it if no type matches.
+        """
+        signature = (params, results)
+        for i, existing in enumerate(self.types):
+            if existing == signature:
+                return i
+        self.types.append(signature)
+        return len(self.types) - 1
+
+    def block_type(self, tokens: List[str]) -> bytes:
+        params, results = parse_type_use(tokens)
+        if not params and not results:
+            return bytes([EMPTY_BLOCK_TYPE])
+        if not params and len(results) == 1:
+            return bytes([VALUE_TYPES[results[0]]])
+        return signed_leb128(self.type_index(params, results))
+
+    def encode(self) -> bytes:
+        """
+        Returns the binary module.
+        """
+        # Every function declares its own signature type, see Function.generate_signature
+        for layout in self.layouts:
+            for function in layout.global_state.functions.functions.values():
+                layout.signature_indices[function.get_sig_name()] = len(self.types)
+                self.types.append(self.function_type(function))
+        imports = []
+        for layout in self.layouts:
+            for function in layout.imported_functions + layout.ext_functions:
+                type_index = self.type_index(*self.function_type(function))
+                imports.append(encode_name("env") + encode_name(layout.prefix + function.name) + b"\x00" +
+                               unsigned_leb128(type_index))
+        imports.append(encode_name("env") + encode_name("memory") + b"\x02\x00\x01")
+        function_types, tables, global_vars, exports = [], [], [], []
+        for layout in self.layouts:
+            function_types.extend(unsigned_leb128(self.type_index(*self.function_type(function)))
+                                  for function in layout.internal_functions)
+            tables.extend(bytes([VALUE_TYPES["funcref"], 0x00]) + unsigned_leb128(table.size)
+                          for table in layout.global_state.tables.tables.values())
+            for global_var in layout.global_state.globals.globals:
+                wasm_type = global_var.value.get_wasm_type()
+                global_vars.append(bytes([VALUE_TYPES[wasm_type], 1 if global_var.mutable else 0]) +
+                                   encode_init_expression(global_var.init_value.to_init_str()))
+            exports.extend(encode_name(layout.prefix + function.name) + b"\x00" +
+                           unsigned_leb128(layout.function_indices[function.name])
+                           for function in layout.internal_functions)
+        # Bodies last, block types may add types
+        code = []
+        for layout in self.layouts:
+            self.layout = layout
+            for function in layout.internal_functions:
+                body = self.encode_function_body(function)
+                code.append(unsigned_leb128(len(body)) + body)
+        types = [b"\x60" + encode_vector([bytes([VALUE_TYPES[t]]) for t in params]) +
+                 encode_vector([bytes([VALUE_TYPES[t]]) for t in results]) for params, results in self.types]
+        return b"".join([MAGIC,
+                         encode_section(1, types),
+                         encode_section(2, imports),
+                         encode_section(3, function_types),
+                         encode_section(4, tables),
+                         encode_section(6, global_vars),
+                         encode_section(7, exports),
+                         encode_section(10, code)])
+
+    @staticmethod
+    def function_type(function) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        return (tuple(t.get_wasm_type() for t in function.inputs),
+                tuple(t.get_wasm_type() for t in function.outputs))
+
+    def encode_function_body(self, function: Function) -> bytes:
+        """
+        Encodes the locals and instructions of a function. Locals of the same type in a row are grouped.
+        """
+        declared_types = [t.get_wasm_type() for t in function.local_types[len(function.inputs):]]
+        local_types = declared_types + ["i32"]
+        groups: List[List] = []
+        for local_type in local_types:
+            if groups and groups[-1][1] == local_type:
+                groups[-1][0] += 1
+            else:
+                groups.append([1, local_type])
+        out = bytearray(encode_vector([unsigned_leb128(count) + bytes([VALUE_TYPES[local_type]])
+                                       for count, local_type in groups]))
+        named_locals = {"$temp": len(function.inputs) + len(declared_types)}
+        self.encode_instructions(function, function.tiles, named_locals, out)
+        out.append(END)
+        return bytes(out)
+
+    def encode_instructions(self, function: Function, tiles: list, named_locals: Dict[str, int], out: bytearray):
+        """
+        Encodes the tiles from their fields. The code parts of structured tiles are expanded like
+        core.formater.CodeWriter and their lines are encoded.
+        """
+        current_state = self.layout.global_state
+        shared_cache = SHARED_INSTRUCTION_CACHE
+        module_cache = self.layout.instruction_cache
+        labels: List[str | None] = []
+        pending = [(iter(tiles), [])]
+        while pending:
+            items, current_blocks = pending[-1]
+            for item in items:
+                if item.__class__ is str:
+                    text = item
+                elif item.__class__ is CodeBody:
+                    pending.append((iter(item.items), item.current_blocks))
+                    break
+                else:
+                    if item.instruction is not None:
+                        out += INSTRUCTION_ENCODINGS[item.instruction]
+                        continue
+                    encoded = item.encode(self, current_state, function, current_blocks)
+                    if encoded is not None:
+                        out += encoded
+                        continue
+                    tile_parts = item.generate_code_parts(current_state, function, current_blocks)
+                    if tile_parts is not None:
+                        pending.append((iter(tile_parts), current_blocks))
+                        break
+                    text = item.generate_code(current_state, function, current_blocks)
+                encoded = shared_cache.get(text)
+                if encoded is None:
+                    encoded = module_cache.get(text)
+                    if encoded is None:
+                        encoded = self.encode_text(text, labels, named_locals)
+                out += encoded
+            else:
+                pending.pop()
+
+    def encode_text(self, text: str, labels: List[str | None], named_locals: Dict[str, int]) -> bytes:
+        """
+        Encodes the code of a tile line by line. Code without position dependent lines is cached as a whole.
+        """
+        if "\n" not in text:
+            return self.encode_line(text, labels, named_locals)
+        cacheable = True
+        encoded = bytearray()
+        for line in text.split("\n"):
+            line_encoded = SHARED_INSTRUCTION_CACHE.get(line)
+            if line_encoded is None:
+                line_encoded = self.layout.instruction_cache.get(line)
+                if line_encoded is None:
+                    line_encoded = self.encode_line(line, labels, named_locals)
+                    cacheable = cacheable and (line in SHARED_INSTRUCTION_CACHE or line in self.layout.instruction_cache)
+            encoded += line_encoded
+        encoded = bytes(encoded)
+        if cacheable:
+            self.layout.instruction_cache[text] = encoded
+        return encoded
+
+    def encode_line(self, line: str, labels: List[str | None], named_locals: Dict[str, int]) -> bytes:
+        """
+        Encodes a line of code with at most one instruction. Structured instructions update the label stack.
+        """
+        text = line.split(";;", 1)[0].strip()
+        if text.startswith("(") and text.endswith(")"):
+            text = text[1:-1]
+        tokens = text.replace("(", " ( ").replace(")", " ) ").split()
+        if not tokens:
+            return self.cache_shared(line, b"")
+        mnemonic = tokens[0]
+        if mnemonic in BLOCK_OPCODES:
+            labels.append(tokens[1] if len(tokens) > 1 and tokens[1].startswith("$") else None)
+            return bytes([BLOCK_OPCODES[mnemonic]]) + self.block_type(tokens[1:])
+        if mnemonic == "end":
+            labels.pop()
+            return bytes([END])
+        if mnemonic in ("br", "br_if"):
+            target = tokens[1]
+            if target.startswith("$"):
+                # Named labels are resolved against the enclosing blocks, so the encoding is not cached
+                depth = len(labels) - 1 - max(i for i, label in enumerate(labels) if label == target)
+                return bytes([0x0C if mnemonic == "br" else 0x0D]) + unsigned_leb128(depth)
+            return self.cache_shared(line, bytes([0x0C if mnemonic == "br" else 0x0D]) + unsigned_leb128(int(target)))
+        if mnemonic in PLAIN_OPCODES:
+            return self.cache_shared(line, PLAIN_OPCODES[mnemonic])
+        if mnemonic in MEMORY_OPCODES:
+            opcode, align = MEMORY_OPCODES[mnemonic]
+            return self.cache_shared(line, bytes([opcode, align, 0]))
+        if mnemonic.endswith(".const"):
+            return self.cache_shared(line, encode_const(mnemonic[:3], tokens[1]))
+        if mnemonic == "ref.null":
+            return self.cache_shared(line, b"\xD0" + bytes([VALUE_TYPES[tokens[1] + "ref"]]))
+        if mnemonic in LOCAL_OPCODES:
+            opcode = LOCAL_OPCODES[mnemonic]
+            if tokens[1].startswith("$"):
+                # Named locals differ between functions, so the encoding is not cached
+                return bytes([opcode]) + unsigned_leb128(named_locals[tokens[1]])
+            return self.cache_shared(line, bytes([opcode]) + unsigned_leb128(int(tokens[1])))
+        if mnemonic in ("global.get", "global.set"):
+            encoded = (bytes([0x23 if mnemonic == "global.get" else 0x24]) +
+                       unsigned_leb128(self.layout.global_indices[tokens[1][1:]]))
+        elif mnemonic in ("table.get", "table.set"):
+            encoded = (bytes([0x25 if mnemonic == "table.get" else 0x26]) +
+                       unsigned_leb128(self.layout.table_indices[tokens[1][1:]]))
+        elif mnemonic == "call":
+            encoded = b"\x10" + unsigned_leb128(self.layout.function_indices[tokens[1][1:]])
+        elif mnemonic == "ref.func":
+            encoded = b"\xD2" + unsigned_leb128(self.layout.function_indices[tokens[1][1:]])
+        elif mnemonic == "call_indirect":
+            table = tokens[tokens.index("table") + 1][1:]
+            signature = tokens[tokens.index("type") + 1][1:]
+            encoded = (b"\x11" + unsigned_leb128(self.layout.signature_indices[signature]) +
+                       unsigned_leb128(self.layout.table_indices[table]))
+        elif mnemonic == "br_table":
+            targets = [unsigned_leb128(int(token)) for token in tokens[1:]]
+            encoded = b"\x0E" + encode_vector(targets[:-1]) + targets[-1]
+        elif mnemonic == "memory.size":
+            encoded = b"\x3F\x00"
+        else:
+            raise EncodingError(f"Unsupported instruction: {line.strip()}")
+        self.layout.instruction_cache[line] = encoded
+        return encoded
+
+    @staticmethod
+    def cache_shared(line: str, encoded: bytes) -> bytes:
+        if len(SHARED_INSTRUCTION_CACHE) >= SHARED_INSTRUCTION_CACHE_SIZE:
+            SHARED_INSTRUCTION_CACHE.clear()
+        SHARED_INSTRUCTION_CACHE[line] = encoded
+        return encoded
+
+
+def pack_prefix(k: int) -> str:
+    """
+    Returns the prefix of the import and export names of the k-th program of a packed module.
+    """
+    return f"p{k}_"
+
+
+def global_state_to_wasm(global_state: GlobalState, memoize: bool = True) -> bytes:
+    """
+    Encodes the program of a global state as a binary module. If memoize is true, the module is cached on the global
+    state like the text of global_state_to_wat_program.
+    """
+    version = program_version(global_state) if memoize else None
+    if memoize and global_state.wasm_cache is not None and global_state.wasm_cache[0] == version:
+        return global_state.wasm_cache[1]
+    module = ModuleEncoder([global_state]).encode()
+    if memoize:
+        global_state.wasm_cache = (version, module)
+    return module
+
+
+def global_states_to_packed_wasm(global_states: List[GlobalState]) -> bytes:
+    """
+    Encodes several programs as one binary module, so they are compiled and instantiated once. The programs keep their
+    own functions, globals and tables and share the imported memory. The names of the imports and exports of the k-th
+    program are prefixed with pack_prefix(k), e.g. its entry function is exported as p{k}_run.
+    """
+    return ModuleEncoder(global_states, [pack_prefix(k) for k in range(len(global_states))]).encode()
@@ -18,12 +18,13 @@ from core.curriculum import CurriculumInstance
 from drl.embedder.targets import TargetsEmbedder
 
 sys.setrecursionlimit(20000)  # use with caution
-from core.constraints import AbstractConstraint, ConstraintsViolatedError
+from core.constraints import AbstractConstraint, ConstraintsViolatedError, ResponseTimeConstraint
 from core.converter import global_state_to_wat_program
+from core.dedup import SeenSet, DuplicateProgramError
 from core.formater import add_line_numbers_to_code
 from core.loader import TileLoader
 from core.processor import AbstractPostProcessor
-from core.runner import run_global_state, AbstractRunResult
+from core.runner import run_global_state, check_response_time, AbstractRunResult, PerformanceMetric
 from core.state.functions import Function, Block, BlockType
 from drl.embedder.block import BlockEmbedder
 from drl.embedder.constraints import ConstraintsEmbedder
@@ -31,7 +32,7 @@ from core.value import Val
 from core.state.state import GlobalState
 from core.strategy import AbstractSelectionStrategy
 from core.tile import AbstractTile
-from core.util import generate_function, apply_function
+from core.util import generate_function, apply_function, NoTilesLeftException
 from drl.embedder.function import FunctionEmbedder
 from drl.embedder.globals import GlobalsEmbedder
 from drl.embedder.locals import LocalsEmbedder
@@ -89,7 +90,8 @@ class WasmWeaverEnv(gym.Env):
                  output_types: List[List[Val]] = None,
                  reward_function: AbstractRewardFunction = None,
                  curriculum: CurriculumInstance = None,
-                 verbose=False, post_processor_types:List[Type[AbstractPostProcessor]] = None, forbidden_instruction_name_tokens=None):
+                 verbose=False, post_processor_types:List[Type[AbstractPostProcessor]] = None, forbidden_instruction_name_tokens=None,
+                 seen_set: SeenSet = None):
 
         super(WasmWeaverEnv, self).__init__()
         self.post_processor_types = post_processor_types if post_processor_types else []
@@ -150,6 +152,8 @@ class WasmWeaverEnv(gym.Env):
         self.current_run_result: AbstractRunResult | None = None
         self.abstract_reward_function = reward_function if reward_function is not None else AbstractRewardFunction()
         self.verbose = verbose
+        # Finished programs that duplicate a program in the seen set end the episode with a DuplicateProgramError
+        self.seen_set = seen_set
         self.curriculum = curriculum
         if self.curriculum is None:
             step_sizes = [0 for _ in self.constraints]
@@ -195,6 +199,8 @@ class WasmWeaverEnv(gym.Env):
             output_types = random.choice(self.output_types)
             generate_function(self.tile_loader, "run", self.input_types, self.init_state, is_entry=True,
                               fixed_output_types=output_types,selection_strategy=self.tile_loader.selection_strategy)
+            if self.seen_set is not None:
+                self.seen_set.check(self.current_state)
 
             self.current_code_str = global_state_to_wat_program(self.current_state)
             self.current_state.memory.reinit_memory()
@@ -208,7 +214,11 @@ class WasmWeaverEnv(gym.Env):
             post_processors_copy = deepcopy(self.post_processor_instances)
             try:
                 self.current_code_str = global_state_to_wat_program(self.current_state)
-                self.current_run_result = run_global_state(self.current_state)
+                # Response time targets are checked against the measured response time
+                measure = self.current_state.constraints[ResponseTimeConstraint] is not None
+                self.current_run_result = run_global_state(
+                    self.current_state,
+                    metric=PerformanceMetric.RESPONSE_TIME if measure else PerformanceMetric.FUEL)
             except Exception as e:
                 print("Error running global state")
                 print(e)
@@ -220,6 +230,7 @@ class WasmWeaverEnv(gym.Env):
                 self.current_run_result.return_types = output_types
                 for post_processor_instance in self.post_processor_instances:
                     post_processor_instance.detach(self.current_state)
+            check_response_time(self.current_state, self.current_run_result)
 
             if self.verbose:
                 print("Finished the following program:")
@@ -228,7 +239,12 @@ class WasmWeaverEnv(gym.Env):
 
             self.finish_state = "Success"
             self.global_state_ready.release()
-        except ConstraintsViolatedError as e:
+        except DuplicateProgramError as e:
+            if self.verbose:
+                print("Duplicate program")
+            self.finish_state = e
+            self.global_state_ready.release()
+        except (ConstraintsViolatedError, NoTilesLeftException) as e:
             print("Failed!")
             for constraint in self.current_state.constraints.constraints:
                 print(constraint)
@@ -0,0 +1,153 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Lower bounds on the resources needed to finish a function or block that is being generated.
+
+Every tile costs at least MIN_TILE_BYTE_CODE_SIZE bytes and MIN_TILE_FUEL_COST fuel, and every open function or block
+still needs enough tiles to reach its minimum tile count and its output types. A tile whose own minimum cost plus these
+bounds exceeds a constraint can never lead to a finished program, so it is not offered to the selection strategy.
+
+The bounds only remove tiles that are doomed, they do not make a seed more likely to finish. A seed whose last tiles
+are pruned fails with NoTilesLeftException in about the step where it would otherwise violate a constraint.
+"""
+
+from typing import List, Tuple, Type, Union
+from core.config.config import MIN_BLOCK_TILES, MIN_FUNCTION_TILES, MIN_TILE_BYTE_CODE_SIZE, MIN_TILE_FUEL_COST, \
+    MAX_FUNCTION_INPUTS, MAX_FUNCTION_OUTPUTS, MAX_BLOCK_OUTPUTS
+from core.constraints import ByteCodeSizeConstraint, FuelConstraint
+from core.state.functions import Function, Block, BlockType
+from core.state.state import GlobalState
+from core.tile import AbstractTile
+from core.value import Val
+
+# Tiles that end the generation of a function
+FUNCTION_END_TILES = ("Br", "Return")
+# The most values a single tile removes from or adds to the stack. An indirect call pops its arguments and the table
+# index, calls and blocks push their outputs.
+MAX_STACK_SHRINK = MAX_FUNCTION_INPUTS + 1
+MAX_STACK_GROWTH = max(MAX_FUNCTION_OUTPUTS, MAX_BLOCK_OUTPUTS)
+
+
+def nested_min_tiles(tile: Type[AbstractTile], global_state: GlobalState) -> Tuple[int, bool]:
+    """
+    Returns the minimum number of tiles the generation of the function or blocks nested in a tile places, and if the
+    constraints are restored afterward, like for loops. Both are declared by the tile.
+    """
+    return tile.get_min_nested_tiles(global_state), tile.restores_constraints
+
+
+def min_byte_code_size(tile: Type[AbstractTile]) -> int:
+    """
+    Returns a lower bound of the byte code size of a tile. Most tiles have a fixed size, which is read from a blank
+    instance and cached on the tile. Tiles whose size depends on their state, like constants, declare
+    min_byte_code_size themselves.
+    """
+    if tile.min_byte_code_size is None:
+        instance = tile.__new__(tile)
+        AbstractTile.__init__(instance, 0)
+        try:
+            tile.min_byte_code_size = instance.get_byte_code_size()
+        except AttributeError:
+            tile.min_byte_code_size = MIN_TILE_BYTE_CODE_SIZE
+    return tile.min_byte_code_size
+
+
+def min_closing_tiles(container: Union[Function, Block], min_tiles: int, extra_tiles: int = 0) -> int:
+    """
+    Returns the minimum number of tiles still needed to reach the minimum tile count of a function or block, if
+    extra_tiles more tiles are placed first.
+    """
+    return max(0, min_tiles - len(container.tiles) - extra_tiles)
+
+
+def enclosing_min_tiles(current_function: Function, current_blocks: List[Block]) -> int:
+    """
+    Returns the minimum number of tiles the enclosing blocks and the function still need once the innermost block is
+    finished. Loops restore the byte code size after generating their body, so the count stops at the innermost loop.
+    Without blocks, the function is the innermost container and nothing encloses it.
+    """
+    if not current_blocks or current_blocks[-1].type == BlockType.LOOP:
+        return 0
+    count = 0
+    for i in range(len(current_blocks) - 2, -1, -1):
+        # The structured tile holding the inner block is added to its parent when the inner block is finished
+        count += min_closing_tiles(current_blocks[i], MIN_BLOCK_TILES, 1)
+        if current_blocks[i].type == BlockType.LOOP:
+            return count
+    return count + min_closing_tiles(current_function, MIN_FUNCTION_TILES, 1)
+
+
+def min_stack_fixing_tiles(stack_types: List[Type[Val]], output_types: List[Type[Val]]) -> int:
+    """
+    Returns the minimum number of tiles needed to turn the stack types into the output types. Branches need the exact
+    number of outputs on the stack as well, so they do not shorten this.
+    """
+    if stack_types == output_types:
+        return 0
+    difference = len(stack_types) - len(output_types)
+    if difference > 0:
+        return -(-difference // MAX_STACK_SHRINK)
+    if difference < 0:
+        return -(difference // MAX_STACK_GROWTH)
+    return 1
+
+
+def stack_types_after(tile: Type[AbstractTile], stack_types: List[Type[Val]]) -> List[Type[Val]] | None:
+    """
+    Returns the stack types after placing a tile, or None if the tile does not declare its stack effect.
+    """
+    if tile.stack_inputs is None or tile.stack_outputs is None:
+        return None
+    return stack_types[:len(stack_types) - len(tile.stack_inputs)] + list(tile.stack_outputs)
+
+
+def prune_infeasible_tiles(tiles: List[Type[AbstractTile]], global_state: GlobalState, current_function: Function,
+                           current_blocks: List[Block], output_types: List[Type[Val]]) -> List[Type[AbstractTile]]:
+    """
+    Removes the tiles after which the current function or block can not be finished within the byte code size and
+    fuel constraints. current_blocks contains the block being generated as its last entry, if any.
+    """
+    byte_code = global_state.constraints[ByteCodeSizeConstraint]
+    fuel = global_state.constraints[FuelConstraint]
+    remaining_byte_code = byte_code.get_remaining_resource() if byte_code is not None else float("inf")
+    remaining_fuel = fuel.get_remaining_resource() if fuel is not None else float("inf")
+    container = current_blocks[-1] if current_blocks else current_function
+    min_tiles = MIN_BLOCK_TILES if current_blocks else MIN_FUNCTION_TILES
+    reserved_tiles = enclosing_min_tiles(current_function, current_blocks)
+    stack_types = list(global_state.stack.get_current_frame().types)
+    output_types = list(output_types) if output_types is not None else None
+    # Upper bounds of the nested and closing tiles of any tile. Far from the limits, only the size of a tile matters.
+    max_nested_tiles = max(2 * MIN_BLOCK_TILES, MIN_FUNCTION_TILES)
+    max_closing_tiles = max(min_tiles, len(stack_types) + len(output_types or ()) + MAX_STACK_GROWTH + 1)
+    byte_code_slack = (remaining_byte_code
+                       - (max_nested_tiles + max_closing_tiles + reserved_tiles) * MIN_TILE_BYTE_CODE_SIZE)
+    fuel_slack = remaining_fuel - (max_nested_tiles + 1 + max_closing_tiles) * MIN_TILE_FUEL_COST
+    feasible = []
+    for tile in tiles:
+        byte_code_size = tile.min_byte_code_size
+        if byte_code_size is None:
+            byte_code_size = min_byte_code_size(tile)
+        if fuel_slack >= 0 and byte_code_size <= byte_code_slack:
+            feasible.append(tile)
+            continue
+        if not current_blocks and tile.name in FUNCTION_END_TILES:
+            closing_tiles = 0
+        else:
+            closing_tiles = min_closing_tiles(container, min_tiles, 1)
+            types_after = stack_types_after(tile, stack_types)
+            if output_types is not None and types_after is not None:
+                closing_tiles = max(closing_tiles, min_stack_fixing_tiles(types_after, output_types))
+        nested_tiles, restored = nested_min_tiles(tile, global_state)
+        following_byte_code = (closing_tiles + reserved_tiles) * MIN_TILE_BYTE_CODE_SIZE
+        if restored:
+            # Loops generate their body with a divided fuel budget and restore all constraints afterward
+            needed_byte_code = max(nested_tiles * MIN_TILE_BYTE_CODE_SIZE, byte_code_size + following_byte_code)
+            needed_fuel = (1 + closing_tiles) * MIN_TILE_FUEL_COST
+        else:
+            # The runtime metrics are reset after nested code was generated, so only the larger part has to fit
+            needed_byte_code = nested_tiles * MIN_TILE_BYTE_CODE_SIZE + byte_code_size + following_byte_code
+            needed_fuel = max(nested_tiles, 1 + closing_tiles) * MIN_TILE_FUEL_COST
+        if needed_byte_code <= remaining_byte_code and needed_fuel <= remaining_fuel:
+            feasible.append(tile)
+    return feasible
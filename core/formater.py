@@ -1,6 +1,87 @@
 # SPDX-License-Identifier: MIT
 # SPDX-FileCopyrightText: 2025 Siemens AG
 
+from typing import List
+
+INDENT = "    "
+
+
+class CodeBody:
+    """
+    Code that is indented one level deeper than the code around it. The items are tiles, which are emitted with the
+    given current blocks, or lines.
+    """
+    __slots__ = ("items", "current_blocks")
+
+    def __init__(self, items: list, current_blocks: list):
+        self.items = items
+        self.current_blocks = current_blocks
+
+
+class CodeWriter:
+    """
+    Writes the code of tiles line by line into a single buffer. Tiles that nest code return code parts, see
+    AbstractTile.generate_code_parts, which are expanded iteratively with the indentation tracked by depth, so no text
+    is split and indented again per nesting level. Only non-empty lines are indented.
+    """
+
+    def __init__(self, current_state, current_function, buffer: List[str] | None = None):
+        self.current_state = current_state
+        self.current_function = current_function
+        self.buffer: List[str] = [] if buffer is None else buffer
+
+    def write_text(self, text: str, depth: int):
+        """
+        Writes the lines of a text, indented by depth.
+        """
+        indent = INDENT * depth
+        for line in text.split("\n"):
+            self.buffer.append(indent + line + "\n" if line.strip() else line + "\n")
+
+    def write_parts(self, parts: list, current_blocks: list, depth: int = 0):
+        """
+        Writes code parts: lines, tiles and bodies.
+        """
+        buffer = self.buffer
+        current_state, current_function = self.current_state, self.current_function
+        pending = [(iter(parts), current_blocks, depth)]
+        while pending:
+            items, current_blocks, depth = pending[-1]
+            indent = INDENT * depth
+            for item in items:
+                if item.__class__ is str:
+                    text = item
+                elif item.__class__ is CodeBody:
+                    pending.append((iter(item.items), item.current_blocks, depth + 1))
+                    break
+                else:
+                    tile_parts = item.generate_code_parts(current_state, current_function, current_blocks)
+                    if tile_parts is not None:
+                        pending.append((iter(tile_parts), current_blocks, depth))
+                        break
+                    text = item.generate_code(current_state, current_function, current_blocks)
+                if "\n" in text:
+                    self.write_text(text, depth)
+                elif text.strip():
+                    buffer.append(indent + text + "\n")
+                else:
+                    buffer.append(text + "\n")
+            else:
+                pending.pop()
+
+    def getvalue(self) -> str:
+        return "".join(self.buffer)
+
+
+def render_code_parts(parts: list, current_state, current_function, current_blocks: list) -> str:
+    """
+    Returns the text of code parts, without a trailing line break.
+    """
+    writer = CodeWriter(current_state, current_function)
+    writer.write_parts(parts, current_blocks)
+    return writer.getvalue()[:-1]
+
+
 def indent_code(code: str, indent: int=4) -> str:
     """
     Indents the code by the given number of spaces.
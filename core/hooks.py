@@ -0,0 +1,67 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Callbacks around the application of tiles, e.g. for tracing.
+
+Hooks belong to a global state, so generators running side by side do not see each other's subscribers. A global state
+without hooks applies its tiles directly, which is the default during generation.
+"""
+
+from contextlib import contextmanager
+from typing import Callable, List, TYPE_CHECKING
+if TYPE_CHECKING:
+    from core.state.state import GlobalState
+    from core.tile import AbstractTile
+
+# Called with the tile, the global state, the current function and the current blocks
+HookCallback = Callable[..., None]
+
+
+class ExecutionHooks:
+    """
+    The callbacks called before and after a tile is applied.
+    """
+
+    def __init__(self):
+        self.apply_callbacks: List[HookCallback] = []
+        self.end_callbacks: List[HookCallback] = []
+
+    def __bool__(self):
+        return bool(self.apply_callbacks or self.end_callbacks)
+
+    def apply(self, tile: "AbstractTile", current_state: "GlobalState", current_function, current_blocks):
+        """
+        Applies a tile between the callbacks and returns its result.
+        """
+        for callback in self.apply_callbacks:
+            callback(tile, current_state, current_function, current_blocks)
+        res = tile.apply(current_state, current_function, current_blocks)
+        for callback in self.end_callbacks:
+            callback(tile, current_state, current_function, current_blocks)
+        return res
+
+
+@contextmanager
+def subscribe(global_state: "GlobalState", apply_callback: HookCallback | None = None,
+              end_callback: HookCallback | None = None):
+    """
+    Calls the callbacks around every tile applied on the global state while the context is active.
+    """
+    if global_state.hooks is None:
+        global_state.hooks = ExecutionHooks()
+    hooks = global_state.hooks
+    if apply_callback is not None:
+        hooks.apply_callbacks.append(apply_callback)
+    if end_callback is not None:
+        hooks.end_callbacks.append(end_callback)
+    try:
+        yield hooks
+    finally:
+        if apply_callback is not None:
+            hooks.apply_callbacks.remove(apply_callback)
+        if end_callback is not None:
+            hooks.end_callbacks.remove(end_callback)
+        if not hooks and global_state.hooks is hooks:
+            # Back to the plain path
+            global_state.hooks = None
@@ -10,6 +10,7 @@ from core.value import I32, Num
 
 class NoOp(AbstractTile):
     name = "NoOp"
+    instruction = "nop"
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -18,15 +19,10 @@ class NoOp(AbstractTile):
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
         pass
 
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "nop"
-
-    def get_byte_code_size(self):
-        return 1
-
 
 class Drop(AbstractTile):
     name = "Drop"
+    instruction = "drop"
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -35,15 +31,10 @@ class Drop(AbstractTile):
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
         current_state.stack.get_current_frame().stack_pop()
 
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "drop"
-
-    def get_byte_code_size(self):
-        return 1
-
 
 class Select(AbstractTile):
     name = "Select"
+    instruction = "select"
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -72,9 +63,3 @@ class Select(AbstractTile):
             result = false_value
 
         current_state.stack.get_current_frame().stack_push(result)
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "select"
-
-    def get_byte_code_size(self):
-        return 1
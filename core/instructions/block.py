@@ -5,10 +5,10 @@ import random
 from typing import List, Type
 
 from core.config.config import MAX_BLOCKS_PER_FUNCTION, \
-    MAX_BLOCK_INPUTS, MAX_BLOCK_OUTPUTS
+    MAX_BLOCK_INPUTS, MAX_BLOCK_OUTPUTS, MIN_BLOCK_TILES
 from core.state.functions import Function, Block, BlockType
 from core.state.state import GlobalState
-from core.tile import AbstractTileFactory, AbstractTile, wrap_apply_function
+from core.tile import AbstractTileFactory, AbstractTile
 from core.util import generate_block, apply_block, can_place_block
 from core.value import get_random_val
 
@@ -77,7 +77,7 @@ class AbstractBlockTileFactory(AbstractTileFactory):
                 tile.block = generate_block(tile_loader, global_state, current_function,
                                             forced_inputs,
                                             name, fixed_output_types=forced_output_types, blocks=current_blocks,block_type=BlockType.BLOCK)
-                tile.generate_code = tile.block.generate_code
+                tile.generate_code_parts = tile.block.generate_code_parts
                 tile.get_byte_code_size = tile.block.get_byte_code_size
                 tile.get_fuel_cost = tile.block.get_fuel_cost
                 tile.get_response_time = tile.block.get_response_time
@@ -90,8 +90,12 @@ class AbstractBlockTileFactory(AbstractTileFactory):
 
 
 
-        tile.apply = wrap_apply_function(apply)
+        def get_min_nested_tiles(current_state: GlobalState) -> int:
+            return MIN_BLOCK_TILES if tile.block is None else 0
+
+        tile.apply = apply
         tile.can_be_placed = staticmethod(can_be_placed)
+        tile.get_min_nested_tiles = staticmethod(get_min_nested_tiles)
         return tile
 
 
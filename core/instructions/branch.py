@@ -4,9 +4,10 @@
 import random
 from typing import List, Type
 from core.config.config import MIN_BLOCK_TILES, MIN_FUNCTION_TILES
+from core.encoder import encode_vector, unsigned_leb128
 from core.state.functions import Function, Block, BlockType
 from core.state.state import GlobalState
-from core.tile import AbstractTileFactory, AbstractTile, BranchOperation, wrap_apply_function
+from core.tile import AbstractTileFactory, AbstractTile, BranchOperation
 from core.value import I32, Val
 
 
@@ -89,7 +90,7 @@ class AbstractBranchTileFactory(AbstractTileFactory):
         """
         Creates a branch tile that jumps to the target block or function.
         """
-        tile = type(f"BrTile", (AbstractTile,), {"index": index})
+        tile = type(f"BrTile", (AbstractTile,), {"index": index, "target": target})
         tile.name = f"Br" if not is_return else "Return"
 
         def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -130,12 +131,23 @@ class AbstractBranchTileFactory(AbstractTileFactory):
             else:
                 return f"br {index}"
 
+        def encode(self, encoder, current_state: GlobalState, current_function: Function,
+                   current_blocks: List[Block]) -> bytes:
+            if is_return:
+                return b"\x0F"
+            return b"\x0C" + unsigned_leb128(index)
+
+        def get_byte_code_size(self):
+            return 1 if is_return else 1 + len(unsigned_leb128(index))
+
         def __repr__(self):
             return f"{tile.name} Target: {target.name} Index: {index}"
 
 
         tile.generate_code = generate_code
-        tile.apply = wrap_apply_function(apply)
+        tile.encode = encode
+        tile.get_byte_code_size = get_byte_code_size
+        tile.apply = apply
         tile.can_be_placed = staticmethod(can_be_placed)
         tile.__repr__ = __repr__
         return tile
@@ -144,7 +156,7 @@ class AbstractBranchTileFactory(AbstractTileFactory):
         """
         Creates a branch if tile that jumps to the target block or function if the condition is true.
         """
-        tile = type(f"BrIfTile", (AbstractTile,), {"index": index})
+        tile = type(f"BrIfTile", (AbstractTile,), {"index": index, "target": target})
         tile.name = f"Br_if"
 
         def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -193,12 +205,21 @@ class AbstractBranchTileFactory(AbstractTileFactory):
                           current_blocks: List[Block]) -> str:
             return f"br_if {index}"
 
+        def encode(self, encoder, current_state: GlobalState, current_function: Function,
+                   current_blocks: List[Block]) -> bytes:
+            return b"\x0D" + unsigned_leb128(index)
+
+        def get_byte_code_size(self):
+            return 1 + len(unsigned_leb128(index))
+
         def __repr__(self):
             return f"{tile.name} Target: {target.name} Index: {index}"
 
 
         tile.generate_code = generate_code
-        tile.apply = wrap_apply_function(apply)
+        tile.encode = encode
+        tile.get_byte_code_size = get_byte_code_size
+        tile.apply = apply
         tile.can_be_placed = staticmethod(can_be_placed)
         tile.__repr__ = __repr__
         return tile
@@ -210,6 +231,9 @@ class AbstractBranchTileFactory(AbstractTileFactory):
 
         tile = type(f"BrTableTile", (AbstractTile,),{"indices": indices, "targets": targets})
         tile.name = f"Br_table"
+        # The last index is the default target
+        labels = [unsigned_leb128(index) for index in indices]
+        encoded = b"\x0E" + encode_vector(labels[:-1]) + labels[-1]
 
         def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
             nonlocal tile
@@ -258,12 +282,21 @@ class AbstractBranchTileFactory(AbstractTileFactory):
             """Returns the code that the tile represents"""
             return f"(br_table {' '.join(str(index) for index in indices)})"
 
+        def encode(self, encoder, current_state: GlobalState, current_function: Function,
+                   current_blocks: List[Block]) -> bytes:
+            return encoded
+
+        def get_byte_code_size(self):
+            return len(encoded)
+
         def __repr__(self):
             return f"{tile.name} Targets: {targets} Indices: {indices}"
 
 
         tile.generate_code = generate_code
-        tile.apply = wrap_apply_function(apply)
+        tile.encode = encode
+        tile.get_byte_code_size = get_byte_code_size
+        tile.apply = apply
         tile.can_be_placed = staticmethod(can_be_placed)
         tile.__repr__ = __repr__
         return tile
\ No newline at end of file
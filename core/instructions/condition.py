@@ -4,10 +4,10 @@
 import random
 from typing import List, Type
 
-from core.config.config import MAX_BLOCKS_PER_FUNCTION, MAX_IF_ELSE_INPUTS, MAX_IF_ELSE_OUTPUTS
+from core.config.config import MAX_BLOCKS_PER_FUNCTION, MAX_IF_ELSE_INPUTS, MAX_IF_ELSE_OUTPUTS, MIN_BLOCK_TILES
 from core.state.functions import Function, Block, BlockType
 from core.state.state import GlobalState
-from core.tile import AbstractTileFactory, AbstractTile, wrap_apply_function
+from core.tile import AbstractTileFactory, AbstractTile
 from core.util import generate_block, can_place_block, apply_block
 from core.value import I32, get_random_val
 
@@ -94,9 +94,14 @@ class ConditionTileFactory(AbstractTileFactory):
                 raise ValueError("Block cannot be applied.")
             return apply_state
 
-        tile.generate_code = lambda se, st, f, bs: tile.if_block.generate_code(st, f, bs) + tile.else_block.generate_code(
-            st, f, bs)
-        tile.apply = wrap_apply_function(apply)
+        # The if block ends with the line the else block starts
+        tile.generate_code_parts = lambda se, st, f, bs: tile.if_block.generate_code_parts(st, f, bs)[:-1] + \
+            tile.else_block.generate_code_parts(st, f, bs)
+        def get_min_nested_tiles(current_state: GlobalState) -> int:
+            return 2 * MIN_BLOCK_TILES if tile.if_block is None else 0
+
+        tile.apply = apply
         tile.can_be_placed = staticmethod(can_be_placed)
+        tile.get_min_nested_tiles = staticmethod(get_min_nested_tiles)
         return tile
 
@@ -68,9 +68,9 @@ class Canary(AbstractTile):
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
         n = current_state.stack.get_current_frame().stack_peek()
         if isinstance(n, I32):
-            current_state.canary_output.append(int(np.int32(n.value)))
+            current_state.canary_output.append(int(n.value))
         elif isinstance(n, I64):
-            current_state.canary_output.append(int(np.int64(n.value)))
+            current_state.canary_output.append(int(n.value))
         elif isinstance(n, F32):
             current_state.canary_output.append(float(np.float32(n.value)))
         elif isinstance(n, F64):
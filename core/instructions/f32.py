@@ -4,7 +4,9 @@
 import random
 from typing import List
 import numpy as np
+from core import integers
 from core.config.config import MEMORY_MAX_WRITE_INDEX
+from core.encoder import encode_const
 from core.state.functions import Function, Block
 from core.state.state import GlobalState
 from core.tile import AbstractTile
@@ -34,77 +36,47 @@ class Float32Const(AbstractTile):
     def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
         return f"(f32.const {self.value})"
 
+    def encode(self, encoder, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> bytes:
+        return encode_const("f32", self.value)
+
     def get_byte_code_size(self):
-        return 5  # This is assuming constant size, adjust if a different model is used
+        return 5
 
 class Float32Add(AbstractTile):
     name = "F32Add"
+    instruction = "f32.add"
+    stack_inputs = (F32, F32)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32) and isinstance(b, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(a.value + b.value))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.add"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(b, a):
+        return a + b
 
 class Float32Sub(AbstractTile):
     name = "F32Sub"
+    instruction = "f32.sub"
+    stack_inputs = (F32, F32)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32) and isinstance(b, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32((a.value - b.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.sub"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a, b):
+        return (a - b)
 
 class Float32Mul(AbstractTile):
     name = "F32Mul"
+    instruction = "f32.mul"
+    stack_inputs = (F32, F32)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32) and isinstance(b, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32((a.value * b.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.mul"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(b, a):
+        return (a * b)
 
 class Float32Div(AbstractTile):
     name = "F32Div"
+    instruction = "f32.div"
+    stack_inputs = (F32, F32)
+    stack_outputs = (F32,)
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -114,23 +86,19 @@ class Float32Div(AbstractTile):
         b = current_state.stack.get_current_frame().stack_peek(1)
         return isinstance(a, F32) and isinstance(b, F32) and b.value != 0  # ensure b is not zero
 
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        if b.value == 0.0:
+    @staticmethod
+    def kernel(a, b):
+        if b == 0.0:
             raise ValueError("Division by zero")
-        result = a.value.astype(np.float32) / b.value.astype(np.float32)
+        result = a.astype(np.float32) / b.astype(np.float32)
         result = np.float32(result)
-        current_state.stack.get_current_frame().stack_push(F32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.div"
-
-    def get_byte_code_size(self):
-        return 1
+        return result
 
 class Float32Sqrt(AbstractTile):
     name = "F32Sqrt"
+    instruction = "f32.sqrt"
+    stack_inputs = (F32,)
+    stack_outputs = (F32,)
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -139,463 +107,237 @@ class Float32Sqrt(AbstractTile):
         a = current_state.stack.get_current_frame().stack_peek(1)
         return isinstance(a, F32) and a.value >= 0
 
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.sqrt(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.sqrt"
-
-    def get_byte_code_size(self):
-        return 1
+    @staticmethod
+    def kernel(a):
+        return np.sqrt(a)
 
 class Float32Min(AbstractTile):
     name = "F32Min"
+    instruction = "f32.min"
+    stack_inputs = (F32, F32)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32) and isinstance(b, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.minimum(a.value, b.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.min"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(b, a):
+        # Wasm orders the zeros, -0 is smaller than 0
+        if a == b:
+            return a if np.signbit(a) else b
+        return np.minimum(a, b)
 
 class Float32Max(AbstractTile):
     name = "F32Max"
+    instruction = "f32.max"
+    stack_inputs = (F32, F32)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32) and isinstance(b, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.maximum(a.value, b.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.max"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(b, a):
+        # Wasm orders the zeros, 0 is larger than -0
+        if a == b:
+            return b if np.signbit(a) else a
+        return np.maximum(a, b)
 
 class Float32Ceil(AbstractTile):
     name = "F32Ceil"
+    instruction = "f32.ceil"
+    stack_inputs = (F32,)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.ceil(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.ceil"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.ceil(a)
 
 class Float32Floor(AbstractTile):
     name = "F32Floor"
+    instruction = "f32.floor"
+    stack_inputs = (F32,)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.floor(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.floor"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.floor(a)
 
 class Float32Trunc(AbstractTile):
     name = "F32Trunc"
+    instruction = "f32.trunc"
+    stack_inputs = (F32,)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.trunc(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.trunc"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.trunc(a)
 
 class Float32Nearest(AbstractTile):
     name = "F32Nearest"
+    instruction = "f32.nearest"
+    stack_inputs = (F32,)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.round(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.nearest"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.round(a)
 
 class Float32Abs(AbstractTile):
     name = "F32Abs"
+    instruction = "f32.abs"
+    stack_inputs = (F32,)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.abs(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.abs"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.abs(a)
 
 class Float32Neg(AbstractTile):
     name = "F32Neg"
+    instruction = "f32.neg"
+    stack_inputs = (F32,)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(-a.value))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.neg"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return -a
 
 class Float32CopySign(AbstractTile):
     name = "F32CopySign"
+    instruction = "f32.copysign"
+    stack_inputs = (F32, F32)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32) and isinstance(b, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.copysign(a.value, b.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.copysign"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a, b):
+        return np.copysign(a, b)
 
 class Float32Eq(AbstractTile):
     name = "F32Eq"
+    instruction = "f32.eq"
+    stack_inputs = (F32, F32)
+    stack_outputs = (I32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32) and isinstance(b, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        result = np.int32(a.value == b.value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.eq"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(b, a):
+        result = int(a == b)
+        return result
 
 class Float32Ne(AbstractTile):
     name = "F32Ne"
+    instruction = "f32.ne"
+    stack_inputs = (F32, F32)
+    stack_outputs = (I32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32) and isinstance(b, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        result = np.int32(a.value != b.value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.ne"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(b, a):
+        result = int(a != b)
+        return result
 
 class Float32Lt(AbstractTile):
     name = "F32Lt"
+    instruction = "f32.lt"
+    stack_inputs = (F32, F32)
+    stack_outputs = (I32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32) and isinstance(b, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        result = np.int32(a.value < b.value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.lt"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a, b):
+        result = int(a < b)
+        return result
 
 class Float32Le(AbstractTile):
     name = "F32Le"
+    instruction = "f32.le"
+    stack_inputs = (F32, F32)
+    stack_outputs = (I32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32) and isinstance(b, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        result = np.int32(a.value <= b.value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.le"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a, b):
+        result = int(a <= b)
+        return result
 
 class Float32Gt(AbstractTile):
     name = "F32Gt"
+    instruction = "f32.gt"
+    stack_inputs = (F32, F32)
+    stack_outputs = (I32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32) and isinstance(b, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        result = np.int32(a.value > b.value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.gt"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a, b):
+        result = int(a > b)
+        return result
 
 class Float32Ge(AbstractTile):
     name = "F32Ge"
+    instruction = "f32.ge"
+    stack_inputs = (F32, F32)
+    stack_outputs = (I32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32) and isinstance(b, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        result = np.int32(a.value >= b.value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.ge"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a, b):
+        result = int(a >= b)
+        return result
 
 class Float32DemoteF64(AbstractTile):
     name = "F32DemoteF64"
+    instruction = "f32.demote_f64"
+    stack_inputs = (F64,)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.float32(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.demote_f64"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.float32(a)
 
 class Float32ConvertI32S(AbstractTile):
     name = "F32ConvertI32S"
+    instruction = "f32.convert_i32_s"
+    stack_inputs = (I32,)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.float32(np.int32(a.value))))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.convert_i32_s"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.float32(a)
 
 class Float32ConvertI32U(AbstractTile):
     name = "F32ConvertI32U"
+    instruction = "f32.convert_i32_u"
+    stack_inputs = (I32,)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.float32(np.uint32(a.value))))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.convert_i32_u"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.float32(integers.u32(a))
 
 class Float32ConvertI64S(AbstractTile):
     name = "F32ConvertI64S"
+    instruction = "f32.convert_i64_s"
+    stack_inputs = (I64,)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.float32(np.int64(a.value))))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.convert_i64_s"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.float32(np.int64(a))  # Convert directly to round only once
 
 class Float32ConvertI64U(AbstractTile):
     name = "F32ConvertI64U"
+    instruction = "f32.convert_i64_u"
+    stack_inputs = (I64,)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(np.float32(np.uint64(a.value))))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.convert_i64_u"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.float32(np.uint64(integers.u64(a)))  # Convert directly to round only once
 
 class Float32ReinterpretI32(AbstractTile):
     name = "F32ReinterpretI32"
+    instruction = "f32.reinterpret_i32"
+    stack_inputs = (I32,)
+    stack_outputs = (F32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop().value.astype(np.int32)
-        result = a.view(np.float32)
-        current_state.stack.get_current_frame().stack_push(F32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f32.reinterpret_i32"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        result = np.int32(a).view(np.float32)
+        return result
 
 class Float32Store(AbstractTile):
     name = "F32Store"
+    instruction = "f32.store"
+    stack_inputs = (I32, F32)
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -610,23 +352,19 @@ class Float32Store(AbstractTile):
         value = current_state.stack.get_current_frame().stack_peek(1)
         if not isinstance(value, F32):
             return False
-        if offset.value.astype(np.uint32) >= MEMORY_MAX_WRITE_INDEX - 4:
+        if integers.u32(offset.value) >= MEMORY_MAX_WRITE_INDEX - 4:
             return False
         return True
 
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
         value = current_state.stack.get_current_frame().stack_pop()
         offset = current_state.stack.get_current_frame().stack_pop()
-        current_state.memory.f32_store(offset.value.astype(np.uint32), value.value.astype(np.float32))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return f"f32.store"
-
-    def get_byte_code_size(self):
-        return 2
+        current_state.memory.f32_store(integers.u32(offset.value), value.value.astype(np.float32))
 
 class Float32Load(AbstractTile):
     name = "F32Load"
+    instruction = "f32.load"
+    stack_inputs = (I32,)
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -639,16 +377,10 @@ class Float32Load(AbstractTile):
         if not isinstance(offset, I32):
             return False
         #Check if in range
-        if offset.value.astype(np.uint32) >= MEMORY_MAX_WRITE_INDEX - 4:
+        if integers.u32(offset.value) >= MEMORY_MAX_WRITE_INDEX - 4:
             return False
         return True
 
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
         offset = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F32(current_state.memory.f32_load(offset.value.astype(np.uint32))))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return f"f32.load"
-
-    def get_byte_code_size(self):
-        return 2
+        current_state.stack.get_current_frame().stack_push(F32(np.float32(current_state.memory.f32_load(integers.u32(offset.value)))))
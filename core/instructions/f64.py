@@ -4,7 +4,9 @@
 import random
 from typing import List
 import numpy as np
+from core import integers
 from core.config.config import MEMORY_MAX_WRITE_INDEX
+from core.encoder import encode_const
 from core.state.functions import Function, Block
 from core.state.state import GlobalState
 from core.tile import AbstractTile
@@ -34,79 +36,50 @@ class Float64Const(AbstractTile):
         current_state.stack.get_current_frame().stack_push(F64(self.value))
 
     def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return f"(f64.const {self.value})"
+        # Python formats doubles like NumPy, but faster
+        return f"(f64.const {float(self.value)!r})"
+
+    def encode(self, encoder, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> bytes:
+        return encode_const("f64", self.value)
 
     def get_byte_code_size(self):
-        return 9  # This is assuming constant size, adjust if a different model is used
+        return 9
 
 class Float64Add(AbstractTile):
     name = "F64Add"
+    instruction = "f64.add"
+    stack_inputs = (F64, F64)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64) and isinstance(b, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(a.value + b.value))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.add"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(b, a):
+        return a + b
 
 class Float64Sub(AbstractTile):
     name = "F64Sub"
+    instruction = "f64.sub"
+    stack_inputs = (F64, F64)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64) and isinstance(b, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64((a.value - b.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.sub"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a, b):
+        return (a - b)
 
 class Float64Mul(AbstractTile):
     name = "F64Mul"
+    instruction = "f64.mul"
+    stack_inputs = (F64, F64)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64) and isinstance(b, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64((a.value * b.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.mul"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(b, a):
+        return (a * b)
 
 class Float64Div(AbstractTile):
     name = "F64Div"
+    instruction = "f64.div"
+    stack_inputs = (F64, F64)
+    stack_outputs = (F64,)
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -116,23 +89,19 @@ class Float64Div(AbstractTile):
         b = current_state.stack.get_current_frame().stack_peek(1)
         return isinstance(a, F64) and isinstance(b, F64) and b.value != 0  # ensure b is not zero
 
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        if b.value == 0.0:
+    @staticmethod
+    def kernel(a, b):
+        if b == 0.0:
             raise ValueError("Division by zero")
-        result = a.value.astype(np.float64) / b.value.astype(np.float64)
+        result = a.astype(np.float64) / b.astype(np.float64)
         result = np.float64(result)  # Round to nearest integer
-        current_state.stack.get_current_frame().stack_push(F64(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.div"
-
-    def get_byte_code_size(self):
-        return 1
+        return result
 
 class Float64Sqrt(AbstractTile):
     name = "F64Sqrt"
+    instruction = "f64.sqrt"
+    stack_inputs = (F64,)
+    stack_outputs = (F64,)
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -141,463 +110,237 @@ class Float64Sqrt(AbstractTile):
         a = current_state.stack.get_current_frame().stack_peek(1)
         return isinstance(a, F64) and a.value >= 0
 
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.sqrt(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.sqrt"
-
-    def get_byte_code_size(self):
-        return 1
+    @staticmethod
+    def kernel(a):
+        return np.sqrt(a)
 
 class Float64Min(AbstractTile):
     name = "F64Min"
+    instruction = "f64.min"
+    stack_inputs = (F64, F64)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64) and isinstance(b, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.minimum(a.value, b.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.min"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(b, a):
+        # Wasm orders the zeros, -0 is smaller than 0
+        if a == b:
+            return a if np.signbit(a) else b
+        return np.minimum(a, b)
 
 class Float64Max(AbstractTile):
     name = "F64Max"
+    instruction = "f64.max"
+    stack_inputs = (F64, F64)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64) and isinstance(b, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.maximum(a.value, b.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.max"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(b, a):
+        # Wasm orders the zeros, 0 is larger than -0
+        if a == b:
+            return b if np.signbit(a) else a
+        return np.maximum(a, b)
 
 class Float64Ceil(AbstractTile):
     name = "F64Ceil"
+    instruction = "f64.ceil"
+    stack_inputs = (F64,)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.ceil(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.ceil"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.ceil(a)
 
 class Float64Floor(AbstractTile):
     name = "F64Floor"
+    instruction = "f64.floor"
+    stack_inputs = (F64,)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.floor(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.floor"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.floor(a)
 
 class Float64Trunc(AbstractTile):
     name = "F64Trunc"
+    instruction = "f64.trunc"
+    stack_inputs = (F64,)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.trunc(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.trunc"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.trunc(a)
 
 class Float64Nearest(AbstractTile):
     name = "F64Nearest"
+    instruction = "f64.nearest"
+    stack_inputs = (F64,)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.round(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.nearest"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.round(a)
 
 class Float64Abs(AbstractTile):
     name = "F64Abs"
+    instruction = "f64.abs"
+    stack_inputs = (F64,)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.abs(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.abs"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.abs(a)
 
 class Float64Neg(AbstractTile):
     name = "F64Neg"
+    instruction = "f64.neg"
+    stack_inputs = (F64,)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(-a.value))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.neg"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return -a
 
 class Float64CopySign(AbstractTile):
     name = "F64CopySign"
+    instruction = "f64.copysign"
+    stack_inputs = (F64, F64)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64) and isinstance(b, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.copysign(a.value, b.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.copysign"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a, b):
+        return np.copysign(a, b)
 
 class Float64Eq(AbstractTile):
     name = "F64Eq"
+    instruction = "f64.eq"
+    stack_inputs = (F64, F64)
+    stack_outputs = (I32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64) and isinstance(b, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        result = np.int32(a.value == b.value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.eq"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(b, a):
+        result = int(a == b)
+        return result
 
 class Float64Ne(AbstractTile):
     name = "F64Ne"
+    instruction = "f64.ne"
+    stack_inputs = (F64, F64)
+    stack_outputs = (I32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64) and isinstance(b, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        result = np.int32(a.value != b.value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.ne"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(b, a):
+        result = int(a != b)
+        return result
 
 class Float64Lt(AbstractTile):
     name = "F64Lt"
+    instruction = "f64.lt"
+    stack_inputs = (F64, F64)
+    stack_outputs = (I32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64) and isinstance(b, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        result = np.int32(a.value < b.value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.lt"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a, b):
+        result = int(a < b)
+        return result
 
 class Float64Le(AbstractTile):
     name = "F64Le"
+    instruction = "f64.le"
+    stack_inputs = (F64, F64)
+    stack_outputs = (I32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64) and isinstance(b, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        result = np.int32(a.value <= b.value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.le"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a, b):
+        result = int(a <= b)
+        return result
 
 class Float64Gt(AbstractTile):
     name = "F64Gt"
+    instruction = "f64.gt"
+    stack_inputs = (F64, F64)
+    stack_outputs = (I32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64) and isinstance(b, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        result = np.int32(a.value > b.value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.gt"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a, b):
+        result = int(a > b)
+        return result
 
 class Float64Ge(AbstractTile):
     name = "F64Ge"
+    instruction = "f64.ge"
+    stack_inputs = (F64, F64)
+    stack_outputs = (I32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F64) and isinstance(b, F64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        result = np.int32(a.value >= b.value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.ge"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a, b):
+        result = int(a >= b)
+        return result
 
 class Float64PromoteF32(AbstractTile):
     name = "F64PromoteF32"
+    instruction = "f64.promote_f32"
+    stack_inputs = (F32,)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.float64(a.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.promote_f32"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.float64(a)
 
 class Float64ConvertI32S(AbstractTile):
     name = "F64ConvertI32S"
+    instruction = "f64.convert_i32_s"
+    stack_inputs = (I32,)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.float64(np.int32(a.value))))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.convert_i32_s"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.float64(a)
 
 class Float64ConvertI32U(AbstractTile):
     name = "F64ConvertI32U"
+    instruction = "f64.convert_i32_u"
+    stack_inputs = (I32,)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.float64(np.uint32(a.value))))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.convert_i32_u"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.float64(integers.u32(a))
 
 class Float64ConvertI64S(AbstractTile):
     name = "F64ConvertI64S"
+    instruction = "f64.convert_i64_s"
+    stack_inputs = (I64,)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.float64(np.int64(a.value))))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.convert_i64_s"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.float64(a)
 
 class Float64ConvertI64U(AbstractTile):
     name = "F64ConvertI64U"
+    instruction = "f64.convert_i64_u"
+    stack_inputs = (I64,)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(np.float64(np.uint64(a.value))))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.convert_i64_u"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        return np.float64(np.uint64(integers.u64(a)))
 
 class Float64ReinterpretI64(AbstractTile):
     name = "F64ReinterpretI64"
+    instruction = "f64.reinterpret_i64"
+    stack_inputs = (I64,)
+    stack_outputs = (F64,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop().value.astype(np.int64)
-        result = a.view(np.float64)
-        current_state.stack.get_current_frame().stack_push(F64(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "f64.reinterpret_i64"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(a):
+        result = np.int64(a).view(np.float64)
+        return result
 
 class Float64Store(AbstractTile):
     name = "F64Store"
+    instruction = "f64.store"
+    stack_inputs = (I32, F64)
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -612,23 +355,19 @@ class Float64Store(AbstractTile):
         value = current_state.stack.get_current_frame().stack_peek(1)
         if not isinstance(value, F64):
             return False
-        if offset.value.astype(np.uint64) >= MEMORY_MAX_WRITE_INDEX - 8:
+        if integers.u32(offset.value) >= MEMORY_MAX_WRITE_INDEX - 8:
             return False
         return True
 
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
         value = current_state.stack.get_current_frame().stack_pop()
         offset = current_state.stack.get_current_frame().stack_pop()
-        current_state.memory.f64_store(offset.value.astype(np.uint32), value.value.astype(np.float64))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return f"f64.store"
-
-    def get_byte_code_size(self):
-        return 2
+        current_state.memory.f64_store(integers.u32(offset.value), value.value.astype(np.float64))
 
 class Float64Load(AbstractTile):
     name = "F64Load"
+    instruction = "f64.load"
+    stack_inputs = (I32,)
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -640,16 +379,10 @@ class Float64Load(AbstractTile):
         offset = current_state.stack.get_current_frame().stack_peek(1)
         if not isinstance(offset, I32):
             return False
-        if offset.value.astype(np.uint64) >= MEMORY_MAX_WRITE_INDEX - 8:
+        if integers.u32(offset.value) >= MEMORY_MAX_WRITE_INDEX - 8:
             return False
         return True
 
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
         offset = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(F64(current_state.memory.f64_load(offset.value.astype(np.uint32))))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return f"f64.load"
-
-    def get_byte_code_size(self):
-        return 2
+        current_state.stack.get_current_frame().stack_push(F64(np.float64(current_state.memory.f64_load(integers.u32(offset.value)))))
@@ -3,10 +3,11 @@
 
 import random
 from typing import Type, List
-from core.config.config import MAX_FUNCTIONS_PER_MODULE, MAX_FUNCTION_OUTPUTS, MAX_FUNCTION_INPUTS
+from core.config.config import MAX_FUNCTIONS_PER_MODULE, MAX_FUNCTION_OUTPUTS, MAX_FUNCTION_INPUTS, MIN_FUNCTION_TILES
+from core.encoder import unsigned_leb128
 from core.state.functions import Function, Block
 from core.state.state import GlobalState
-from core.tile import AbstractTileFactory, AbstractTile, wrap_apply_function
+from core.tile import AbstractTileFactory, AbstractTile
 from core.util import generate_function, apply_function, can_place_function
 from core.value import get_random_val, RefFunc, I32
 
@@ -34,7 +35,7 @@ class AbstractFunctionTileFactory(AbstractTileFactory):
     def create_function_create_tile(self, global_state: GlobalState, is_external=False) -> Type[AbstractTile]:
         name = generate_random_function_name(global_state)
         tile_loader = self.tile_loader
-        tile = type(f"CreateFunctionTile", (AbstractTile,), {"index": len(global_state.functions)})
+        tile = type(f"CreateFunctionTile", (AbstractTile,), {"index": len(global_state.functions), "function_name": name})
         tile.name = f"Create and call function"
 
         def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -74,16 +75,20 @@ class AbstractFunctionTileFactory(AbstractTileFactory):
         def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
             return f"call ${name}"
 
-        tile.apply = wrap_apply_function(apply)
+        def get_min_nested_tiles(current_state: GlobalState) -> int:
+            return MIN_FUNCTION_TILES if current_state.functions.get(name) is None else 0
+
+        tile.apply = apply
         tile.can_be_placed = staticmethod(can_be_placed)
         tile.generate_code = generate_code
+        tile.get_min_nested_tiles = staticmethod(get_min_nested_tiles)
         return tile
 
     def create_function_call_tile(self, name: str, index: int) -> Type[AbstractTile]:
         """
         Returns a tile that represents the function.
         """
-        tile = type(f"FunctionCallTile", (AbstractTile,), {"index": index})
+        tile = type(f"FunctionCallTile", (AbstractTile,), {"index": index, "function_name": name})
         tile.name = f"Call function"
 
         def function_can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -105,9 +110,14 @@ class AbstractFunctionTileFactory(AbstractTileFactory):
             nonlocal name
             return f"call ${name}"
 
-        tile.apply = wrap_apply_function(apply)
+        def encode(self, encoder, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> bytes:
+            return b"\x10" + unsigned_leb128(encoder.function_index(name))
+
+        tile.apply = apply
         tile.can_be_placed = staticmethod(function_can_be_placed)
-        tile.get_byte_code_size = lambda s: 1
+        tile.encode = encode
+        # The module limits keep function indices below 128, so they take one byte
+        tile.get_byte_code_size = lambda s: 2
         tile.get_fuel_cost = lambda s: 1
         tile.get_response_time = lambda s: 0.0001
         tile.generate_code = generate_code
@@ -117,7 +127,8 @@ class AbstractFunctionTileFactory(AbstractTileFactory):
         """
         Returns a tile that represents the function.
         """
-        tile = type(f"FunctionIndirectCallTile", (AbstractTile,), {"index":function_index })
+        tile = type(f"FunctionIndirectCallTile", (AbstractTile,), {"index": function_index, "function_name": function_name,
+                                                                      "table_name": table_name, "elem_index": elem_index})
         tile.name = f"Indirect call function"
 
         def function_can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -146,9 +157,16 @@ class AbstractFunctionTileFactory(AbstractTileFactory):
         def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
             return f"(call_indirect (table ${table_name}) (type ${current_state.functions.get(function_name).get_sig_name()}))"
 
-        tile.apply = wrap_apply_function(apply)
+        def encode(self, encoder, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> bytes:
+            signature_name = current_state.functions.get(function_name).get_sig_name()
+            return (b"\x11" + unsigned_leb128(encoder.signature_index(signature_name)) +
+                    unsigned_leb128(encoder.table_index(table_name)))
+
+        tile.apply = apply
         tile.can_be_placed = staticmethod(function_can_be_placed)
-        tile.get_byte_code_size = lambda s: 1
+        tile.encode = encode
+        # The module limits keep type and table indices below 128, so they take one byte each
+        tile.get_byte_code_size = lambda s: 3
         tile.get_fuel_cost = lambda s: 1
         tile.get_response_time = lambda s: 0.0001
         tile.generate_code = generate_code
@@ -158,7 +176,7 @@ class AbstractFunctionTileFactory(AbstractTileFactory):
         """
         Returns a tile that represents the function reference being pushed to the stack.
         """
-        tile = type(f"FunctionRefToStackTile", (AbstractTile,), {"index": function.index})
+        tile = type(f"FunctionRefToStackTile", (AbstractTile,), {"index": function.index, "function_name": function.name})
         tile.name = f"Push function reference to stack"
 
         def function_can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -170,10 +188,14 @@ class AbstractFunctionTileFactory(AbstractTileFactory):
         def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
             return f"ref.func ${function.name}"
 
+        def encode(self, encoder, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> bytes:
+            return b"\xD2" + unsigned_leb128(encoder.function_index(function.name))
 
-        tile.apply = wrap_apply_function(apply)
+        tile.apply = apply
         tile.can_be_placed = staticmethod(function_can_be_placed)
         tile.generate_code = generate_code
+        tile.encode = encode
+        tile.get_byte_code_size = lambda s: 2
         return tile
 
     def generate_all_placeable_tiles(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
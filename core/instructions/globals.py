@@ -6,6 +6,7 @@ import random
 from typing import Type, List
 
 from core.config.config import MAX_GLOBALS_PER_MODULE
+from core.encoder import unsigned_leb128
 from core.state.functions import Function, Block
 from core.state.globals import Global
 from core.state.state import GlobalState
@@ -92,8 +93,12 @@ class AbstractGlobalFactory(AbstractTileFactory):
             def generate_code(self, current_state: GlobalState, current_function, current_blocks: List[Block]) -> str:
                 return f"global.get ${self.global_name}"
 
+            def encode(self, encoder, current_state: GlobalState, current_function: Function,
+                       current_blocks: List[Block]) -> bytes:
+                return bytes([0x23]) + unsigned_leb128(encoder.global_index(self.global_name))
+
             def get_byte_code_size(self):
-                return 2
+                return 1 + len(unsigned_leb128(global_index))
 
         return GlobalGet
 
@@ -134,13 +139,17 @@ class AbstractGlobalFactory(AbstractTileFactory):
                     current_state.globals.add(global_var)
                 else:
                     value = current_state.stack.get_current_frame().stack_pop()
-                    current_state.globals.get_global_by_name(self.global_name).value = value
+                    current_state.globals.set_value(self.global_name, value)
                 self.last_value = copy.deepcopy(global_var.value)
 
             def generate_code(self, current_state: GlobalState, current_function, current_blocks: List[Block]) -> str:
-                return f"global.set ${global_name}"
+                return f"global.set ${self.global_name}"
+
+            def encode(self, encoder, current_state: GlobalState, current_function: Function,
+                       current_blocks: List[Block]) -> bytes:
+                return bytes([0x24]) + unsigned_leb128(encoder.global_index(self.global_name))
 
             def get_byte_code_size(self):
-                return 2
+                return 1 + len(unsigned_leb128(global_index))
 
         return GlobalSet
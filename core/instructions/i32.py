@@ -10,10 +10,13 @@ from core.value import I32, I64, F32, F64
 import random
 import math
 import numpy as np
+from core import integers
+from core.encoder import encode_const, signed_leb128
 
 
 class Int32Const(AbstractTile):
     name = "I32Const"
+    min_byte_code_size = 2
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -22,11 +25,11 @@ class Int32Const(AbstractTile):
         # Randomly choose a number within this magnitude, adjusting for both positive and negative ranges
         if random.randint(0,50) == 0:
             #Special case for 0
-            self.value = np.int32(0)
+            self.value = 0
         elif magnitude == 1:
-            self.value = np.int32(random.randint(-2 ** 31, 2 ** 31 - 1))  # Full range for smallest magnitude
+            self.value = random.randint(-2 ** 31, 2 ** 31 - 1)  # Full range for smallest magnitude
         else:
-            self.value = np.int32(random.randint(-magnitude, magnitude - 1))
+            self.value = random.randint(-magnitude, magnitude - 1)
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -38,84 +41,41 @@ class Int32Const(AbstractTile):
     def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
         return f"(i32.const {self.value})"
 
+    def encode(self, encoder, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> bytes:
+        return encode_const("i32", self.value)
+
     def get_byte_code_size(self):
-        if -64 <= self.value < 64:
-            return 2
-        elif -8192 <= self.value < 8191:
-            return 3
-        elif -1048576 <= self.value < 1048575:
-            return 4
-        else:
-            return 5
+        return 1 + len(signed_leb128(self.value))
 
 class Int32Add(AbstractTile):
     name = "I32Add"
+    instruction = "i32.add"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(I32(a.value + b.value))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.add"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_add)
 
 class Int32Sub(AbstractTile):
     name = "I32Sub"
+    instruction = "i32.sub"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(I32((a.value - b.value)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.sub"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_sub)
 
 class Int32Mul(AbstractTile):
     name = "I32Mul"
+    instruction = "i32.mul"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        a = current_state.stack.get_current_frame().stack_pop()
-        b = current_state.stack.get_current_frame().stack_pop()
-        current_state.stack.get_current_frame().stack_push(I32((a.value * b.value) ))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.mul"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_mul)
 
 class Int32DivS(AbstractTile):
     name = "I32DivS"
+    instruction = "i32.div_s"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -123,25 +83,17 @@ class Int32DivS(AbstractTile):
             return False
         a = current_state.stack.get_current_frame().stack_peek(2)
         b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32) and b.value != 0  # ensure b is not zero
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        if b.value == 0:
-            raise ValueError("Division by zero")
-        result = a.value.astype(np.int32) / b.value.astype(np.int32)
-        result = np.int32(result)
-        current_state.stack.get_current_frame().stack_push(I32(result))
+        if not (isinstance(a, I32) and isinstance(b, I32)) or b.value == 0:  # ensure b is not zero
+            return False
+        return not (a.value == -2 ** 31 and b.value == -1)  # ensure the quotient does not overflow
 
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.div_s"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_div_s)
 
 class Int32DivU(AbstractTile):
     name = "I32DivU"
+    instruction = "i32.div_u"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -151,22 +103,13 @@ class Int32DivU(AbstractTile):
         b = current_state.stack.get_current_frame().stack_peek(1)
         return isinstance(a, I32) and isinstance(b, I32) and b.value != 0  # ensure b is not zero for division
 
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        if b.value == 0:
-            raise ValueError("Division by zero")
-        result = (a.value.astype(np.uint32) // b.value.astype(np.uint32))
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.div_u"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_div_u)
 
 class Int32RemS(AbstractTile):
     name = "I32RemS"
+    instruction = "i32.rem_s"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -176,24 +119,13 @@ class Int32RemS(AbstractTile):
         b = current_state.stack.get_current_frame().stack_peek(1)
         return isinstance(a, I32) and isinstance(b, I32) and b.value != 0  # ensure b is not zero for rem
 
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        if b.value == 0:
-            raise ValueError("Division by zero")
-        result = a.value.astype(np.int32) % b.value.astype(np.int32)
-        if (a.value.astype(np.int32) < 0) != (b.value.astype(np.int32) < 0) and result != 0:
-            result = result - b.value.astype(np.int32)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.rem_s"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_rem_s)
 
 class Int32RemU(AbstractTile):
     name = "I32RemU"
+    instruction = "i32.rem_u"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -203,573 +135,197 @@ class Int32RemU(AbstractTile):
         b = current_state.stack.get_current_frame().stack_peek(1)
         return isinstance(a, I32) and isinstance(b, I32) and b.value != 0  # ensure b is not zero
 
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        if b.value == 0:
-            raise ValueError("Division by zero")
-        result = ((a.value.astype(np.uint32)) % (b.value.astype(np.uint32)))
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.rem_u"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_rem_u)
 
 class Int32And(AbstractTile):
     name = "I32And"
+    instruction = "i32.and"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        result = a.value & b.value
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.and"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_and)
 
 class Int32Or(AbstractTile):
     name = "I32Or"
+    instruction = "i32.or"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        result = a.value | b.value  # Bitwise OR operation
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.or"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_or)
 
 class Int32Xor(AbstractTile):
     name = "I32Xor"
+    instruction = "i32.xor"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop()
-        a = current_state.stack.get_current_frame().stack_pop()
-        result = a.value ^ b.value  # Bitwise XOR operation
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.xor"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_xor)
 
 class Int32Shl(AbstractTile):
     name = "I32Shl"
+    instruction = "i32.shl"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        shift_amount = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32) % 32
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.int32)
-        result = (value << shift_amount)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.shl"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_shl)
 
 class Int32ShrS(AbstractTile):
     name = "I32ShrS"
+    instruction = "i32.shr_s"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        shift_amount = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32) % 32
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.int32)
-        result = value >> shift_amount  # Python's `>>` performs an arithmetic shift for signed integers
-        current_state.stack.get_current_frame().stack_push(I32(result.astype(np.int32)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.shr_s"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_shr_s)
 
 class Int32ShrU(AbstractTile):
     name = "I32ShrU"
+    instruction = "i32.shr_u"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        shift_amount = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32) % 32
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        result = value >> shift_amount  # Unsigned shift
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.shr_u"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_shr_u)
 
 class Int32Rotl(AbstractTile):
     name = "I32Rotl"
+    instruction = "i32.rotl"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        rotate_amount = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32) % 32
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        # Perform rotate left
-        result = value & 0xFFFFFFFF  # Ensure 32-bit wrapping
-        for i in range(rotate_amount):
-            result = (result << 1) | ((result & 0x80000000) >> 31)
-            result = result & 0xFFFFFFFF
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.rotl"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_rotl)
 
 class Int32Rotr(AbstractTile):
     name = "I32Rotr"
+    instruction = "i32.rotr"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        rotate_amount = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32) % 32
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        # Perform rotate right
-        result = value & 0xFFFFFFFF  # Ensure 32-bit wrapping
-        for i in range(rotate_amount):
-            result = (result >> 1) | ((result & 1) << 31)
-            result = result & 0xFFFFFFFF  # Ensure 32-bit wrapping
-
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.rotr"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_rotr)
 
 class Int32Clz(AbstractTile):
     name = "I32Clz"
+    instruction = "i32.clz"
+    stack_inputs = (I32,)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        leading_zeros = 0
-        for i in range(32):  # Iterate over each bit in a 32-bit integer
-            if (value & (1 << (31 - i))) != 0:
-                break
-            leading_zeros += 1 # Use log2 to find the position of the highest set bit
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(leading_zeros)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.clz"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_clz)
 
 class Int32Ctz(AbstractTile):
     name = "I32Ctz"
+    instruction = "i32.ctz"
+    stack_inputs = (I32,)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        if value == 0:
-            result = 32  # If the value is zero, all bits are zero, hence 32 trailing zeros
-        else:
-            result = 0
-            while (value & 1) == 0:
-                result += 1
-                value >>= 1  # Right shift the value until a 1 is found
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(result)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.ctz"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_ctz)
 
 class Int32Popcnt(AbstractTile):
     name = "I32Popcnt"
+    instruction = "i32.popcnt"
+    stack_inputs = (I32,)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        # Count the number of 1s in the binary representation of the value
-        result = bin(value & 0xFFFFFFFF).count('1')
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(result)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.popcnt"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_popcnt)
 
 class Int32Eqz(AbstractTile):
     name = "I32Eqz"
+    instruction = "i32.eqz"
+    stack_inputs = (I32,)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        # Check if the value is zero and return 1 if true, else 0
-        result = 1 if value == 0 else 0
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(result)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.eqz"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_eqz)
 
 class Int32Eq(AbstractTile):
     name = "I32Eq"
+    instruction = "i32.eq"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        a = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        # Check if the two values are equal and return 1 if true, else 0
-        result = 1 if a == b else 0
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(result)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.eq"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_eq)
 
 class Int32Ne(AbstractTile):
     name = "I32Ne"
+    instruction = "i32.ne"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        a = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        # Check if the two values are not equal and return 1 if true, else 0
-        result = 1 if a != b else 0
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(result)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.ne"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_ne)
 
 class Int32LtS(AbstractTile):
     name = "I32LtS"
+    instruction = "i32.lt_s"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop().value.astype(np.int32)
-        a = current_state.stack.get_current_frame().stack_pop().value.astype(np.int32)
-        # Check if a is less than b and return 1 if true, else 0
-        result = 1 if a < b else 0
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(result)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.lt_s"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_lt_s)
 
 class Int32LtU(AbstractTile):
     name = "I32LtU"
+    instruction = "i32.lt_u"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        a = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        # Check if a is less than b and return 1 if true, else 0
-        result = 1 if a < b else 0
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(result)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.lt_u"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_lt_u)
 
 class Int32LeS(AbstractTile):
     name = "I32LeS"
+    instruction = "i32.le_s"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop().value.astype(np.int32)
-        a = current_state.stack.get_current_frame().stack_pop().value.astype(np.int32)
-        # Check if a is less than or equal to b and return 1 if true, else 0
-        result = 1 if a <= b else 0
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(result)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.le_s"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_le_s)
 
 class Int32LeU(AbstractTile):
     name = "I32LeU"
+    instruction = "i32.le_u"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        a = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        # Check if a is less than or equal to b and return 1 if true, else 0
-        result = 1 if a <= b else 0
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(result)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.le_u"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_le_u)
 
 class Int32GtS(AbstractTile):
     name = "I32GtS"
+    instruction = "i32.gt_s"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop().value.astype(np.int32)
-        a = current_state.stack.get_current_frame().stack_pop().value.astype(np.int32)
-        # Check if a is greater than b and return 1 if true, else 0
-        result = 1 if a > b else 0
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(result)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.gt_s"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_gt_s)
 
 class Int32GtU(AbstractTile):
     name = "I32GtU"
+    instruction = "i32.gt_u"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        a = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        # Check if a is greater than b and return 1 if true, else 0
-        result = 1 if a > b else 0
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(result)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.gt_u"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_gt_u)
 
 class Int32GeS(AbstractTile):
     name = "I32GeS"
+    instruction = "i32.ge_s"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop().value.astype(np.int32)
-        a = current_state.stack.get_current_frame().stack_pop().value.astype(np.int32)
-        # Check if a is greater than or equal to b and return 1 if true, else 0
-        result = 1 if a >= b else 0
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(result)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.ge_s"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_ge_s)
 
 class Int32GeU(AbstractTile):
     name = "I32GeU"
+    instruction = "i32.ge_u"
+    stack_inputs = (I32, I32)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 2:
-            return False
-        b = current_state.stack.get_current_frame().stack_peek(1)
-        a = current_state.stack.get_current_frame().stack_peek(2)
-        return isinstance(a, I32) and isinstance(b, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        b = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        a = current_state.stack.get_current_frame().stack_pop().value.astype(np.uint32)
-        # Check if a is greater than or equal to b and return 1 if true, else 0
-        result = 1 if a >= b else 0
-        current_state.stack.get_current_frame().stack_push(I32(np.uint32(result)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.ge_u"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_ge_u)
 
 class Int32WrapI64(AbstractTile):
     name = "I32WrapI64"
+    instruction = "i32.wrap_i64"
+    stack_inputs = (I64,)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I64)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.int64)
-        # Wrap the 64-bit integer to a 32-bit integer with modulo 2**32
-        result = np.int32(value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.wrap_i64"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_wrap_i64)
 
 class Int32TruncF32S(AbstractTile):
     name = "I32TruncF32S"
+    instruction = "i32.trunc_f32_s"
+    stack_inputs = (F32,)
+    stack_outputs = (I32,)
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -784,20 +340,16 @@ class Int32TruncF32S(AbstractTile):
             return False
         return True
 
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.float32)
-        # Truncate the 32-bit float to a 32-bit integer
-        result = np.int32(value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.trunc_f32_s"
-
-    def get_byte_code_size(self):
-        return 1
+    @staticmethod
+    def kernel(value):
+        # Truncate toward zero, the range is ensured by can_be_placed
+        return int(value)
 
 class Int32TruncF64S(AbstractTile):
     name = "I32TruncF64S"
+    instruction = "i32.trunc_f64_s"
+    stack_inputs = (F64,)
+    stack_outputs = (I32,)
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -812,20 +364,16 @@ class Int32TruncF64S(AbstractTile):
             return False
         return True
 
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.float64)
-        # Truncate the 64-bit float to a 32-bit integer
-        result = np.int32(value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.trunc_f64_s"
-
-    def get_byte_code_size(self):
-        return 1
+    @staticmethod
+    def kernel(value):
+        # Truncate toward zero, the range is ensured by can_be_placed
+        return int(value)
 
 class Int32TruncF32U(AbstractTile):
     name = "I32TruncF32U"
+    instruction = "i32.trunc_f32_u"
+    stack_inputs = (F32,)
+    stack_outputs = (I32,)
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -840,20 +388,16 @@ class Int32TruncF32U(AbstractTile):
             return False
         return True
 
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.float32)
-        # Truncate the 32-bit float to a 32-bit unsigned integer
-        result = np.uint32(value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.trunc_f32_u"
-
-    def get_byte_code_size(self):
-        return 1
+    @staticmethod
+    def kernel(value):
+        # Truncate toward zero, the range is ensured by can_be_placed
+        return integers.s32(int(value))
 
 class Int32TruncF64U(AbstractTile):
     name = "I32TruncF64U"
+    instruction = "i32.trunc_f64_u"
+    stack_inputs = (F64,)
+    stack_outputs = (I32,)
 
     @staticmethod
     def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
@@ -868,86 +412,43 @@ class Int32TruncF64U(AbstractTile):
             return False
         return True
 
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.float64)
-        result = np.uint32(value)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.trunc_f64_u"
-
-    def get_byte_code_size(self):
-        return 1
+    @staticmethod
+    def kernel(value):
+        # Truncate toward zero, the range is ensured by can_be_placed
+        return integers.s32(int(value))
 
 class Int32ReinterpretF32(AbstractTile):
 
     name = "I32ReinterpretF32"
+    instruction = "i32.reinterpret_f32"
+    stack_inputs = (F32,)
+    stack_outputs = (I32,)
 
     @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, F32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.float32)
-        # Reinterpret the 32-bit float as a 32-bit integer with 1:1 bit pattern
-        result = value.view(np.int32)
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.reinterpret_f32"
-
-    def get_byte_code_size(self):
-        return 1
+    def kernel(value):
+        # Reinterpret the float with 1:1 bit pattern
+        return int(np.float32(value).view(np.int32))
 
 class Int32Extend8S(AbstractTile):
     name = "I32Extend8S"
+    instruction = "i32.extend8_s"
+    stack_inputs = (I32,)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.int32)
-        # Sign-extend the 8-bit integer to a 32-bit integer
-        result = np.int32(np.int8(value))
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.extend8_s"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_extend8_s)
 
 class Int32Extend16S(AbstractTile):
     name = "I32Extend16S"
+    instruction = "i32.extend16_s"
+    stack_inputs = (I32,)
+    stack_outputs = (I32,)
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        if len(current_state.stack.get_current_frame().stack) < 1:
-            return False
-        a = current_state.stack.get_current_frame().stack_peek(1)
-        return isinstance(a, I32)
-
-    def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
-        value = current_state.stack.get_current_frame().stack_pop().value.astype(np.int32)
-        # Sign-extend the 16-bit integer to a 32-bit integer
-        result = np.int32(np.int16(value))
-        current_state.stack.get_current_frame().stack_push(I32(result))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.extend16_s"
-
-    def get_byte_code_size(self):
-        return 1
+    kernel = staticmethod(integers.i32_extend16_s)
 
 class Int32Store(AbstractTile):
     name = "I32Store"
+    instruction = "i32.store"
+    stack_inputs = (I32, I32)
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -962,23 +463,19 @@ class Int32Store(AbstractTile):
         value = current_state.stack.get_current_frame().stack_peek(1)
         if not isinstance(value, I32):
             return False
-        if offset.value.astype(np.uint32) >= MEMORY_MAX_WRITE_INDEX - 4:
+        if integers.u32(offset.value) >= MEMORY_MAX_WRITE_INDEX - 4:
             return False
         return True
 
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
         value = current_state.stack.get_current_frame().stack_pop()
         offset = current_state.stack.get_current_frame().stack_pop()
-        current_state.memory.i32_store(offset.value.astype(np.uint32), value.value.astype(np.uint32))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return f"i32.store"
-
-    def get_byte_code_size(self):
-        return 2
+        current_state.memory.i32_store(integers.u32(offset.value), value.value)
 
 class Int32Store8(AbstractTile):
     name = "I32Store8"
+    instruction = "i32.store8"
+    stack_inputs = (I32, I32)
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -992,7 +489,7 @@ class Int32Store8(AbstractTile):
         if not isinstance(offset, I32) or not isinstance(value, I32):
             return False
         # Check range for 8-bit store
-        if offset.value.astype(np.uint32) >= MEMORY_MAX_WRITE_INDEX - 1:
+        if integers.u32(offset.value) >= MEMORY_MAX_WRITE_INDEX - 1:
             return False
         return True
 
@@ -1000,16 +497,12 @@ class Int32Store8(AbstractTile):
         value = current_state.stack.get_current_frame().stack_pop()
         offset = current_state.stack.get_current_frame().stack_pop()
         # Store only the least significant 8 bits of the integer
-        current_state.memory.i32_store8(offset.value.astype(np.uint32), value.value.astype(np.uint32) & 0xFF)
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return f"i32.store8"
-
-    def get_byte_code_size(self):
-        return 2
+        current_state.memory.i32_store8(integers.u32(offset.value), value.value)
 
 class Int32Store16(AbstractTile):
     name = "I32Store16"
+    instruction = "i32.store16"
+    stack_inputs = (I32, I32)
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -1023,7 +516,7 @@ class Int32Store16(AbstractTile):
         if not isinstance(offset, I32) or not isinstance(value, I32):
             return False
         # Check range for 16-bit store
-        if offset.value.astype(np.uint32) >= MEMORY_MAX_WRITE_INDEX - 2:
+        if integers.u32(offset.value) >= MEMORY_MAX_WRITE_INDEX - 2:
             return False
         return True
 
@@ -1031,16 +524,12 @@ class Int32Store16(AbstractTile):
         value = current_state.stack.get_current_frame().stack_pop()
         offset = current_state.stack.get_current_frame().stack_pop()
         # Store only the least significant 16 bits of the integer
-        current_state.memory.i32_store16(offset.value.astype(np.uint32), value.value.astype(np.uint32) & 0xFFFF)
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return f"i32.store16"
-
-    def get_byte_code_size(self):
-        return 2
+        current_state.memory.i32_store16(integers.u32(offset.value), value.value)
 
 class Int32Load(AbstractTile):
     name = "I32Load"
+    instruction = "i32.load"
+    stack_inputs = (I32,)
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -1053,23 +542,19 @@ class Int32Load(AbstractTile):
         if not isinstance(offset, I32):
             return False
         #Check if in range
-        if offset.value.astype(np.uint32) >= MEMORY_MAX_WRITE_INDEX - 4:
+        if integers.u32(offset.value) >= MEMORY_MAX_WRITE_INDEX - 4:
             return False
         return True
 
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
         offset = current_state.stack.get_current_frame().stack_pop()
-        value = current_state.memory.i32_load(offset.value.astype(np.uint32))
+        value = integers.s32(current_state.memory.i32_load(integers.u32(offset.value)))
         current_state.stack.get_current_frame().stack_push(I32(value))
 
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return f"i32.load"
-
-    def get_byte_code_size(self):
-        return 2
-
 class Int32Load8U(AbstractTile):
     name = "I32Load8U"
+    instruction = "i32.load8_u"
+    stack_inputs = (I32,)
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -1082,23 +567,19 @@ class Int32Load8U(AbstractTile):
         if not isinstance(offset, I32):
             return False
         # Check if in range for 8-bit load
-        if offset.value.astype(np.uint32) >= MEMORY_MAX_WRITE_INDEX - 1:
+        if integers.u32(offset.value) >= MEMORY_MAX_WRITE_INDEX - 1:
             return False
         return True
 
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
         offset = current_state.stack.get_current_frame().stack_pop()
-        value = current_state.memory.i32_load8_u(offset.value.astype(np.uint32))
+        value = current_state.memory.i32_load8_u(integers.u32(offset.value))
         current_state.stack.get_current_frame().stack_push(I32(value))
 
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.load8_u"
-
-    def get_byte_code_size(self):
-        return 2
-
 class Int32Load8S(AbstractTile):
     name = "I32Load8S"
+    instruction = "i32.load8_s"
+    stack_inputs = (I32,)
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -1110,23 +591,19 @@ class Int32Load8S(AbstractTile):
         offset = current_state.stack.get_current_frame().stack_peek(1)
         if not isinstance(offset, I32):
             return False
-        if offset.value.astype(np.uint32) >= MEMORY_MAX_WRITE_INDEX - 1:
+        if integers.u32(offset.value) >= MEMORY_MAX_WRITE_INDEX - 1:
             return False
         return True
 
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
         offset = current_state.stack.get_current_frame().stack_pop()
-        value = current_state.memory.i32_load8_s(offset.value.astype(np.uint32))
+        value = current_state.memory.i32_load8_s(integers.u32(offset.value))
         current_state.stack.get_current_frame().stack_push(I32(value))
 
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.load8_s"
-
-    def get_byte_code_size(self):
-        return 2
-
 class Int32Load16U(AbstractTile):
     name = "I32Load16U"
+    instruction = "i32.load16_u"
+    stack_inputs = (I32,)
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -1138,23 +615,19 @@ class Int32Load16U(AbstractTile):
         offset = current_state.stack.get_current_frame().stack_peek(1)
         if not isinstance(offset, I32):
             return False
-        if offset.value.astype(np.uint32) >= MEMORY_MAX_WRITE_INDEX - 2:
+        if integers.u32(offset.value) >= MEMORY_MAX_WRITE_INDEX - 2:
             return False
         return True
 
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
         offset = current_state.stack.get_current_frame().stack_pop()
-        value = current_state.memory.i32_load16_u(offset.value.astype(np.uint32))
+        value = current_state.memory.i32_load16_u(integers.u32(offset.value))
         current_state.stack.get_current_frame().stack_push(I32(value))
 
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.load16_u"
-
-    def get_byte_code_size(self):
-        return 2
-
 class Int32Load16S(AbstractTile):
     name = "I32Load16S"
+    instruction = "i32.load16_s"
+    stack_inputs = (I32,)
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -1167,7 +640,7 @@ class Int32Load16S(AbstractTile):
 
         if not isinstance(offset, I32):
             return False
-        if offset.value.astype(np.uint32) >= MEMORY_MAX_WRITE_INDEX - 2:
+        if integers.u32(offset.value) >= MEMORY_MAX_WRITE_INDEX - 2:
 
             return False
         return True
@@ -1175,11 +648,5 @@ class Int32Load16S(AbstractTile):
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
 
         offset = current_state.stack.get_current_frame().stack_pop()
-        value = current_state.memory.i32_load16_s(offset.value.astype(np.uint32))
+        value = current_state.memory.i32_load16_s(integers.u32(offset.value))
         current_state.stack.get_current_frame().stack_push(I32(value))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return "i32.load16_s"
-
-    def get_byte_code_size(self):
-        return 2
@@ -3,6 +3,7 @@
 
 from typing import List
 from core.config.config import MAX_LOCALS_PER_FUNCTION
+from core.encoder import LOCAL_OPCODES, unsigned_leb128
 from core.state.functions import Function, Block
 from core.state.state import GlobalState
 from core.tile import AbstractTile, AbstractTileFactory
@@ -89,8 +90,12 @@ class AbstractLocalFactory(AbstractTileFactory):
             def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
                 return f"local.get {local_index}"
 
+            def encode(self, encoder, current_state: GlobalState, current_function: Function,
+                       current_blocks: List[Block]) -> bytes:
+                return bytes([LOCAL_OPCODES["local.get"]]) + unsigned_leb128(local_index)
+
             def get_byte_code_size(self):
-                return 2
+                return 1 + len(unsigned_leb128(local_index))
 
         return LocalGet
 
@@ -146,7 +151,11 @@ class AbstractLocalFactory(AbstractTileFactory):
                 else:
                     return f"local.tee {local_index}"
 
+            def encode(self, encoder, current_state: GlobalState, current_function: Function,
+                       current_blocks: List[Block]) -> bytes:
+                return bytes([LOCAL_OPCODES["local.tee" if is_tee else "local.set"]]) + unsigned_leb128(local_index)
+
             def get_byte_code_size(self):
-                return 2
+                return 1 + len(unsigned_leb128(local_index))
 
         return LocalTeeSet
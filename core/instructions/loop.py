@@ -6,12 +6,12 @@ import uuid
 from copy import deepcopy
 from typing import List, Type
 from core.config.config import MAX_BLOCKS_PER_FUNCTION, BOUNDED_LOOP_MIN, BOUNDED_LOOP_MAX, UNBOUNDED_LOOP_MIN, \
-    UNBOUNDED_LOOP_MAX
-from core.constraints import ConstraintType, ConstraintsViolatedError
-from core.formater import indent_code
+    UNBOUNDED_LOOP_MAX, MIN_BLOCK_TILES, MIN_TILE_FUEL_COST
+from core.constraints import ConstraintType, ConstraintsViolatedError, FuelConstraint
+from core.formater import CodeBody
 from core.state.functions import Function, Block, BlockType
 from core.state.state import GlobalState
-from core.tile import AbstractTileFactory, AbstractTile, wrap_apply_function
+from core.tile import AbstractTileFactory, AbstractTile
 from core.util import generate_block, can_place_block, apply_block
 from core.value import I32
 
@@ -37,6 +37,52 @@ def generate_random_bounded_loop_name(function: Function) -> str:
                 continue
         return name
 
+def loop_tail_code(loop_name: str) -> List[str]:
+    """
+    Returns the lines at the end of a loop body, which count down the repetition counter and branch back to the loop.
+    """
+    return ["i32.const 1",
+            "i32.sub",
+            "local.tee $temp", #Workaround for duplicating value on stack
+            "local.get $temp",
+            "i32.const 0",
+            "i32.gt_s",
+            "br_if $" + loop_name,
+            "drop"]
+
+def find_max_repetition_count(global_state: GlobalState, current_function: Function, current_blocks: List[Block],
+                              block: Block, max_count: int) -> int | None:
+    """
+    Returns the largest repetition count between BOUNDED_LOOP_MIN and max_count for which the block can be placed, or
+    None if it cannot be placed at all. It runs once per generated loop and a count that fits takes a single simulation.
+    Repeating a block less often never uses more resources, so otherwise a binary search over the range only needs a
+    logarithmic number of simulations.
+    """
+    if can_place_block(global_state, current_function, current_blocks, block, max_count):
+        return max_count
+    low, high = BOUNDED_LOOP_MIN, max_count
+    if low >= high or not can_place_block(global_state, current_function, current_blocks, block, low):
+        return None
+    # low can always be placed, high never
+    while high - low > 1:
+        middle = (low + high) // 2
+        if can_place_block(global_state, current_function, current_blocks, block, middle):
+            low = middle
+        else:
+            high = middle
+    return low
+
+def max_bounded_loop_count(global_state: GlobalState) -> int:
+    """
+    Returns the largest repetition count of a bounded loop whose body can still be generated. The body is generated
+    with the remaining fuel divided by the count and needs at least MIN_BLOCK_TILES tiles.
+    """
+    remaining_fuel = global_state.constraints.remaining_resources(FuelConstraint)
+    min_body_fuel = MIN_BLOCK_TILES * MIN_TILE_FUEL_COST
+    if remaining_fuel >= (BOUNDED_LOOP_MAX - 1) * min_body_fuel:
+        return BOUNDED_LOOP_MAX - 1
+    return int(remaining_fuel // min_body_fuel)
+
 class LoopTileFactory(AbstractTileFactory):
     """
     Factory for generating simple bounded and unbounded loop tiles.
@@ -50,23 +96,28 @@ class LoopTileFactory(AbstractTileFactory):
         loop_tile = self.create_loop_tile(global_state)
         if loop_tile.can_be_placed(global_state, current_function, current_blocks):
             loop_tiles.append(loop_tile)
-        for i in range(BOUNDED_LOOP_MIN, BOUNDED_LOOP_MAX):
-            bounded_loop_tile = self.create_bounded_loop_tile(global_state, i)
+        max_count = max_bounded_loop_count(global_state)
+        if max_count >= BOUNDED_LOOP_MIN:
+            bounded_loop_tile = self.create_bounded_loop_tile(global_state, max_count)
             if bounded_loop_tile.can_be_placed(global_state, current_function, current_blocks):
+                # The tile stands for every repetition count it can be generated with, so it is selected as often as
+                # one tile per count would be
+                bounded_loop_tile.selection_weight = max_count - BOUNDED_LOOP_MIN + 1
                 loop_tiles.append(bounded_loop_tile)
         return loop_tiles
 
 
-    def create_bounded_loop_tile(self, global_state: GlobalState, rep_count = 1) -> Type[AbstractTile]:
+    def create_bounded_loop_tile(self, global_state: GlobalState, max_count: int = BOUNDED_LOOP_MAX - 1) -> Type[AbstractTile]:
         """
-        Used for generating bounded loop tiles.
+        Used for generating bounded loop tiles. The repetition count is a parameter of the tile, ranging from
+        BOUNDED_LOOP_MIN to max_count. It is the variant picked by the selection strategy, or drawn when the loop is
+        generated, and lowered to the largest count that still fits into the remaining resources.
         """
 
-        tile = type(f"LoopTile", (AbstractTile,), {"inner_block": None, "rep_count": rep_count})
+        tile = type(f"LoopTile", (AbstractTile,), {"inner_block": None, "rep_count": None})
         tile.name = f"Create bounded loop"
         tile.loop_name = None
         tile_loader = self.tile_loader
-        tile.local_name = uuid.uuid4().hex
 
         def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
             nonlocal tile
@@ -79,65 +130,53 @@ class LoopTileFactory(AbstractTileFactory):
             if tile.inner_block is None:
                 return True
 
-            return can_place_block(global_state, current_function, current_blocks, tile.inner_block, rep_count)
+            return can_place_block(global_state, current_function, current_blocks, tile.inner_block, tile.rep_count)
 
         def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
             nonlocal tile, tile_loader
-            repetition_count = tile.rep_count
 
             if tile.inner_block is None:
-                #Generate both blocks at the same time
                 name = generate_random_bounded_loop_name(current_function)
                 tile.loop_name = name
+                if tile.selected_variant is None:
+                    repetition_count = random.randint(BOUNDED_LOOP_MIN, max_count)
+                else:
+                    repetition_count = BOUNDED_LOOP_MIN + tile.selected_variant
                 #Backup the state
                 constraints_backup = deepcopy(global_state.constraints)
-                done = False
-                for i in range(0,1):
-                    global_state.constraints.divide_remaining_resources(ConstraintType.RUNTIME, repetition_count)
-                    tile.inner_block = generate_block(tile_loader, global_state, current_function,
-                                                      [],
-                                                      "loop $" + name, fixed_output_types=[], blocks=current_blocks,
-                                                      block_type=BlockType.LOOP)
-                    #Restore constraints after backup
-                    global_state.constraints = deepcopy(constraints_backup)
-                    #Check if the block can be applied n times
-                    if can_place_block(global_state, current_function, current_blocks, tile.inner_block, repetition_count):
-                        done = True
-                        break
-                if not done:
+                global_state.constraints.divide_remaining_resources(ConstraintType.RUNTIME, repetition_count)
+                tile.inner_block = generate_block(tile_loader, global_state, current_function,
+                                                  [],
+                                                  "loop $" + name, fixed_output_types=[], blocks=current_blocks,
+                                                  block_type=BlockType.LOOP)
+                #Restore constraints after backup
+                global_state.constraints = deepcopy(constraints_backup)
+                #Check how often the block can be applied at most
+                tile.rep_count = find_max_repetition_count(global_state, current_function, current_blocks,
+                                                           tile.inner_block, repetition_count)
+                if tile.rep_count is None:
                     raise ConstraintsViolatedError("Loop could not be generated")
             #Apply the block
-            apply_state = apply_block(current_state, current_function, current_blocks, tile.inner_block,repetition_count)
+            apply_state = apply_block(current_state, current_function, current_blocks, tile.inner_block, tile.rep_count)
             if not apply_state:
                 raise ValueError("Block cannot be applied")
             return apply_state
 
-        def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-            result_str = "i32.const " + str(rep_count-1) + "\n"
-            result_str += "loop $" + tile.loop_name + " (param i32)\n"
-            # Add inputs
-            result_str += indent_code("\n".join(
-                loop_tile.generate_code(current_state, current_function, current_blocks+[self.inner_block]) for loop_tile in self.inner_block.tiles))
-            result_str += "\n"
-            tail_code = ""
-            tail_code += f"i32.const 1\n"
-            tail_code += f"i32.sub\n"
-            tail_code += f"local.tee $temp\n" #Workaround for duplicating value on stack
-            tail_code += f"local.get $temp\n"
-            tail_code += f"i32.const 0\n"
-            tail_code += f"i32.gt_s\n"
-            tail_code += f"br_if $" + tile.loop_name + "\n"
-            tail_code += "drop"
-            tail_code = indent_code(tail_code)
-            result_str += tail_code
-            result_str += "\nend"
-
-            return result_str
-
-        tile.generate_code = generate_code
-
-        tile.apply = wrap_apply_function(apply)
+        def generate_code_parts(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> list:
+            return ["i32.const " + str(tile.rep_count-1),
+                    "loop $" + tile.loop_name + " (param i32)",
+                    CodeBody(self.inner_block.tiles + loop_tail_code(tile.loop_name), current_blocks+[self.inner_block]),
+                    "end"]
+
+        tile.generate_code_parts = generate_code_parts
+
+        def get_min_nested_tiles(current_state: GlobalState) -> int:
+            return MIN_BLOCK_TILES if tile.inner_block is None else 0
+
+        tile.apply = apply
         tile.can_be_placed = staticmethod(can_be_placed)
+        tile.restores_constraints = True
+        tile.get_min_nested_tiles = staticmethod(get_min_nested_tiles)
         return tile
 
     def create_loop_tile(self, global_state: GlobalState) -> Type[AbstractTile]:
@@ -208,30 +247,19 @@ class LoopTileFactory(AbstractTileFactory):
                 raise ValueError("Block cannot be applied")
             return apply_state
 
-        def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-            result_str = "loop $" + tile.loop_name + " (param i32)"
-            # Add inputs
-            result_str += indent_code("\n".join(
-                loop_tile.generate_code(current_state, current_function, current_blocks+[self.inner_block]) for loop_tile in self.inner_block.tiles))
-            result_str += "\n"
-            tail_code = ""
-            tail_code += f"i32.const 1\n"
-            tail_code += f"i32.sub\n"
-            tail_code += f"local.tee $temp\n" #Workaround for duplicating value on stack
-            tail_code += f"local.get $temp\n"
-            tail_code += f"i32.const 0\n"
-            tail_code += f"i32.gt_s\n"
-            tail_code += f"br_if $" + tile.loop_name + "\n"
-            tail_code += "drop"
-            tail_code = indent_code(tail_code)
-            result_str += tail_code
-            result_str += "\nend"
-
-            return result_str
-
-        tile.generate_code = generate_code
-
-        tile.apply = wrap_apply_function(apply)
+        def generate_code_parts(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> list:
+            return ["loop $" + tile.loop_name + " (param i32)",
+                    CodeBody(self.inner_block.tiles + loop_tail_code(tile.loop_name), current_blocks+[self.inner_block]),
+                    "end"]
+
+        tile.generate_code_parts = generate_code_parts
+
+        def get_min_nested_tiles(current_state: GlobalState) -> int:
+            return MIN_BLOCK_TILES if tile.inner_block is None else 0
+
+        tile.apply = apply
         tile.can_be_placed = staticmethod(can_be_placed)
+        tile.restores_constraints = True
+        tile.get_min_nested_tiles = staticmethod(get_min_nested_tiles)
         return tile
 
@@ -2,7 +2,6 @@
 # SPDX-FileCopyrightText: 2025 Siemens AG
 
 from typing import List
-import numpy as np
 from core.state.functions import Function, Block
 from core.state.state import GlobalState
 from core.tile import AbstractTile
@@ -12,6 +11,7 @@ DISABLED = True
 
 class MemorySize(AbstractTile):
     name = "Memory size"
+    instruction = "memory.size"
 
     def __init__(self, seed: int):
         super().__init__(seed)
@@ -22,9 +22,4 @@ class MemorySize(AbstractTile):
 
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]):
         #In our case, the memory size is always 1 page.
-        current_state.stack.get_current_frame().stack_push(I32(np.int32(1)))
-
-    def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
-        return f"memory.size"
-    def get_byte_code_size(self):
-        return 1
+        current_state.stack.get_current_frame().stack_push(I32(1))
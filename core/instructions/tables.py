@@ -5,6 +5,7 @@ import copy
 import random
 from typing import Type, List
 from core.config.config import MAX_TABLE_SIZE, MAX_TABLES_PER_MODULE
+from core.encoder import unsigned_leb128
 from core.state.functions import Function, Block
 from core.state.state import GlobalState
 from core.state.tables import Table
@@ -97,8 +98,12 @@ class AbstractTableFactory(AbstractTileFactory):
             def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
                 return f"table.get ${self.table_name}"
 
+            def encode(self, encoder, current_state: GlobalState, current_function: Function,
+                       current_blocks: List[Block]) -> bytes:
+                return b"\x25" + unsigned_leb128(encoder.table_index(self.table_name))
+
             def get_byte_code_size(self):
-                return 2
+                return 1 + len(unsigned_leb128(table_index))
 
         return TableGet
 
@@ -146,13 +151,17 @@ class AbstractTableFactory(AbstractTileFactory):
                 table = current_state.tables.tables[table_name]
                 value = current_state.stack.get_current_frame().stack_pop()
                 index = current_state.stack.get_current_frame().stack_pop().value
-                table.elements[index] = value
+                current_state.tables.set_element(table_name, index, value)
                 self.last_value = copy.deepcopy(value)
 
             def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
                 return f"table.set ${table_name}"
 
+            def encode(self, encoder, current_state: GlobalState, current_function: Function,
+                       current_blocks: List[Block]) -> bytes:
+                return b"\x26" + unsigned_leb128(encoder.table_index(table_name))
+
             def get_byte_code_size(self):
-                return 2
+                return 1 + len(unsigned_leb128(table_index))
 
         return TableSet
@@ -0,0 +1,350 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Wasm integer semantics on plain Python ints.
+
+I32 and I64 values are represented by their signed two's-complement interpretation, i.e. ints in
+[-2**31, 2**31) and [-2**63, 2**63). All operations take and return values in this representation and wrap exactly
+like Wasm does. Unsigned operations reinterpret their operands with u32/u64 first.
+"""
+
+MASK_32 = 0xFFFFFFFF
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+SIGN_32 = 0x80000000
+SIGN_64 = 0x8000000000000000
+
+
+class IntegerTrap(ValueError):
+    """
+    Raised for operations that trap in Wasm, e.g. division by zero or signed division overflow.
+    """
+    pass
+
+
+def u32(value: int) -> int:
+    """
+    Returns the unsigned interpretation of the lower 32 bits.
+    """
+    return value & MASK_32
+
+
+def s32(value: int) -> int:
+    """
+    Returns the signed interpretation of the lower 32 bits.
+    """
+    return ((value & MASK_32) ^ SIGN_32) - SIGN_32
+
+
+def u64(value: int) -> int:
+    """
+    Returns the unsigned interpretation of the lower 64 bits.
+    """
+    return value & MASK_64
+
+
+def s64(value: int) -> int:
+    """
+    Returns the signed interpretation of the lower 64 bits.
+    """
+    return ((value & MASK_64) ^ SIGN_64) - SIGN_64
+
+
+def _div_s(a: int, b: int) -> int:
+    if b == 0:
+        raise IntegerTrap("Division by zero")
+    quotient = abs(a) // abs(b)
+    return -quotient if (a < 0) != (b < 0) else quotient
+
+
+def _rem_s(a: int, b: int) -> int:
+    if b == 0:
+        raise IntegerTrap("Division by zero")
+    remainder = abs(a) % abs(b)
+    return -remainder if a < 0 else remainder
+
+
+# i32
+
+def i32_add(a: int, b: int) -> int:
+    return s32(a + b)
+
+
+def i32_sub(a: int, b: int) -> int:
+    return s32(a - b)
+
+
+def i32_mul(a: int, b: int) -> int:
+    return s32(a * b)
+
+
+def i32_div_s(a: int, b: int) -> int:
+    if a == -SIGN_32 and b == -1:
+        raise IntegerTrap("Integer overflow")
+    return _div_s(a, b)
+
+
+def i32_div_u(a: int, b: int) -> int:
+    if b == 0:
+        raise IntegerTrap("Division by zero")
+    return s32(u32(a) // u32(b))
+
+
+def i32_rem_s(a: int, b: int) -> int:
+    return _rem_s(a, b)
+
+
+def i32_rem_u(a: int, b: int) -> int:
+    if b == 0:
+        raise IntegerTrap("Division by zero")
+    return s32(u32(a) % u32(b))
+
+
+def i32_and(a: int, b: int) -> int:
+    return a & b
+
+
+def i32_or(a: int, b: int) -> int:
+    return a | b
+
+
+def i32_xor(a: int, b: int) -> int:
+    return a ^ b
+
+
+def i32_shl(a: int, b: int) -> int:
+    return s32(a << (b & 31))
+
+
+def i32_shr_s(a: int, b: int) -> int:
+    return a >> (b & 31)
+
+
+def i32_shr_u(a: int, b: int) -> int:
+    return s32(u32(a) >> (b & 31))
+
+
+def i32_rotl(a: int, b: int) -> int:
+    value, amount = u32(a), b & 31
+    return s32((value << amount) | (value >> (32 - amount)))
+
+
+def i32_rotr(a: int, b: int) -> int:
+    value, amount = u32(a), b & 31
+    return s32((value >> amount) | (value << (32 - amount)))
+
+
+def i32_clz(a: int) -> int:
+    return 32 - u32(a).bit_length()
+
+
+def i32_ctz(a: int) -> int:
+    value = u32(a)
+    return 32 if value == 0 else (value & -value).bit_length() - 1
+
+
+def i32_popcnt(a: int) -> int:
+    return u32(a).bit_count()
+
+
+def i32_eqz(a: int) -> int:
+    return int(a == 0)
+
+
+def i32_eq(a: int, b: int) -> int:
+    return int(a == b)
+
+
+def i32_ne(a: int, b: int) -> int:
+    return int(a != b)
+
+
+def i32_lt_s(a: int, b: int) -> int:
+    return int(a < b)
+
+
+def i32_lt_u(a: int, b: int) -> int:
+    return int(u32(a) < u32(b))
+
+
+def i32_le_s(a: int, b: int) -> int:
+    return int(a <= b)
+
+
+def i32_le_u(a: int, b: int) -> int:
+    return int(u32(a) <= u32(b))
+
+
+def i32_gt_s(a: int, b: int) -> int:
+    return int(a > b)
+
+
+def i32_gt_u(a: int, b: int) -> int:
+    return int(u32(a) > u32(b))
+
+
+def i32_ge_s(a: int, b: int) -> int:
+    return int(a >= b)
+
+
+def i32_ge_u(a: int, b: int) -> int:
+    return int(u32(a) >= u32(b))
+
+
+def i32_wrap_i64(a: int) -> int:
+    return s32(a)
+
+
+def i32_extend8_s(a: int) -> int:
+    return ((a & 0xFF) ^ 0x80) - 0x80
+
+
+def i32_extend16_s(a: int) -> int:
+    return ((a & 0xFFFF) ^ 0x8000) - 0x8000
+
+
+# i64
+
+def i64_add(a: int, b: int) -> int:
+    return s64(a + b)
+
+
+def i64_sub(a: int, b: int) -> int:
+    return s64(a - b)
+
+
+def i64_mul(a: int, b: int) -> int:
+    return s64(a * b)
+
+
+def i64_div_s(a: int, b: int) -> int:
+    if a == -SIGN_64 and b == -1:
+        raise IntegerTrap("Integer overflow")
+    return _div_s(a, b)
+
+
+def i64_div_u(a: int, b: int) -> int:
+    if b == 0:
+        raise IntegerTrap("Division by zero")
+    return s64(u64(a) // u64(b))
+
+
+def i64_rem_s(a: int, b: int) -> int:
+    return _rem_s(a, b)
+
+
+def i64_rem_u(a: int, b: int) -> int:
+    if b == 0:
+        raise IntegerTrap("Division by zero")
+    return s64(u64(a) % u64(b))
+
+
+def i64_and(a: int, b: int) -> int:
+    return a & b
+
+
+def i64_or(a: int, b: int) -> int:
+    return a | b
+
+
+def i64_xor(a: int, b: int) -> int:
+    return a ^ b
+
+
+def i64_shl(a: int, b: int) -> int:
+    return s64(a << (b & 63))
+
+
+def i64_shr_s(a: int, b: int) -> int:
+    return a >> (b & 63)
+
+
+def i64_shr_u(a: int, b: int) -> int:
+    return s64(u64(a) >> (b & 63))
+
+
+def i64_rotl(a: int, b: int) -> int:
+    value, amount = u64(a), b & 63
+    return s64((value << amount) | (value >> (64 - amount)))
+
+
+def i64_rotr(a: int, b: int) -> int:
+    value, amount = u64(a), b & 63
+    return s64((value >> amount) | (value << (64 - amount)))
+
+
+def i64_clz(a: int) -> int:
+    return 64 - u64(a).bit_length()
+
+
+def i64_ctz(a: int) -> int:
+    value = u64(a)
+    return 64 if value == 0 else (value & -value).bit_length() - 1
+
+
+def i64_popcnt(a: int) -> int:
+    return u64(a).bit_count()
+
+
+def i64_eqz(a: int) -> int:
+    return int(a == 0)
+
+
+def i64_eq(a: int, b: int) -> int:
+    return int(a == b)
+
+
+def i64_ne(a: int, b: int) -> int:
+    return int(a != b)
+
+
+def i64_lt_s(a: int, b: int) -> int:
+    return int(a < b)
+
+
+def i64_lt_u(a: int, b: int) -> int:
+    return int(u64(a) < u64(b))
+
+
+def i64_le_s(a: int, b: int) -> int:
+    return int(a <= b)
+
+
+def i64_le_u(a: int, b: int) -> int:
+    return int(u64(a) <= u64(b))
+
+
+def i64_gt_s(a: int, b: int) -> int:
+    return int(a > b)
+
+
+def i64_gt_u(a: int, b: int) -> int:
+    return int(u64(a) > u64(b))
+
+
+def i64_ge_s(a: int, b: int) -> int:
+    return int(a >= b)
+
+
+def i64_ge_u(a: int, b: int) -> int:
+    return int(u64(a) >= u64(b))
+
+
+def i64_extend_i32_s(a: int) -> int:
+    return a
+
+
+def i64_extend_i32_u(a: int) -> int:
+    return u32(a)
+
+
+def i64_extend8_s(a: int) -> int:
+    return ((a & 0xFF) ^ 0x80) - 0x80
+
+
+def i64_extend16_s(a: int) -> int:
+    return ((a & 0xFFFF) ^ 0x8000) - 0x8000
+
+
+def i64_extend32_s(a: int) -> int:
+    return s32(a)
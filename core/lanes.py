@@ -0,0 +1,709 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Lane-parallel execution of finished programs.
+
+A finished GlobalState can be run for many input vectors and initial memory images at once. Every stack slot, local
+and global holds a NumPy array with one value per lane, so straight-line code is executed once for all lanes. When
+lanes take different control flow paths, e.g. at an if, br_if or a loop with a lane-dependent count, the batch is split
+into groups that took the same path, and each group continues on its own.
+
+Unlike apply_function, the lanes always start like a fresh Wasm instance: globals hold their initial values and tables
+are empty. Constraints are not tracked. Lanes that trap or leave the part of the machine that is simulated, e.g. by
+accessing memory outside the writable window, are stopped and get an error message instead of return values.
+"""
+
+from typing import Callable, Dict, List, Sequence, Tuple, Type
+import numpy as np
+from core.config.config import MEMORY_MAX_WRITE_INDEX, UNBOUNDED_LOOP_MIN, UNBOUNDED_LOOP_MAX
+from core.state.functions import Function, Block
+from core.state.state import GlobalState
+from core.value import Val, I32, I64, F32, F64, RefFunc, RefExtern
+
+# Array dtype used to store values of each type
+LANE_DTYPES: Dict[Type[Val], type] = {I32: np.int32, I64: np.int64, F32: np.float32, F64: np.float64,
+                                      RefFunc: object, RefExtern: object}
+
+# Memory tiles: tile name -> (value type, dtype of the bytes in memory)
+LANE_LOADS: Dict[str, Tuple[Type[Val], str]] = {
+    "I32Load": (I32, "<i4"), "I32Load8U": (I32, "u1"), "I32Load8S": (I32, "i1"), "I32Load16U": (I32, "<u2"),
+    "I32Load16S": (I32, "<i2"), "I64Load": (I64, "<i8"), "I64Load8U": (I64, "u1"), "I64Load8S": (I64, "i1"),
+    "I64Load16U": (I64, "<u2"), "I64Load16S": (I64, "<i2"), "I64Load32U": (I64, "<u4"), "I64Load32S": (I64, "<i4"),
+    "F32Load": (F32, "<f4"), "F64Load": (F64, "<f8"),
+}
+LANE_STORES: Dict[str, str] = {
+    "I32Store": "<i4", "I32Store8": "u1", "I32Store16": "<u2", "I64Store": "<i8", "I64Store8": "u1",
+    "I64Store16": "<u2", "I64Store32": "<u4", "F32Store": "<f4", "F64Store": "<f8",
+}
+CONST_TILES: Dict[str, Type[Val]] = {"I32Const": I32, "I64Const": I64, "F32Const": F32, "F64Const": F64}
+# Tiles without an effect on the executed program
+NO_OP_TILES = ("NoOp", "ReachabilityFlagTile", "StackInspector")
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    bits = np.unpackbits(values.view(np.uint8).reshape(len(values), values.itemsize), axis=1)
+    return bits.sum(axis=1)
+
+
+def _integer_lane_kernels(prefix: str, signed, unsigned, bits: int) -> Dict[str, Callable]:
+    """
+    Returns the vectorized kernels of the integer tiles of one width. Arrays wrap like Wasm integers, unsigned
+    operations work on an unsigned view of the same bits.
+    """
+    mask = bits - 1
+
+    def u(a):
+        return a.view(unsigned)
+
+    def amount(b):
+        return (b & mask).view(unsigned)
+
+    def div_s(a, b):
+        quotient = a // b
+        # Floor division rounds toward negative infinity, Wasm toward zero
+        return quotient + ((a % b != 0) & ((a < 0) != (b < 0)))
+
+    def rotl(a, b):
+        value, k = u(a), amount(b)
+        return ((value << k) | (value >> ((bits - k) & mask))).view(signed)
+
+    def rotr(a, b):
+        value, k = u(a), amount(b)
+        return ((value >> k) | (value << ((bits - k) & mask))).view(signed)
+
+    def clz(a):
+        value = u(a).copy()
+        shift = 1
+        while shift < bits:
+            value |= value >> shift
+            shift *= 2
+        return (bits - _popcount(value)).astype(signed)
+
+    def ctz(a):
+        value = u(a)
+        return _popcount((value & (~value + 1)) - 1).astype(signed)
+
+    def flag(condition):
+        return condition.astype(np.int32)
+
+    return {
+        f"{prefix}Add": lambda a, b: a + b,
+        f"{prefix}Sub": lambda a, b: a - b,
+        f"{prefix}Mul": lambda a, b: a * b,
+        f"{prefix}DivS": div_s,
+        f"{prefix}DivU": lambda a, b: (u(a) // u(b)).view(signed),
+        f"{prefix}RemS": lambda a, b: np.fmod(a, np.where(b == -1, 1, b)),
+        f"{prefix}RemU": lambda a, b: (u(a) % u(b)).view(signed),
+        f"{prefix}And": lambda a, b: a & b,
+        f"{prefix}Or": lambda a, b: a | b,
+        f"{prefix}Xor": lambda a, b: a ^ b,
+        f"{prefix}Shl": lambda a, b: (u(a) << amount(b)).view(signed),
+        f"{prefix}ShrS": lambda a, b: a >> (b & mask),
+        f"{prefix}ShrU": lambda a, b: (u(a) >> amount(b)).view(signed),
+        f"{prefix}Rotl": rotl,
+        f"{prefix}Rotr": rotr,
+        f"{prefix}Clz": clz,
+        f"{prefix}Ctz": ctz,
+        f"{prefix}Popcnt": lambda a: _popcount(a).astype(signed),
+        f"{prefix}Eqz": lambda a: flag(a == 0),
+        f"{prefix}Eq": lambda a, b: flag(a == b),
+        f"{prefix}Ne": lambda a, b: flag(a != b),
+        f"{prefix}LtS": lambda a, b: flag(a < b),
+        f"{prefix}LtU": lambda a, b: flag(u(a) < u(b)),
+        f"{prefix}LeS": lambda a, b: flag(a <= b),
+        f"{prefix}LeU": lambda a, b: flag(u(a) <= u(b)),
+        f"{prefix}GtS": lambda a, b: flag(a > b),
+        f"{prefix}GtU": lambda a, b: flag(u(a) > u(b)),
+        f"{prefix}GeS": lambda a, b: flag(a >= b),
+        f"{prefix}GeU": lambda a, b: flag(u(a) >= u(b)),
+        f"{prefix}Extend8S": lambda a: a.astype(np.int8).astype(signed),
+        f"{prefix}Extend16S": lambda a: a.astype(np.int16).astype(signed),
+        f"{prefix}TruncF32S": lambda a: np.trunc(a).astype(signed),
+        f"{prefix}TruncF64S": lambda a: np.trunc(a).astype(signed),
+        f"{prefix}TruncF32U": lambda a: np.trunc(a).astype(unsigned).view(signed),
+        f"{prefix}TruncF64U": lambda a: np.trunc(a).astype(unsigned).view(signed),
+    }
+
+
+def _integer_lane_traps(prefix: str, bits: int) -> Dict[str, Callable]:
+    """
+    Returns functions that mark the lanes for which an integer tile traps.
+    """
+    def in_range(low, high):
+        def traps(a):
+            truncated = np.trunc(a.astype(np.float64))
+            return ~((truncated >= low) & (truncated < high))
+        return traps
+
+    minimum = -2 ** (bits - 1)
+    return {
+        f"{prefix}DivS": lambda a, b: (b == 0) | ((a == minimum) & (b == -1)),
+        f"{prefix}DivU": lambda a, b: b == 0,
+        f"{prefix}RemS": lambda a, b: b == 0,
+        f"{prefix}RemU": lambda a, b: b == 0,
+        f"{prefix}TruncF32S": in_range(minimum, 2 ** (bits - 1)),
+        f"{prefix}TruncF64S": in_range(minimum, 2 ** (bits - 1)),
+        f"{prefix}TruncF32U": in_range(0, 2 ** bits),
+        f"{prefix}TruncF64U": in_range(0, 2 ** bits),
+    }
+
+
+def _float_lane_kernels(prefix: str, dtype) -> Dict[str, Callable]:
+    """
+    Returns the vectorized kernels of the float tiles of one width.
+    """
+    def flag(condition):
+        return condition.astype(np.int32)
+
+    return {
+        f"{prefix}Add": lambda a, b: a + b,
+        f"{prefix}Sub": lambda a, b: a - b,
+        f"{prefix}Mul": lambda a, b: a * b,
+        f"{prefix}Div": lambda a, b: a / b,
+        f"{prefix}Sqrt": np.sqrt,
+        # Same operand order as the scalar kernels, which matters for signed zeros
+        f"{prefix}Min": lambda a, b: np.minimum(b, a),
+        f"{prefix}Max": lambda a, b: np.maximum(b, a),
+        f"{prefix}Ceil": np.ceil,
+        f"{prefix}Floor": np.floor,
+        f"{prefix}Trunc": np.trunc,
+        f"{prefix}Nearest": np.round,
+        f"{prefix}Abs": np.abs,
+        f"{prefix}Neg": np.negative,
+        f"{prefix}CopySign": np.copysign,
+        f"{prefix}Eq": lambda a, b: flag(a == b),
+        f"{prefix}Ne": lambda a, b: flag(a != b),
+        f"{prefix}Lt": lambda a, b: flag(a < b),
+        f"{prefix}Le": lambda a, b: flag(a <= b),
+        f"{prefix}Gt": lambda a, b: flag(a > b),
+        f"{prefix}Ge": lambda a, b: flag(a >= b),
+        f"{prefix}ConvertI32S": lambda a: a.astype(dtype),
+        f"{prefix}ConvertI32U": lambda a: a.view(np.uint32).astype(dtype),
+        f"{prefix}ConvertI64S": lambda a: a.astype(dtype),
+        f"{prefix}ConvertI64U": lambda a: a.view(np.uint64).astype(dtype),
+    }
+
+
+# Vectorized replacements for the kernels of the tiles, by tile name
+LANE_KERNELS: Dict[str, Callable] = {
+    **_integer_lane_kernels("I32", np.int32, np.uint32, 32),
+    **_integer_lane_kernels("I64", np.int64, np.uint64, 64),
+    **_float_lane_kernels("F32", np.float32),
+    **_float_lane_kernels("F64", np.float64),
+    "I32WrapI64": lambda a: a.astype(np.int32),
+    "I64Extend32S": lambda a: a.astype(np.int32).astype(np.int64),
+    "F32DemoteF64": lambda a: a.astype(np.float32),
+    "F64PromoteF32": lambda a: a.astype(np.float64),
+    "I64ExtendI32S": lambda a: a.astype(np.int64),
+    "I64ExtendI32U": lambda a: a.view(np.uint32).astype(np.int64),
+    "I32ReinterpretF32": lambda a: a.view(np.int32),
+    "I64ReinterpretF64": lambda a: a.view(np.int64),
+    "F32ReinterpretI32": lambda a: a.view(np.float32),
+    "F64ReinterpretI64": lambda a: a.view(np.float64),
+}
+# Lanes for which a tile traps, by tile name
+LANE_TRAPS: Dict[str, Callable] = {**_integer_lane_traps("I32", 32), **_integer_lane_traps("I64", 64)}
+
+
+class LaneLocals:
+    """
+    The locals of a function call, shared by the frames of all blocks in the call.
+    """
+    __slots__ = ("values", "types")
+
+    def __init__(self, values: List[np.ndarray], types: List[Type[Val]]):
+        self.values = values
+        self.types = types
+
+
+class LaneFrame:
+    """
+    A stack frame, every stack slot holds an array with one value per lane.
+    """
+    __slots__ = ("stack", "types", "locals")
+
+    def __init__(self, stack: List[np.ndarray], types: List[Type[Val]], locals: LaneLocals):
+        self.stack = stack
+        self.types = types
+        self.locals = locals
+
+    def push(self, value: np.ndarray, value_type: Type[Val]):
+        self.stack.append(value)
+        self.types.append(value_type)
+
+    def pop_n(self, n: int) -> Tuple[List[np.ndarray], List[Type[Val]]]:
+        """
+        Pops the top n values and returns them in stack order.
+        """
+        if n > len(self.stack):
+            raise IndexError("Not enough values on the stack")
+        split = len(self.stack) - n
+        values, types = self.stack[split:], self.types[split:]
+        del self.stack[split:], self.types[split:]
+        return values, types
+
+
+class LaneBranch:
+    """
+    A branch that is still on its way to its target, together with the values it carries.
+    """
+    __slots__ = ("target_index", "values", "types")
+
+    def __init__(self, target_index: int, values: List[np.ndarray], types: List[Type[Val]]):
+        self.target_index = target_index
+        self.values = values
+        self.types = types
+
+
+class LaneBatch:
+    """
+    The machine state of a group of lanes that all followed the same control flow so far.
+    """
+
+    def __init__(self, lanes: np.ndarray, frames: List[LaneFrame], globals: Dict[str, np.ndarray],
+                 tables: Dict[str, np.ndarray], memory: np.ndarray, errors: List[str | None]):
+        # Indices of the lanes in the whole run
+        self.lanes = lanes
+        self.frames = frames
+        self.globals = globals
+        # One row of function names per lane
+        self.tables = tables
+        # The writable memory window, one row per lane
+        self.memory = memory
+        # Columns of canary outputs
+        self.canary_output: List[np.ndarray] = []
+        # Shared by all batches of a run
+        self.errors = errors
+
+    def __len__(self):
+        return len(self.lanes)
+
+    @property
+    def frame(self) -> LaneFrame:
+        return self.frames[-1]
+
+    def select(self, selection: np.ndarray) -> "LaneBatch":
+        """
+        Returns a new batch with the selected lanes. The arrays are copied, locals stay shared between frames.
+        """
+        copied_locals = {}
+        frames = []
+        for frame in self.frames:
+            lane_locals = copied_locals.get(id(frame.locals))
+            if lane_locals is None:
+                lane_locals = LaneLocals([value[selection] for value in frame.locals.values], list(frame.locals.types))
+                copied_locals[id(frame.locals)] = lane_locals
+            frames.append(LaneFrame([value[selection] for value in frame.stack], list(frame.types), lane_locals))
+        batch = LaneBatch(self.lanes[selection], frames,
+                          {name: value[selection] for name, value in self.globals.items()},
+                          {name: value[selection] for name, value in self.tables.items()},
+                          self.memory[selection], self.errors)
+        batch.canary_output = [column[selection] for column in self.canary_output]
+        return batch
+
+    def keep(self, selection: np.ndarray):
+        """
+        Drops all lanes that are not selected, in place.
+        """
+        selected = self.select(selection)
+        self.__dict__.update(selected.__dict__)
+
+    def stop(self, stopped: np.ndarray, reason: str, values: List[np.ndarray] = ()) -> List[np.ndarray]:
+        """
+        Stops the marked lanes with the given error and returns the values of the remaining lanes.
+        """
+        for lane in self.lanes[stopped]:
+            self.errors[lane] = reason
+        remaining = ~stopped
+        self.keep(remaining)
+        return [value[remaining] for value in values]
+
+    def split(self, keys: np.ndarray) -> List[Tuple[object, "LaneBatch"]]:
+        """
+        Splits the batch into groups of lanes with the same key. A batch with a single key is returned as is.
+        """
+        unique = np.unique(keys)
+        if len(unique) == 1:
+            return [(unique[0].item(), self)]
+        return [(key.item(), self.select(keys == key)) for key in unique]
+
+
+class LaneRunResult:
+    """
+    The result of a lane-parallel run.
+    """
+
+    def __init__(self, lanes: int, memory: np.ndarray):
+        # Return values of every lane, None if the lane was stopped
+        self.return_values: List[List[Val] | None] = [None] * lanes
+        self.return_types: List[Type[Val]] = []
+        # Writable memory window of every lane after the run
+        self.memory = memory
+        self.canary_output: List[list] = [[] for _ in range(lanes)]
+        # Why a lane was stopped, None for lanes that finished
+        self.errors: List[str | None] = [None] * lanes
+
+
+def _lane_array(value, value_type: Type[Val], lanes: int) -> np.ndarray:
+    """
+    Returns an array with the given value in every lane.
+    """
+    return np.full(lanes, value, dtype=LANE_DTYPES[value_type])
+
+
+def _to_val(value_type: Type[Val], value) -> Val:
+    """
+    Converts the value of one lane back to a value as used by the scalar interpreter.
+    """
+    if value_type in (I32, I64):
+        return value_type(int(value))
+    return value_type(value)
+
+
+def run_lanes(global_state: GlobalState, params: Sequence[Sequence] = None, memory_images: np.ndarray = None,
+              lanes: int = None, entry_function: str = "run") -> LaneRunResult:
+    """
+    Runs the entry function of a finished program for many lanes at once. Params holds one array per function
+    parameter with one value per lane. Memory images holds one initial memory image per lane, of which the writable
+    window is used, by default all lanes start with the initial memory of the state.
+    """
+    function = global_state.functions.get(entry_function)
+    if function is None:
+        raise ValueError(f"Function {entry_function} not found")
+    params = list(params or [])
+    if len(params) != len(function.inputs):
+        raise ValueError(f"Expected {len(function.inputs)} params, got {len(params)}")
+    if lanes is None:
+        if params:
+            lanes = len(params[0])
+        elif memory_images is not None:
+            lanes = len(memory_images)
+        else:
+            raise ValueError("The number of lanes cannot be derived from the params or memory images")
+
+    if memory_images is None:
+        memory = np.tile(np.frombuffer(global_state.memory.initial_values[:MEMORY_MAX_WRITE_INDEX], dtype=np.uint8),
+                         (lanes, 1))
+    else:
+        memory = np.array(np.asarray(memory_images, dtype=np.uint8)[:, :MEMORY_MAX_WRITE_INDEX])
+    if memory.shape != (lanes, MEMORY_MAX_WRITE_INDEX):
+        raise ValueError(f"Expected {lanes} memory images of at least {MEMORY_MAX_WRITE_INDEX} bytes")
+
+    stack = []
+    for param, param_type in zip(params, function.inputs):
+        # Integers are converted with wrap around, so unsigned inputs are accepted as well
+        value = np.asarray(param).astype(LANE_DTYPES[param_type])
+        if value.shape != (lanes,):
+            raise ValueError(f"Expected {lanes} values per param")
+        stack.append(value)
+    origin = LaneFrame(stack, list(function.inputs), LaneLocals([], []))
+    batch = LaneBatch(np.arange(lanes), [origin],
+                      {global_var.name: _lane_array(global_var.init_value.value, type(global_var.value), lanes)
+                       for global_var in global_state.globals.globals},
+                      {name: np.full((lanes, table.size), None, dtype=object)
+                       for name, table in global_state.tables.tables.items()},
+                      memory, [None] * lanes)
+
+    result = LaneRunResult(lanes, memory.copy())
+    result.errors = batch.errors
+    with np.errstate(all="ignore"):
+        outcomes = _call_function(batch, global_state, function)
+    for part, branch in outcomes:
+        if branch is not None:
+            part.stop(np.ones(len(part), dtype=bool), "Branch beyond the entry function")
+            continue
+        result.memory[part.lanes] = part.memory
+        result.return_types = list(part.frame.types)
+        for i, lane in enumerate(part.lanes):
+            result.return_values[lane] = [_to_val(value_type, value[i])
+                                          for value, value_type in zip(part.frame.stack, part.frame.types)]
+            result.canary_output[lane] = [column[i].item() for column in part.canary_output]
+    return result
+
+
+def _call_function(batch: LaneBatch, global_state: GlobalState, function: Function) -> List[Tuple[LaneBatch, LaneBranch | None]]:
+    """
+    Calls a function with the arguments on top of the stack, like apply_function.
+    """
+    args, arg_types = batch.frame.pop_n(len(function.inputs))
+    local_types = list(arg_types) + list(function.local_types[len(args):])
+    values = args + [_lane_array(local_type.get_default_value().value, local_type, len(batch))
+                     for local_type in local_types[len(args):]]
+    batch.frames.append(LaneFrame([], [], LaneLocals(values, local_types)))
+    outcomes = []
+    for part, branch in _run_sequence(batch, global_state, function.tiles, 1):
+        frame = part.frames.pop()
+        if branch is None:
+            part.frame.stack.extend(frame.stack)
+            part.frame.types.extend(frame.types)
+        elif branch.target_index == 0:
+            part.frame.stack.extend(branch.values)
+            part.frame.types.extend(branch.types)
+        else:
+            part.stop(np.ones(len(part), dtype=bool), f"Branch beyond function {function.name}")
+            continue
+        outcomes.append((part, None))
+    return outcomes
+
+
+def _run_block(batch: LaneBatch, global_state: GlobalState, block: Block,
+               repetitions: int = 1) -> List[Tuple[LaneBatch, LaneBranch | None]]:
+    """
+    Runs a block with the inputs on top of the stack, like apply_block.
+    """
+    values, types = batch.frame.pop_n(len(block.inputs))
+    batch.frames.append(LaneFrame(values, types, batch.frame.locals))
+    outcomes = []
+    for part, branch in _run_sequence(batch, global_state, block.tiles, repetitions):
+        frame = part.frames.pop()
+        if branch is None:
+            part.frame.stack.extend(frame.stack)
+            part.frame.types.extend(frame.types)
+        elif branch.target_index == 0:
+            part.frame.stack.extend(branch.values)
+            part.frame.types.extend(branch.types)
+            branch = None
+        else:
+            branch = LaneBranch(branch.target_index - 1, branch.values, branch.types)
+        outcomes.append((part, branch))
+    return outcomes
+
+
+def _run_sequence(batch: LaneBatch, global_state: GlobalState, tiles: list, repetitions: int, repetition: int = 0,
+                  position: int = 0) -> List[Tuple[LaneBatch, LaneBranch | None]]:
+    """
+    Runs the tiles repetitions times, starting at the given repetition and position. Returns every group of lanes
+    with the branch it left the sequence with, or None if it ran to the end.
+    """
+    while repetition < repetitions:
+        while position < len(tiles):
+            outcome = _run_tile(batch, global_state, tiles[position])
+            position += 1
+            if outcome is None:
+                continue
+            if isinstance(outcome, LaneBranch):
+                return [(batch, outcome)]
+            if len(outcome) == 1 and outcome[0][1] is None:
+                batch = outcome[0][0]
+                continue
+            # The lanes took different paths, every group continues on its own
+            results = []
+            for part, branch in outcome:
+                if branch is not None:
+                    results.append((part, branch))
+                else:
+                    results.extend(_run_sequence(part, global_state, tiles, repetitions, repetition, position))
+            return results
+        position = 0
+        repetition += 1
+    return [(batch, None)]
+
+
+def _branch(batch: LaneBatch, target_index: int, target: Function | Block) -> LaneBranch:
+    values = batch.frame.stack[len(batch.frame.stack) - len(target.outputs):]
+    types = batch.frame.types[len(batch.frame.types) - len(target.outputs):]
+    return LaneBranch(target_index, values, types)
+
+
+def _run_tile(batch: LaneBatch, global_state: GlobalState, tile) -> None | LaneBranch | List[Tuple[LaneBatch, LaneBranch | None]]:
+    """
+    Runs a single tile. Returns None if all lanes continue with the next tile, a branch if all lanes branch, or the
+    groups of lanes with their outcome if the control flow depends on the lane.
+    """
+    frame = batch.frame
+    kind = type(tile).__name__
+    name = tile.name
+
+    if type(tile).kernel is not None:
+        return _run_kernel(batch, tile)
+    if name in CONST_TILES:
+        value_type = CONST_TILES[name]
+        frame.push(_lane_array(tile.value, value_type, len(batch)), value_type)
+    elif name in LANE_LOADS:
+        return _run_load(batch, name)
+    elif name in LANE_STORES:
+        return _run_store(batch, name)
+    elif name in NO_OP_TILES:
+        pass
+    elif name == "Drop":
+        frame.pop_n(1)
+    elif name == "Select":
+        (true_value, false_value, condition), types = frame.pop_n(3)
+        frame.push(np.where(condition != 0, true_value, false_value), types[0])
+    elif name == "Canary":
+        value = frame.stack[-1]
+        # References are not recorded
+        if value.dtype.kind in "if":
+            batch.canary_output.append(value.astype(np.int64 if value.dtype.kind == "i" else np.float64))
+    elif name == "Memory size":
+        frame.push(_lane_array(1, I32, len(batch)), I32)
+    elif name == "Get local":
+        frame.push(frame.locals.values[tile.index], frame.locals.types[tile.index])
+    elif name in ("Set local", "Tee local"):
+        value = frame.stack[-1] if name == "Tee local" else frame.pop_n(1)[0][0]
+        frame.locals.values[tile.index] = value
+    elif name == "Get global":
+        global_var = global_state.globals.get_global_by_name(tile.global_name)
+        frame.push(batch.globals[tile.global_name], type(global_var.value))
+    elif name == "Set global":
+        batch.globals[tile.global_name] = frame.pop_n(1)[0][0]
+    elif name == "Get table":
+        return _run_table_get(batch, tile.table_name)
+    elif name == "Set table":
+        return _run_table_set(batch, tile.table_name)
+    elif kind == "BlockTile":
+        return _run_block(batch, global_state, tile.block)
+    elif kind == "ConditionTile":
+        (condition,), _ = frame.pop_n(1)
+        return [outcome for taken, part in batch.split(condition != 0)
+                for outcome in _run_block(part, global_state, tile.if_block if taken else tile.else_block)]
+    elif kind == "LoopTile":
+        if name == "Create bounded loop":
+            return _run_block(batch, global_state, tile.inner_block, tile.rep_count)
+        (count,), _ = frame.pop_n(1)
+        out_of_range = (count < UNBOUNDED_LOOP_MIN) | (count > UNBOUNDED_LOOP_MAX)
+        if out_of_range.any():
+            (count,) = batch.stop(out_of_range, "Loop count out of range", [count])
+            if not len(batch):
+                return []
+        # Like the simulation, the loop body is always executed once more than the count
+        return [outcome for repetitions, part in batch.split(count + 1)
+                for outcome in _run_block(part, global_state, tile.inner_block, repetitions)]
+    elif kind == "BrTile":
+        return _branch(batch, tile.index, tile.target)
+    elif kind == "BrIfTile":
+        (condition,), _ = frame.pop_n(1)
+        return [(part, _branch(part, tile.index, tile.target) if taken else None)
+                for taken, part in batch.split(condition != 0)]
+    elif kind == "BrTableTile":
+        (condition,), _ = frame.pop_n(1)
+        # Out of range values, including negative ones, select the default target
+        selected = np.where((condition >= 0) & (condition < len(tile.indices) - 1), condition, len(tile.indices) - 1)
+        return [(part, _branch(part, tile.indices[i], tile.targets[i])) for i, part in batch.split(selected)]
+    elif kind in ("CreateFunctionTile", "FunctionCallTile"):
+        return _call_function(batch, global_state, global_state.functions.get(tile.function_name))
+    elif kind == "FunctionIndirectCallTile":
+        (indices,), _ = frame.pop_n(1)
+        indices, _ = _table_indices(batch, tile.table_name, indices)
+        # Calls to null or other functions trap in Wasm, the generated programs only call a single function
+        other_target = batch.tables[tile.table_name][np.arange(len(batch)), indices] != tile.function_name
+        if other_target.any():
+            batch.stop(other_target, "Indirect call to another table element")
+        if not len(batch):
+            return []
+        return _call_function(batch, global_state, global_state.functions.get(tile.function_name))
+    elif kind == "FunctionRefToStackTile":
+        frame.push(_lane_array(tile.function_name, RefFunc, len(batch)), RefFunc)
+    else:
+        raise ValueError(f"Tile {name} is not supported by the lane interpreter")
+    return None
+
+
+def _run_kernel(batch: LaneBatch, tile) -> None | list:
+    """
+    Runs a tile with declared stack effects. Falls back to the scalar kernel, lane by lane, for tiles without a
+    vectorized kernel.
+    """
+    inputs, _ = batch.frame.pop_n(len(tile.stack_inputs))
+    traps = LANE_TRAPS.get(tile.name)
+    if traps is not None:
+        trapped = traps(*inputs)
+        if trapped.any():
+            inputs = batch.stop(trapped, f"{tile.name} traps", inputs)
+            if not len(batch):
+                return []
+    kernel = LANE_KERNELS.get(tile.name)
+    if kernel is not None:
+        result = kernel(*inputs)
+        results = (result,) if len(tile.stack_outputs) == 1 else result
+    else:
+        results = _run_scalar_kernel(batch, tile, inputs)
+        if not len(batch):
+            return []
+    for output_type, values in zip(tile.stack_outputs, results):
+        batch.frame.push(np.asarray(values).astype(LANE_DTYPES[output_type], copy=False), output_type)
+    return None
+
+
+def _run_scalar_kernel(batch: LaneBatch, tile, inputs: List[np.ndarray]) -> List[np.ndarray]:
+    """
+    Runs the scalar kernel of a tile for every lane. Lanes for which the kernel raises are stopped.
+    """
+    # Integers are passed as Python ints, floats keep their NumPy type
+    columns = [values.tolist() if values.dtype.kind == "i" else list(values) for values in inputs]
+    results, failed = [], np.zeros(len(batch), dtype=bool)
+    for lane, args in enumerate(zip(*columns)):
+        try:
+            result = tile.kernel(*args)
+        except (ValueError, ArithmeticError):
+            failed[lane] = True
+            continue
+        results.append((result,) if len(tile.stack_outputs) == 1 else result)
+    if failed.any():
+        batch.stop(failed, f"{tile.name} traps")
+    return [np.array(column, dtype=LANE_DTYPES[output_type])
+            for column, output_type in zip(zip(*results), tile.stack_outputs)] if results else \
+        [np.empty(0, dtype=LANE_DTYPES[output_type]) for output_type in tile.stack_outputs]
+
+
+def _lane_offsets(batch: LaneBatch, offsets: np.ndarray, size: int, values: List[np.ndarray] = ()) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """
+    Returns the byte indices for an access of the given size and stops lanes that access memory outside the window.
+    """
+    offsets = offsets.view(np.uint32).astype(np.int64)
+    outside = offsets + size > MEMORY_MAX_WRITE_INDEX
+    if outside.any():
+        offsets, *values = batch.stop(outside, "Memory access outside the writable window", [offsets, *values])
+    return offsets[:, None] + np.arange(size), values
+
+
+def _run_load(batch: LaneBatch, name: str) -> None | list:
+    value_type, memory_type = LANE_LOADS[name]
+    (offsets,), _ = batch.frame.pop_n(1)
+    size = np.dtype(memory_type).itemsize
+    indices, _ = _lane_offsets(batch, offsets, size)
+    if not len(batch):
+        return []
+    raw = batch.memory[np.arange(len(batch))[:, None], indices]
+    values = np.ascontiguousarray(raw).view(memory_type)[:, 0]
+    batch.frame.push(values.astype(LANE_DTYPES[value_type]), value_type)
+    return None
+
+
+def _run_store(batch: LaneBatch, name: str) -> None | list:
+    memory_type = LANE_STORES[name]
+    (offsets, values), _ = batch.frame.pop_n(2)
+    size = np.dtype(memory_type).itemsize
+    indices, (values,) = _lane_offsets(batch, offsets, size, [values])
+    if not len(batch):
+        return []
+    # Narrow stores keep the low bytes of the value
+    raw = np.ascontiguousarray(values.astype(memory_type)).view(np.uint8).reshape(len(batch), size)
+    batch.memory[np.arange(len(batch))[:, None], indices] = raw
+    return None
+
+
+def _table_indices(batch: LaneBatch, table_name: str, indices: np.ndarray, values: List[np.ndarray] = ()):
+    outside = (indices < 0) | (indices >= batch.tables[table_name].shape[1])
+    if outside.any():
+        indices, *values = batch.stop(outside, "Table access out of bounds", [indices, *values])
+    return indices, values
+
+
+def _run_table_get(batch: LaneBatch, table_name: str) -> None | list:
+    (indices,), _ = batch.frame.pop_n(1)
+    indices, _ = _table_indices(batch, table_name, indices)
+    if not len(batch):
+        return []
+    batch.frame.push(batch.tables[table_name][np.arange(len(batch)), indices], RefFunc)
+    return None
+
+
+def _run_table_set(batch: LaneBatch, table_name: str) -> None | list:
+    (indices, values), _ = batch.frame.pop_n(2)
+    indices, (values,) = _table_indices(batch, table_name, indices, [values])
+    if not len(batch):
+        return []
+    batch.tables[table_name][np.arange(len(batch)), indices] = values
+    return None
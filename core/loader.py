@@ -1,16 +1,13 @@
 # SPDX-License-Identifier: MIT
 # SPDX-FileCopyrightText: 2025 Siemens AG
 
-import importlib
-import os
-from typing import List, Type, TypeVar
+from typing import Dict, List, Tuple, Type
+from core.registry import load_manifest, resolve, resolve_types, index_by_name
 from core.state.functions import Function, Block
 from core.state.state import GlobalState
 from core.strategy import AbstractSelectionStrategy
 from core.tile import AbstractTile, AbstractTileFactory
 
-T = TypeVar('T')
-
 
 class AbstractTileLoader:
 
@@ -30,20 +27,71 @@ class AbstractTileLoader:
 class TileLoader(AbstractTileLoader):
     """
     Loads all tiles from a given directory.
+
+    The tiles and factories are listed by the manifest of the directory, see core.registry. Static tiles are indexed
+    from the manifest and a module is only imported once one of its tiles is a candidate, or once the factories are
+    first used.
     """
 
-    def __init__(self, path: str, selection_strategy: AbstractSelectionStrategy):
+    def __init__(self, path: str, selection_strategy: AbstractSelectionStrategy, manifest_path: str | None = None,
+                 verbose: bool = False):
         self.path = path
         self.selection_strategy = selection_strategy
-        self.tiles: List[Type[AbstractTile]] = self._load_classes(path, AbstractTile)
-        self.factories: List[AbstractTileFactory] = [factory(0, self) for factory in
-                                                     self._load_classes(path, AbstractTileFactory)]
+        manifest = load_manifest(path, manifest_path, verbose)
+        self.tile_entries: List[dict] = manifest["tiles"]
+        self.factory_entries: List[dict] = manifest["factories"]
+        self.tile_ids: Dict[int, int] = {entry["id"]: position for position, entry in enumerate(self.tile_entries)}
+        self.tile_names: Dict[str, int] = index_by_name(self.tile_entries)
+        # Tile classes by position in the manifest, None until their module is imported
+        self._tiles: List[Type[AbstractTile] | None] = [None] * len(self.tile_entries)
+        self._factories: List[AbstractTileFactory] | None = None
+        # Static tiles grouped by the stack types they need, see _build_signature_index
+        self.signature_index: Dict[Tuple[type, ...], List[Tuple[int, bool]]] = {}
+        self.signature_lengths: List[int] = []
+        self.unindexed_tiles: List[Tuple[int, bool]] = []
+        self._build_signature_index()
+
+    @property
+    def tiles(self) -> List[Type[AbstractTile]]:
+        """
+        All static tiles, importing the modules that were not used yet.
+        """
+        return [self.get_tile(position) for position in range(len(self.tile_entries))]
+
+    @property
+    def factories(self) -> List[AbstractTileFactory]:
+        if self._factories is None:
+            self._factories = [resolve(entry["module"], entry["attribute"])(0, self)
+                               for entry in self.factory_entries]
+        return self._factories
+
+    def get_tile(self, position: int) -> Type[AbstractTile]:
+        """
+        Returns the static tile at a position of the manifest.
+        """
+        tile = self._tiles[position]
+        if tile is None:
+            entry = self.tile_entries[position]
+            tile = self._tiles[position] = resolve(entry["module"], entry["attribute"])
+        return tile
 
     def get_placeable_tiles(self, state: GlobalState, current_function: Function, current_blocks: List[Block]) -> List[Type[AbstractTile]]:
         """
         Return a list of tiles that can be placed in the current state.
         """
-        static_tiles = [tile for tile in self.tiles if tile.can_be_placed(state, current_function,current_blocks)]
+        frame = state.stack.get_current_frame()
+        candidates = list(self.unindexed_tiles)
+        for length in self.signature_lengths:
+            if length <= len(frame.types):
+                candidates.extend(self.signature_index.get(frame.top_types(length), ()))
+        # Keep the load order, so the selection does not depend on the index
+        candidates.sort(key=lambda candidate: candidate[0])
+        tiles = self._tiles
+        static_tiles = []
+        for position, needs_check in candidates:
+            tile = tiles[position] or self.get_tile(position)
+            if not needs_check or tile.can_be_placed(state, current_function, current_blocks):
+                static_tiles.append(tile)
         dynamic_tiles = []
         for factory in self.factories:
             dynamic_tiles.extend(factory.generate_all_placeable_tiles(state, current_function,current_blocks))
@@ -53,47 +101,31 @@ class TileLoader(AbstractTileLoader):
         """
         Return a tile type by name.
         """
-        for tile in self.tiles:
-            if tile.name == name:
-                return tile
-        raise ValueError(f"Tile with name '{name}' not found")
+        if name not in self.tile_names:
+            raise ValueError(f"Tile with name '{name}' not found")
+        return self.get_tile(self.tile_names[name])
+
+    def get_tile_type_by_id(self, tile_id: int) -> Type[AbstractTile]:
+        """
+        Return a tile type by its stable id from the manifest.
+        """
+        if tile_id not in self.tile_ids:
+            raise ValueError(f"Tile with id {tile_id} not found")
+        return self.get_tile(self.tile_ids[tile_id])
+
+    def _build_signature_index(self):
+        """
+        Groups the static tiles by their stack_inputs. A lookup with the types on top of the current stack returns all
+        tiles whose inputs match. Only tiles that override can_be_placed are checked again, tiles without stack_inputs
+        are always checked.
+        """
+        for position, entry in enumerate(self.tile_entries):
+            key = resolve_types(entry["stack_inputs"])
+            if key is None:
+                self.unindexed_tiles.append((position, True))
+                continue
+            self.signature_index.setdefault(key, []).append((position, entry["needs_check"]))
+        self.signature_lengths = sorted({len(key) for key in self.signature_index})
 
     def __str__(self):
         return f"TileLoader({self.path})\n" + "\n".join([f"  {tile}" for tile in self.tiles])
-
-    def _find_python_files(self, directory):
-        """
-        Yield directory and filenames of Python files.
-        """
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.endswith('.py'):
-                    yield root, file
-
-    def _import_subclasses(self, root, file, subclass: Type[T]) -> List[Type[T]]:
-        """
-        Attempt to import subclasses of AbstractTile from the given file.
-        """
-        sub_classes = []
-        module_path = os.path.splitext(os.path.join(root, file))[0]
-        relative_module = module_path.replace("/", '.')
-        print("Loading module:", relative_module)
-        try:
-            module = importlib.import_module(relative_module)
-            if hasattr(module, "DISABLED") and getattr(module, "DISABLED"):
-                return []
-            for name, obj in vars(module).items():
-                if isinstance(obj, type) and issubclass(obj, subclass) and obj is not subclass:
-                    sub_classes.append(obj)
-        except ModuleNotFoundError as e:
-            print(f"Failed to import {relative_module}: {e}")
-        return sub_classes
-
-    def _load_classes(self, directory: str, subclass: Type[T]) -> List[Type[T]]:
-        """Load all classes inheriting from AbstractTile from Python files within the directory."""
-        sub_classes = []
-        for root, file in self._find_python_files(directory):
-            cls = self._import_subclasses(root, file, subclass)
-            if cls:
-                sub_classes.extend(cls)
-        return sub_classes
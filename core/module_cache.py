@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+An on-disk cache of compiled modules.
+
+Modules are stored serialized under a hash of the Wasm bytes and the engine key, see core.runner.get_engine_key, so a
+module compiled by another wasmtime version or engine configuration is never loaded. Loading a cached module skips
+the compilation. The cache is bounded by the size of its files, the least recently used modules are evicted first.
+Serialized modules are trusted native code, the cache directory must not be writable by others.
+"""
+
+import hashlib
+import os
+from typing import Callable, List
+from wasmtime import Engine, Module, WasmtimeError
+from core.config.config import MODULE_CACHE_MAX_SIZE
+
+MODULE_SUFFIX = ".cwasm"
+
+
+class ModuleCache:
+    """
+    A size bounded cache of compiled modules in a directory. Several processes may share the directory.
+    """
+
+    def __init__(self, directory: str, max_size: int = MODULE_CACHE_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+        self._size: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def module_path(self, engine_key: str, wasm: bytes) -> str:
+        digest = hashlib.blake2b(engine_key.encode("utf-8") + b"\0" + bytes(wasm), digest_size=20).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + MODULE_SUFFIX)
+
+    def get(self, engine: Engine, engine_key: str, wasm: bytes) -> Module | None:
+        """
+        Returns the cached module of the Wasm bytes, or None if it is not cached.
+        """
+        path = self.module_path(engine_key, wasm)
+        try:
+            module = Module.deserialize_file(engine, path)
+            # The modification time orders the modules for eviction
+            os.utime(path)
+        except (OSError, WasmtimeError):
+            return None
+        return module
+
+    def put(self, engine_key: str, wasm: bytes, module: Module):
+        """
+        Stores a compiled module and evicts the least recently used modules if the cache is full.
+        """
+        path = self.module_path(engine_key, wasm)
+        data = module.serialize()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        staging_path = f"{path}.{os.getpid()}"
+        try:
+            with open(staging_path, "wb") as f:
+                f.write(data)
+            os.replace(staging_path, path)
+        except OSError:
+            return
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += len(data)
+        if self._size > self.max_size:
+            self.evict()
+
+    def load(self, engine: Engine, engine_key: str, wasm: bytes, compile: Callable[[bytes], Module]) -> Module:
+        """
+        Returns the cached module of the Wasm bytes, compiling and storing it on a miss.
+        """
+        module = self.get(engine, engine_key, wasm)
+        if module is not None:
+            self.hits += 1
+            return module
+        self.misses += 1
+        module = compile(wasm)
+        self.put(engine_key, wasm, module)
+        return module
+
+    def evict(self):
+        """
+        Removes the least recently used modules until the cache is below its size limit. Other processes may have
+        added or used modules in the meantime, so the size is measured again.
+        """
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+        self._size = size
+
+    def _entries(self) -> List[tuple[float, int, str]]:
+        """
+        Returns the modification time, size and path of every cached module.
+        """
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for file in files:
+                if file.endswith(MODULE_SUFFIX):
+                    path = os.path.join(root, file)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
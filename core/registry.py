@@ -0,0 +1,177 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+A manifest of the tiles and tile factories in a tile directory.
+
+Scanning a directory means importing every module in it and reflecting over its classes. The manifest records the
+result once, together with the metadata the tile loader indexes (name, stack inputs, whether can_be_placed is
+overridden) and a stable id per class. It is cached in a user cache directory, outside the source tree, and rebuilt
+whenever the path, modification time or size of a Python file in the directory changes, so a loader started from the
+manifest only imports a module once one of its classes is used.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+from typing import Dict, List, Type, TypeVar
+from core.config.config import TILE_MANIFEST_DIR
+from core.tile import AbstractTile, AbstractTileFactory
+
+T = TypeVar('T')
+
+MANIFEST_VERSION = 2
+
+
+def stable_id(module: str, attribute: str) -> int:
+    """
+    Returns an id for a class that does not depend on the load order or the process.
+    """
+    return int.from_bytes(hashlib.blake2b(f"{module}:{attribute}".encode("utf-8"), digest_size=8).digest(),
+                          "little") >> 1
+
+
+def qualified_name(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def resolve(module: str, attribute: str):
+    """
+    Imports a module and returns one of its attributes. The attribute may be a dotted qualified name.
+    """
+    obj = importlib.import_module(module)
+    for part in attribute.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def find_python_files(directory: str) -> List[str]:
+    """
+    Returns the paths of the Python files within a directory, in the order the directory is walked.
+    """
+    return [os.path.join(root, file) for root, _, files in os.walk(directory) for file in files
+            if file.endswith('.py')]
+
+
+def directory_hash(directory: str) -> str:
+    """
+    Returns a hash of the paths, modification times and sizes of the Python files within a directory. The files are
+    only stat'ed, not read.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for path in sorted(find_python_files(directory)):
+        stat = os.stat(path)
+        h.update(f"{os.path.relpath(path, directory)}\0{stat.st_mtime_ns}\0{stat.st_size}\0".encode("utf-8"))
+    return h.hexdigest()
+
+
+def default_manifest_path(directory: str) -> str:
+    """
+    Returns the path of the cached manifest of a tile directory. Every directory has its own file in the cache
+    directory, so the source tree is never written.
+    """
+    cache_directory = TILE_MANIFEST_DIR
+    if cache_directory is None:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        cache_directory = os.path.join(cache_home, "wasmweaver")
+    key = hashlib.blake2b(os.path.abspath(directory).encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(cache_directory, f"tile_manifest_{key}.json")
+
+
+def module_name(path: str) -> str:
+    return os.path.splitext(path)[0].replace("/", '.')
+
+
+def import_subclasses(module: str, subclass: Type[T], verbose: bool = False) -> List[tuple[str, Type[T]]]:
+    """
+    Imports a module and returns the names and classes of its subclasses of the given class. Disabled modules have
+    none. Raises ModuleNotFoundError if a dependency of the module is missing.
+    """
+    if verbose:
+        print("Loading module:", module)
+    imported = importlib.import_module(module)
+    if getattr(imported, "DISABLED", False):
+        return []
+    return [(name, obj) for name, obj in vars(imported).items()
+            if isinstance(obj, type) and issubclass(obj, subclass) and obj is not subclass]
+
+
+def build_manifest(directory: str, verbose: bool = False) -> tuple[dict, bool]:
+    """
+    Scans a tile directory and returns its manifest, and if all modules could be imported.
+    """
+    default_check = AbstractTile.can_be_placed.__func__
+    manifest = {"version": MANIFEST_VERSION, "hash": directory_hash(directory), "tiles": [], "factories": []}
+    complete = True
+    for path in find_python_files(directory):
+        module = module_name(path)
+        try:
+            tiles = import_subclasses(module, AbstractTile, verbose)
+            factories = import_subclasses(module, AbstractTileFactory)
+        except ModuleNotFoundError as e:
+            if verbose:
+                print(f"Failed to import {module}: {e}")
+            complete = False
+            continue
+        for attribute, tile in tiles:
+            manifest["tiles"].append({
+                "id": stable_id(module, attribute),
+                "module": module,
+                "attribute": attribute,
+                "name": tile.name,
+                "stack_inputs": None if tile.stack_inputs is None else [qualified_name(t) for t in tile.stack_inputs],
+                "needs_check": getattr(tile.can_be_placed, "__func__", None) is not default_check,
+            })
+        for attribute, factory in factories:
+            manifest["factories"].append({"id": stable_id(module, attribute), "module": module,
+                                          "attribute": attribute})
+    return manifest, complete
+
+
+def load_manifest(directory: str, manifest_path: str | None = None, verbose: bool = False) -> dict:
+    """
+    Returns the cached manifest of a tile directory, rebuilding and storing it if the directory changed. A manifest of
+    a directory with modules that could not be imported is not stored, so it is rebuilt once they can be.
+    """
+    if manifest_path is None:
+        manifest_path = default_manifest_path(directory)
+    current_hash = directory_hash(directory)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION and manifest.get("hash") == current_hash:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    manifest, complete = build_manifest(directory, verbose)
+    if complete:
+        # Workers may build the manifest at the same time, the last one to finish wins
+        staging_path = f"{manifest_path}.{os.getpid()}"
+        try:
+            os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+            with open(staging_path, "w") as f:
+                json.dump(manifest, f, indent=1)
+            os.replace(staging_path, manifest_path)
+        except OSError:
+            pass
+    return manifest
+
+
+def resolve_types(names: List[str] | None) -> tuple | None:
+    """
+    Returns the value types of a manifest entry.
+    """
+    if names is None:
+        return None
+    return tuple(resolve(*name.split(":")) for name in names)
+
+
+def index_by_name(entries: List[dict]) -> Dict[str, int]:
+    """
+    Returns the position of the first entry with each tile name.
+    """
+    positions = {}
+    for position, entry in enumerate(entries):
+        positions.setdefault(entry["name"], position)
+    return positions
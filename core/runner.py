@@ -1,14 +1,22 @@
 # SPDX-License-Identifier: MIT
 # SPDX-FileCopyrightText: 2025 Siemens AG
 
+import platform
 import subprocess
+import time
 from enum import Enum
-from typing import List
+from importlib.metadata import version
+from typing import Dict, List
 from wasmtime import Config, Engine, Store, Module, Func, FuncType, Instance, Memory, MemoryType, Limits, wat2wasm
-from core.config.config import MEMORY_MAX_WRITE_INDEX
+from core.config.config import MEMORY_MAX_WRITE_INDEX, RUNNER_STORE_REUSE_LIMIT, RUNNER_CRANELIFT_OPT_LEVEL, \
+    MODULE_CACHE_DIR, RESPONSE_TIME_WARMUP_RUNS, RESPONSE_TIME_REPETITIONS, RESPONSE_TIME_TRIM, RESPONSE_TIME_CONFIDENCE
+from core.constraints import ResponseTimeConstraint, ConstraintsViolatedError
 from core.converter import global_state_to_wat_program
+from core.encoder import global_state_to_wasm, global_states_to_packed_wasm, pack_prefix, EncodingError
+from core.module_cache import ModuleCache
 from core.processor import AbstractPostProcessor
 from core.state.state import GlobalState
+from core.timing import ResponseTimeMeasurement, TimingSummary
 
 
 class PerformanceMetric(Enum):
@@ -41,6 +49,8 @@ class AbstractRunResult:
         self.return_values = []
         self.return_types = []
         self.post_processors: List[AbstractPostProcessor] = []
+        # Measured wall-clock times, only with PerformanceMetric.RESPONSE_TIME
+        self.response_time: ResponseTimeMeasurement | None = None
 
 
 def wat_to_wasm_bytes(wat_str: str) -> bytes:
@@ -58,22 +68,234 @@ def wat_to_wasm_bytes(wat_str: str) -> bytes:
 
     return wasm_bytes
 
-def run_global_state(global_state: GlobalState,
-                     start_function: str = "run", sanity_check: bool = True) -> AbstractRunResult:
+_engines: Dict[tuple, Engine] = {}
+
+
+def get_engine(consume_fuel: bool = True, cranelift_opt_level: str = RUNNER_CRANELIFT_OPT_LEVEL) -> Engine:
+    """
+    Returns the engine of a configuration. Engines are shared by all runners of the process.
+    """
+    key = (consume_fuel, cranelift_opt_level)
+    engine = _engines.get(key)
+    if engine is None:
+        config = Config()
+        config.consume_fuel = consume_fuel
+        config.cranelift_opt_level = cranelift_opt_level
+        engine = Engine(config)
+        _engines[key] = engine
+    return engine
+
+
+def get_engine_key(consume_fuel: bool = True, cranelift_opt_level: str = RUNNER_CRANELIFT_OPT_LEVEL) -> str:
+    """
+    Returns a key of everything a compiled module depends on: the wasmtime version, the platform and the configuration.
+    """
+    return f"wasmtime-{version('wasmtime')}-{platform.machine()}-{platform.system()}-{consume_fuel}-{cranelift_opt_level}"
+
+
+class WasmRunner:
+    """
+    Runs programs on a shared fuel-enabled engine. A store is reused for several programs, as setting one up costs
+    more than instantiating and running a generated program in it. Every program still gets its own memory and
+    instance. Compiled modules are loaded from the module cache if one is given or configured, see MODULE_CACHE_DIR.
+    """
+
+    def __init__(self, store_reuse_limit: int = RUNNER_STORE_REUSE_LIMIT,
+                 cranelift_opt_level: str = RUNNER_CRANELIFT_OPT_LEVEL, module_cache: ModuleCache | None = None):
+        self.engine = get_engine(True, cranelift_opt_level)
+        self.engine_key = get_engine_key(True, cranelift_opt_level)
+        if module_cache is None and MODULE_CACHE_DIR is not None:
+            module_cache = ModuleCache(MODULE_CACHE_DIR)
+        self.module_cache = module_cache
+        self.store_reuse_limit = store_reuse_limit
+        self._store: Store | None = None
+        self._store_uses = 0
+
+    def get_store(self) -> Store:
+        """
+        Returns the store for the next program, replacing it once it was used store_reuse_limit times.
+        """
+        if self._store is None or self._store_uses >= self.store_reuse_limit:
+            self._store = Store(self.engine)
+            self._store_uses = 0
+        self._store_uses += 1
+        return self._store
+
+    def discard_store(self):
+        """
+        Drops the current store, e.g. after a program failed in it.
+        """
+        self._store = None
+
+    def compile(self, wasm_code: bytes) -> Module:
+        if self.module_cache is not None:
+            return self.module_cache.load(self.engine, self.engine_key, wasm_code, self._compile)
+        return self._compile(wasm_code)
+
+    def _compile(self, wasm_code: bytes) -> Module:
+        return Module(self.engine, wasm_code)
+
+    def run(self, global_state: GlobalState, start_function: str = "run", sanity_check: bool = True,
+            metric: PerformanceMetric = PerformanceMetric.FUEL) -> AbstractRunResult:
+        """
+        Runs the given global state, see run_global_state.
+        """
+        if metric == PerformanceMetric.ENERGY:
+            raise ValueError("Energy can not be measured, use PerformanceMetric.FUEL or RESPONSE_TIME")
+        wasm_code = global_state_to_wasm_bytes(global_state)
+        compile_time = 0
+        if metric == PerformanceMetric.RESPONSE_TIME:
+            # The module cache is bypassed, so the compile time is not a cache lookup
+            start = time.perf_counter_ns()
+            module = self._compile(wasm_code)
+            compile_time = time.perf_counter_ns() - start
+        else:
+            module = self.compile(wasm_code)
+        store = self.get_store()
+        try:
+            result = run_module(store, module, global_state, start_function, sanity_check)
+            if metric == PerformanceMetric.RESPONSE_TIME:
+                result.response_time = self.measure_response_time(module, global_state, start_function, compile_time)
+            return result
+        except Exception:
+            self.discard_store()
+            raise
+
+    def measure_response_time(self, module: Module, global_state: GlobalState, start_function: str = "run",
+                              compile_time: int = 0, warmup_runs: int = RESPONSE_TIME_WARMUP_RUNS,
+                              repetitions: int = RESPONSE_TIME_REPETITIONS, trim: float = RESPONSE_TIME_TRIM,
+                              confidence: float = RESPONSE_TIME_CONFIDENCE) -> ResponseTimeMeasurement:
+        """
+        Measures the wall-clock time of a compiled program. Every run gets a fresh memory and instance, so it starts
+        from the same initial state. Only the instantiation and the call are timed. The fuel is still counted, as it
+        is in every other run.
+        """
+        instantiate_times, invoke_times = [], []
+        for repetition in range(warmup_runs + repetitions):
+            store = self.get_store()
+            memory = Memory(store, MemoryType(Limits(1, 1)))
+            memory.write(store, global_state.memory.initial_values, 0)
+            imports = ext_function_imports(store, global_state, AbstractRunResult(0, []))
+            imports.append(memory)
+            start = time.perf_counter_ns()
+            instance = Instance(store, module, imports)
+            instantiated = time.perf_counter_ns()
+            run = instance.exports(store)[start_function]
+            store.set_fuel(2_000_000_000_000_000)
+            call_start = time.perf_counter_ns()
+            run(store)
+            end = time.perf_counter_ns()
+            if repetition >= warmup_runs:
+                instantiate_times.append(instantiated - start)
+                invoke_times.append(end - call_start)
+        return ResponseTimeMeasurement(compile_time, TimingSummary(instantiate_times, trim, confidence),
+                                       TimingSummary(invoke_times, trim, confidence), warmup_runs)
+
+    def run_packed(self, global_states: List[GlobalState], start_function: str = "run",
+                   sanity_check: bool = True) -> List[AbstractRunResult]:
+        """
+        Runs several global states with one compilation and one instantiation, see run_packed_module. Returns a result
+        per global state.
+        """
+        module = self.compile(global_states_to_packed_wasm(global_states))
+        store = self.get_store()
+        try:
+            return run_packed_module(store, module, global_states, start_function, sanity_check)
+        except Exception:
+            self.discard_store()
+            raise
+
+
+_default_runner: WasmRunner | None = None
+
+
+def get_default_runner() -> WasmRunner:
+    global _default_runner
+    if _default_runner is None:
+        _default_runner = WasmRunner()
+    return _default_runner
+
+
+def run_global_state(global_state: GlobalState, start_function: str = "run", sanity_check: bool = True,
+                     metric: PerformanceMetric = PerformanceMetric.FUEL) -> AbstractRunResult:
+    """
+    Runs the given global state and returns the metric. The fuel is always counted. With
+    PerformanceMetric.RESPONSE_TIME, the wall-clock times are measured as well, see WasmRunner.measure_response_time.
+    Energy can not be measured and raises a ValueError. If sanity check is true, the memory output is compared to the
+    expected memory output.
     """
-    Runs the given global state and returns the metric. The metric can be fuel, energy or response time. If sanity
-    check is true, the memory output is compared to the expected memory output.
+    return get_default_runner().run(global_state, start_function, sanity_check, metric)
+
+
+def check_response_time(global_state: GlobalState, result: AbstractRunResult):
+    """
+    Replaces the estimated response time of the ResponseTimeConstraint of a global state with the measured one. Raises
+    ConstraintsViolatedError if the measured response time is outside the targets.
+    """
+    constraint = global_state.constraints[ResponseTimeConstraint]
+    if constraint is None or result.response_time is None:
+        return
+    constraint.set_resource(result.response_time.response_time)
+    if constraint.is_violated() or not constraint.is_fulfilled():
+        raise ConstraintsViolatedError(f"Measured response time {result.response_time.response_time} s is outside "
+                                       f"[{constraint.min_target}, {constraint.max_target}]")
+
+
+def run_global_states_packed(global_states: List[GlobalState], start_function: str = "run",
+                             sanity_check: bool = True) -> List[AbstractRunResult]:
+    """
+    Runs several global states packed into one module and returns their results, see WasmRunner.run_packed.
+    """
+    return get_default_runner().run_packed(global_states, start_function, sanity_check)
+
+
+def run_module(store: Store, module: Module, global_state: GlobalState, start_function: str = "run",
+               sanity_check: bool = True) -> AbstractRunResult:
+    """
+    Instantiates a compiled program of a global state in a store and runs it, see run_global_state.
     """
-    wasm_code = global_state_to_wat_program(global_state)
     result = AbstractRunResult(0, [])
-    config = Config()
-    config.consume_fuel = True
-    engine = Engine(config)
-    store = Store(engine)
     memory = Memory(store, MemoryType(Limits(1, 1)))
     memory.write(store, global_state.memory.initial_values, 0)
 
-    module = Module(store.engine, wasm_code)
+    imports = ext_function_imports(store, global_state, result)
+    imports.append(memory)
+
+    instance = Instance(store, module, imports)
+    result.fuel, result.return_values = invoke(store, instance, start_function)
+    if sanity_check:
+        check_memory(store, memory, global_state)
+    return result
+
+
+def run_packed_module(store: Store, module: Module, global_states: List[GlobalState], start_function: str = "run",
+                      sanity_check: bool = True) -> List[AbstractRunResult]:
+    """
+    Instantiates a packed module of several programs once and runs the programs one after another, see
+    core.encoder.global_states_to_packed_wasm. The shared memory is reset to the initial memory of each program before
+    it runs, and the fuel of each program is counted on its own.
+    """
+    results = [AbstractRunResult(0, []) for _ in global_states]
+    memory = Memory(store, MemoryType(Limits(1, 1)))
+    imports = []
+    for global_state, result in zip(global_states, results):
+        imports.extend(ext_function_imports(store, global_state, result))
+    imports.append(memory)
+
+    instance = Instance(store, module, imports)
+    for k, (global_state, result) in enumerate(zip(global_states, results)):
+        # The initial memory spans the whole memory, so writing it undoes the previous program
+        memory.write(store, global_state.memory.initial_values, 0)
+        result.fuel, result.return_values = invoke(store, instance, pack_prefix(k) + start_function)
+        if sanity_check:
+            check_memory(store, memory, global_state)
+    return results
+
+
+def ext_function_imports(store: Store, global_state: GlobalState, result: AbstractRunResult) -> List[Func]:
+    """
+    Returns the host functions of the external functions of a program. Their resource usage is recorded in the result.
+    """
     imports = []
 
     def callback_builder(function_instance):
@@ -89,14 +311,33 @@ def run_global_state(global_state: GlobalState,
         imports.append(Func(store, FuncType([inp.get_wasmtime_type() for inp in function.inputs],
                                             [out.get_wasmtime_type() for out in function.outputs]),
                             callback_builder(function)))
+    return imports
 
-    imports.append(memory)
 
-    instance = Instance(store, module, imports)
+def check_memory(store: Store, memory: Memory, global_state: GlobalState):
+    """
+    Asserts that the memory after a run matches the memory the generator expects.
+    """
+    expected_memory_output = global_state.memory.memory
+    initial_memory_output = global_state.memory.initial_values
+    actual_memory_output = memory.read(store, 0, len(expected_memory_output))
+    assert expected_memory_output == actual_memory_output, (
+        f"Memory output does not match. Expected \n"
+        f"Initial: {'\t'.join(format(byte) for byte in initial_memory_output[:MEMORY_MAX_WRITE_INDEX])}, \n"
+        f"Expected:{'\t'.join(format(byte) for byte in expected_memory_output[:MEMORY_MAX_WRITE_INDEX])}, \n"
+        f"Actual:  {'\t'.join(format(byte) for byte in actual_memory_output[:MEMORY_MAX_WRITE_INDEX])}"
+    )
+
+
+def invoke(store: Store, instance: Instance, start_function: str = "run") -> tuple[int, tuple]:
+    """
+    Calls an exported function of an instance and returns the fuel it consumed and its return values as a tuple.
+    """
     total_fuel = 2_000_000_000_000_000 #Some arbitrary large number
     store.set_fuel(total_fuel)
     run = instance.exports(store)[start_function]
     return_values = run(store)
+    fuel = total_fuel - store.get_fuel()
     if return_values == None:
         return_values = ()
     #Check if return values are of type tuple
@@ -104,20 +345,18 @@ def run_global_state(global_state: GlobalState,
         return_values = tuple(return_values)
     if not isinstance(return_values, tuple):
         return_values = (return_values,)
-    result.return_values = return_values
-    if sanity_check:
-        expected_memory_output = global_state.memory.memory
-        initial_memory_output = global_state.memory.initial_values
-        actual_memory_output = memory.read(store, 0, len(expected_memory_output))
-        assert expected_memory_output == actual_memory_output, (
-            f"Memory output does not match. Expected \n"
-            f"Initial: {'\t'.join(format(byte) for byte in initial_memory_output[:MEMORY_MAX_WRITE_INDEX])}, \n"
-            f"Expected:{'\t'.join(format(byte) for byte in expected_memory_output[:MEMORY_MAX_WRITE_INDEX])}, \n"
-            f"Actual:  {'\t'.join(format(byte) for byte in actual_memory_output[:MEMORY_MAX_WRITE_INDEX])}"
-        )
-
-    result.fuel = total_fuel - store.get_fuel()
-    return result
+    return fuel, return_values
+
+
+def global_state_to_wasm_bytes(global_state: GlobalState) -> bytes:
+    """
+    Returns the binary module of a global state. It is encoded directly, programs with instructions the encoder does not
+    support are converted from their WAT code.
+    """
+    try:
+        return global_state_to_wasm(global_state)
+    except EncodingError:
+        return wat_code_to_wasm(global_state_to_wat_program(global_state))
 
 
 def wat_code_to_wasm(wat_code: str) -> bytearray:
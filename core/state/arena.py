@@ -0,0 +1,231 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+from array import array
+from typing import Dict, List, Tuple, TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from core.state.functions import Function, Block
+    from core.tile import AbstractTile
+
+# Attributes of structured tiles that hold nested blocks, in code order
+CHILD_BLOCK_ATTRIBUTES = ("block", "if_block", "else_block", "inner_block")
+# Attributes of tiles that are stored as immediates, e.g. the branch depths of a br_table in indices
+IMMEDIATE_ATTRIBUTES = ("value", "index", "indices", "rep_count", "global_name", "table_name", "function_name",
+                        "elem_index")
+
+
+def get_child_blocks(tile: "AbstractTile") -> List["Block"]:
+    """
+    Returns the blocks nested in a tile, e.g. the if and else block of a condition.
+    """
+    return [block for block in (getattr(tile, name, None) for name in CHILD_BLOCK_ATTRIBUTES) if block is not None]
+
+
+class TileArray(list):
+    """
+    The tiles of a function or block. Every tile array counts the writes to it, so an arena can tell whether a block
+    changed since it was built by comparing one number, see ProgramArena.is_current. The count belongs to the tile
+    array, so generating or changing other programs does not outdate the arena.
+    """
+
+    def __init__(self, tiles=()):
+        super().__init__(tiles)
+        self.writes = 0
+
+    def _written(self):
+        self.writes += 1
+
+    def append(self, tile):
+        self._written()
+        super().append(tile)
+
+    def extend(self, tiles):
+        self._written()
+        super().extend(tiles)
+
+    def insert(self, index, tile):
+        self._written()
+        super().insert(index, tile)
+
+    def pop(self, index=-1):
+        self._written()
+        return super().pop(index)
+
+    def remove(self, tile):
+        self._written()
+        super().remove(tile)
+
+    def clear(self):
+        self._written()
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._written()
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._written()
+        super().reverse()
+
+    def __setitem__(self, index, value):
+        self._written()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index):
+        self._written()
+        super().__delitem__(index)
+
+    def __iadd__(self, tiles):
+        self._written()
+        return super().__iadd__(tiles)
+
+    def __imul__(self, count):
+        self._written()
+        return super().__imul__(count)
+
+
+class ProgramArena:
+    """
+    A flat view of the tiles of a program.
+
+    Every tile is a node and every function body or block is a block. Blocks are numbered in pre-order and the tiles of
+    each block are stored contiguously, in the same order, so the tile array of a block is the node range
+    [block_start, block_end). All other information lives in flat arrays indexed by node or block id, which makes depth,
+    parent and block queries O(1) once it is built, and the arena cheap to copy. The tile objects are kept next to the
+    arrays, a pickled arena only contains the arrays.
+
+    The arena only serves whole-program queries and post-processing, e.g. core.dedup and the memoization of
+    core.converter. Functions and blocks are still built as object graphs during generation, and code emission,
+    encoding and execution walk that graph, not the arena. An arena is a snapshot of the graph, which is outdated by
+    writes to the tile arrays of its blocks, see is_current.
+    """
+
+    def __init__(self, functions: List[Union["Function", "Block"]]):
+        # The roots, usually functions but blocks can be flattened on their own as well
+        self.functions = list(functions)
+        self.blocks: List[Union["Function", "Block"]] = []
+        self.tiles: List["AbstractTile"] = []
+        self.opcode_names: List[str] = []
+        self.constants: List[tuple] = []
+        # Per node
+        self.opcodes = array("H")
+        self.immediates = array("i")
+        self.node_block = array("i")
+        self.node_child = array("i")
+        # Per block
+        self.block_start = array("i")
+        self.block_end = array("i")
+        self.block_parent = array("i")
+        self.block_depth = array("i")
+        self.block_type = array("b")
+        self.block_function = array("i")
+        # Per function
+        self.function_max_depth = array("i")
+        self.max_block_depth = 0
+        # The tile array of every block and its write count when the arena was built
+        self.block_tile_arrays: List[TileArray] = []
+        self.block_writes = array("q")
+        self._build()
+
+    def _build(self):
+        opcode_ids: Dict[str, int] = {}
+        constant_ids: Dict[str, int] = {}
+        # Number the blocks in pre-order, remembering the first nested block of every structured tile
+        parents, depths, functions = [], [], []
+        first_children: Dict[Tuple[int, int], int] = {}
+        for function_id, function in enumerate(self.functions):
+            pending = [(function, -1, 0, None)]
+            while pending:
+                block, parent, depth, owner = pending.pop()
+                block_id = len(self.blocks)
+                if owner is not None:
+                    first_children.setdefault(owner, block_id)
+                self.blocks.append(block)
+                parents.append(parent)
+                depths.append(depth)
+                functions.append(function_id)
+                children = [(child, block_id, depth + 1, (block_id, position))
+                            for position, tile in enumerate(block.tiles) for child in get_child_blocks(tile)]
+                pending.extend(reversed(children))
+        # Lay out the tiles of every block
+        for block_id, block in enumerate(self.blocks):
+            self.block_start.append(len(self.tiles))
+            for position, tile in enumerate(block.tiles):
+                name = tile.name
+                if name not in opcode_ids:
+                    opcode_ids[name] = len(self.opcode_names)
+                    self.opcode_names.append(name)
+                immediate = tuple((attribute, tuple(value) if isinstance(value, list) else value)
+                                  for attribute, value in ((attribute, getattr(tile, attribute, None))
+                                                           for attribute in IMMEDIATE_ATTRIBUTES)
+                                  if value is not None)
+                # Keyed by the representation, so 0.0 and -0.0 are different constants and NaN is equal to itself
+                key = repr(immediate)
+                if immediate and key not in constant_ids:
+                    constant_ids[key] = len(self.constants)
+                    self.constants.append(immediate)
+                self.tiles.append(tile)
+                self.opcodes.append(opcode_ids[name])
+                self.immediates.append(constant_ids[key] if immediate else -1)
+                self.node_block.append(block_id)
+                self.node_child.append(first_children.get((block_id, position), -1))
+            self.block_end.append(len(self.tiles))
+        self.block_tile_arrays = [block.tiles for block in self.blocks]
+        self.block_writes.extend(tiles.writes for tiles in self.block_tile_arrays)
+        self.block_parent.extend(parents)
+        self.block_depth.extend(depths)
+        self.block_function.extend(functions)
+        self.block_type.extend(block.type.value if hasattr(block, "type") else 0 for block in self.blocks)
+        self.function_max_depth.extend([0] * len(self.functions))
+        for depth, function_id in zip(depths, functions):
+            self.function_max_depth[function_id] = max(self.function_max_depth[function_id], depth + 1)
+        self.max_block_depth = max(self.function_max_depth, default=0)
+
+    def __len__(self):
+        return len(self.opcodes)
+
+    def tile_arrays(self) -> List[List["AbstractTile"]]:
+        """
+        Returns the tile arrays of all functions and blocks, in pre-order.
+        """
+        return [block.tiles for block in self.blocks]
+
+    def block_tiles(self, block_id: int) -> List["AbstractTile"]:
+        """
+        Returns the tiles of a block from the arena.
+        """
+        return self.tiles[self.block_start[block_id]:self.block_end[block_id]]
+
+    def all_blocks(self, depth: int = 1) -> List[Tuple["Block", int]]:
+        """
+        Returns all nested blocks with their depth, where blocks directly inside a function body have the given depth.
+        """
+        return [(self.blocks[i], self.block_depth[i] + depth - 1) for i in range(len(self.blocks))
+                if self.block_parent[i] != -1]
+
+    def is_current(self, functions: List["Function"]) -> bool:
+        """
+        Returns if the arena still matches the given functions. The functions and the tile arrays of all blocks must be
+        the same objects, and no tile array may have been written since the arena was built. Blocks are only nested by
+        writing a structured tile to a tile array, so new blocks outdate the arena as well.
+        """
+        if len(functions) != len(self.functions) or not all(a is b for a, b in zip(functions, self.functions)):
+            return False
+        return all(block.tiles is tiles and tiles.writes == writes
+                   for block, tiles, writes in zip(self.blocks, self.block_tile_arrays, self.block_writes))
+
+    def copy(self) -> "ProgramArena":
+        """
+        Returns a copy with its own arrays. Tiles and blocks are shared.
+        """
+        arena = ProgramArena.__new__(ProgramArena)
+        arena.__dict__.update({name: value[:] if isinstance(value, (array, list)) else value
+                               for name, value in self.__dict__.items()})
+        return arena
+
+    def __getstate__(self):
+        # Tiles are classes built at runtime, so only the arrays are serialized
+        state = dict(self.__dict__)
+        state["functions"], state["blocks"], state["tiles"], state["block_tile_arrays"] = [], [], [], []
+        return state
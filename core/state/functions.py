@@ -4,7 +4,9 @@
 import copy
 from enum import Enum
 from typing import List, TYPE_CHECKING, Type, Dict
-from core.formater import indent_code
+from core.formater import CodeBody, render_code_parts
+from core.state.arena import TileArray, get_child_blocks
+from core.state.journal import Journal
 
 if TYPE_CHECKING:
     from core.tile import AbstractTile
@@ -34,7 +36,7 @@ class Block:
         self.index = index
         self.inputs: List[Type[Val]] = []
         self.outputs: List[Type[Val]] = []
-        self.tiles: List["AbstractTile"] = []
+        self.tiles: List["AbstractTile"] = TileArray()
         self.type: BlockType = type
 
     def get_byte_code_size(self):
@@ -56,16 +58,10 @@ class Block:
         return 0.0001
 
     def get_all_tile_arrays(self)->List[List["AbstractTile"]]:
-        tile_arrays = []
-        tile_arrays.append(self.tiles)
+        tile_arrays = [self.tiles]
         for tile in self.tiles:
-            if type(tile).__name__ == "ConditionTile":
-                tile_arrays.extend(tile.if_block.get_all_tile_arrays())
-                tile_arrays.extend(tile.else_block.get_all_tile_arrays())
-            elif type(tile).__name__ == "BlockTile":
-                tile_arrays.extend(tile.block.get_all_tile_arrays())
-            elif type(tile).__name__ == "LoopTile":
-                tile_arrays.extend(tile.inner_block.get_all_tile_arrays())
+            for block in get_child_blocks(tile):
+                tile_arrays.extend(block.get_all_tile_arrays())
         return tile_arrays
 
     def get_max_block_depth(self) -> int:
@@ -74,13 +70,8 @@ class Block:
         """
         max_depth = 0
         for tile in self.tiles:
-            if type(tile).__name__ == "ConditionTile":
-                max_depth = max(max_depth, tile.if_block.get_max_block_depth())
-                max_depth = max(max_depth, tile.else_block.get_max_block_depth())
-            elif type(tile).__name__ == "BlockTile":
-                max_depth = max(max_depth, tile.block.get_max_block_depth())
-            elif type(tile).__name__ == "LoopTile":
-                max_depth = max(max_depth, tile.inner_block.get_max_block_depth())
+            for block in get_child_blocks(tile):
+                max_depth = max(max_depth, block.get_max_block_depth())
         return max_depth + 1
 
     def get_all_blocks(self, depth: int):
@@ -89,37 +80,38 @@ class Block:
         """
         blocks = []
         for tile in self.tiles:
-            if type(tile).__name__ == "ConditionTile":
-                blocks.append((tile.if_block, depth))
-                blocks.append((tile.else_block, depth))
-                blocks.extend(tile.if_block.get_all_blocks(depth+1))
-                blocks.extend(tile.else_block.get_all_blocks(depth+1))
-            elif type(tile).__name__ == "BlockTile":
-                blocks.append((tile.block, depth))
-                blocks.extend(tile.block.get_all_blocks(depth+1))
-            elif type(tile).__name__ == "LoopTile":
-                blocks.append((tile.inner_block, depth))
-                blocks.extend(tile.inner_block.get_all_blocks(depth+1))
+            for block in get_child_blocks(tile):
+                blocks.append((block, depth))
+                blocks.extend(block.get_all_blocks(depth + 1))
         return blocks
 
     def generate_code(self, current_state: "GlobalState", current_function: "Function", current_blocks: List["Block"]) -> str:
         """
         Generates the code of the block.
         """
-        result_str = (f"block" if self.name not in ["if", "else"] else f"{self.name}")
+        return render_code_parts(self.generate_code_parts(current_state, current_function, current_blocks),
+                                 current_state, current_function, current_blocks)
+
+    def generate_code_parts(self, current_state: "GlobalState", current_function: "Function",
+                            current_blocks: List["Block"]) -> list:
+        """
+        Returns the code of the block as lines and a body with its tiles, see core.formater.CodeWriter. The last line
+        is empty, an if block ends with the line its else block starts.
+        """
+        header = (f"block" if self.name not in ["if", "else"] else f"{self.name}")
         # Add inputs
         if self.inputs and self.name not in ["else"]:
-            result_str += f" (param {' '.join(input_type.get_wasm_type() for input_type in self.inputs)})"
+            header += f" (param {' '.join(input_type.get_wasm_type() for input_type in self.inputs)})"
         # Add outputs
         if self.outputs and self.name not in ["else"]:
-            result_str += f" (result {' '.join(output_type.get_wasm_type() for output_type in self.outputs)})"
-        result_str += "\n"
+            header += f" (result {' '.join(output_type.get_wasm_type() for output_type in self.outputs)})"
+        parts = [header]
         if self.tiles:
-            result_str += indent_code(("\n").join(tile.generate_code(current_state, current_function,current_blocks+[self]) for tile in self.tiles))
-            result_str += "\n"
+            parts.append(CodeBody(self.tiles, current_blocks + [self]))
         if self.name not in ["if"]:
-            result_str += "end\n"
-        return result_str
+            parts.append("end")
+        parts.append("")
+        return parts
 
 
 class Function:
@@ -133,7 +125,7 @@ class Function:
         self.inputs = inputs
         self.outputs = outputs
         self.is_external = is_external
-        self.tiles: List["AbstractTile"] = []
+        self.tiles: List["AbstractTile"] = TileArray()
         self.local_types: List[Type[Val]] = []
         self.blocks: List[Block] = []
         self.checkpoints = {}
@@ -157,16 +149,10 @@ class Function:
         """
         Returns all tiles of this and all contained blocks in the function.
         """
-        tile_arrays = []
-        tile_arrays.append(self.tiles)
+        tile_arrays = [self.tiles]
         for tile in self.tiles:
-            if type(tile).__name__ == "ConditionTile":
-                tile_arrays.extend(tile.if_block.get_all_tile_arrays())
-                tile_arrays.extend(tile.else_block.get_all_tile_arrays())
-            elif type(tile).__name__ == "BlockTile":
-                tile_arrays.extend(tile.block.get_all_tile_arrays())
-            elif type(tile).__name__ == "LoopTile":
-                tile_arrays.extend(tile.inner_block.get_all_tile_arrays())
+            for block in get_child_blocks(tile):
+                tile_arrays.extend(block.get_all_tile_arrays())
         return tile_arrays
 
     def get_max_block_depth(self) -> int:
@@ -175,13 +161,8 @@ class Function:
         """
         max_depth = 0
         for tile in self.tiles:
-            if type(tile).__name__ == "ConditionTile":
-                max_depth = max(max_depth, tile.if_block.get_max_block_depth())
-                max_depth = max(max_depth, tile.else_block.get_max_block_depth())
-            elif type(tile).__name__ == "BlockTile":
-                max_depth = max(max_depth, tile.block.get_max_block_depth())
-            elif type(tile).__name__ == "LoopTile":
-                max_depth = max(max_depth, tile.inner_block.get_max_block_depth())
+            for block in get_child_blocks(tile):
+                max_depth = max(max_depth, block.get_max_block_depth())
         return max_depth + 1
 
     def get_all_blocks(self, depth: int):
@@ -190,17 +171,9 @@ class Function:
         """
         blocks = []
         for tile in self.tiles:
-            if type(tile).__name__ == "ConditionTile":
-                blocks.append((tile.if_block, depth))
-                blocks.append((tile.else_block, depth))
-                blocks.extend(tile.if_block.get_all_blocks(depth+1))
-                blocks.extend(tile.else_block.get_all_blocks(depth+1))
-            elif type(tile).__name__ == "BlockTile":
-                blocks.append((tile.block, depth))
-                blocks.extend(tile.block.get_all_blocks(depth+1))
-            elif type(tile).__name__ == "LoopTile":
-                blocks.append((tile.inner_block, depth))
-                blocks.extend(tile.inner_block.get_all_blocks(depth+1))
+            for block in get_child_blocks(tile):
+                blocks.append((block, depth))
+                blocks.extend(block.get_all_blocks(depth + 1))
         return blocks
 
     def restore_checkpoint(self, checkpoint_id, delete=False):
@@ -208,7 +181,7 @@ class Function:
         self.name = copy.deepcopy(checkpoint["name"])
         self.inputs = copy.deepcopy(checkpoint["inputs"])
         self.outputs = copy.deepcopy(checkpoint["outputs"])
-        self.tiles = copy.deepcopy(checkpoint["tiles"])
+        self.tiles = TileArray(copy.deepcopy(checkpoint["tiles"]))
         self.local_types = copy.deepcopy(checkpoint["local_types"])
         self.blocks = copy.deepcopy(checkpoint["blocks"])
         if delete:
@@ -254,30 +227,42 @@ class Function:
             result_str += "))\n"
             return result_str
         else:
-            result_str = f"(func ${self.name} (export \"{self.name}\")"
-            if self.inputs:
-                result_str += f" (param {' '.join(input_type.get_wasm_type() for input_type in self.inputs)})"
-            if self.outputs:
-                result_str += f" (result {' '.join(output_type.get_wasm_type() for output_type in self.outputs)})"
-            result_str += "\n"
-            if self.local_types[len(self.inputs):]:
-                result_str += indent_code("(local " + " ".join(
-                    local_type.get_wasm_type() for local_type in self.local_types[len(self.inputs):]) + ")\n")
-            result_str += indent_code("(local $temp i32)\n")
-            result_str += indent_code("\n".join(tile.generate_code(current_state, current_function,[]) for tile in self.tiles))
-            result_str += "\n"
-            result_str += ")\n"
-            return result_str
+            return render_code_parts(self.generate_code_parts(current_state), current_state, current_function, []) + "\n"
+
+    def generate_code_parts(self, current_state: "GlobalState") -> list:
+        """
+        Returns the code of an internal function as lines and a body with its locals and tiles, see
+        core.formater.CodeWriter.
+        """
+        header = f"(func ${self.name} (export \"{self.name}\")"
+        if self.inputs:
+            header += f" (param {' '.join(input_type.get_wasm_type() for input_type in self.inputs)})"
+        if self.outputs:
+            header += f" (result {' '.join(output_type.get_wasm_type() for output_type in self.outputs)})"
+        body = []
+        if self.local_types[len(self.inputs):]:
+            body.append("(local " + " ".join(
+                local_type.get_wasm_type() for local_type in self.local_types[len(self.inputs):]) + ")")
+        body.append("(local $temp i32)")
+        body.extend(self.tiles)
+        return [header, CodeBody(body, []), ")"]
 
 
 class Functions:
     """
     A simple function state that stores functions.
     """
+    journal: Journal | None = None
+
     def __init__(self):
         self.functions: Dict[str, Function] = {}
 
     def set(self, value: Function):
+        if self.journal is not None:
+            if value.name in self.functions:
+                self.journal.record(self.functions.__setitem__, value.name, self.functions[value.name])
+            else:
+                self.journal.record(self.functions.pop, value.name)
         self.functions[value.name] = value
 
     def get(self, name):
@@ -2,6 +2,7 @@
 # SPDX-FileCopyrightText: 2025 Siemens AG
 
 from typing import List, Type, Dict
+from core.state.journal import Journal
 from core.value import Val
 
 class ExtFunction:
@@ -32,11 +33,17 @@ class ExtFunctions:
     """
     A simple container that stores external functions.
     """
+    journal: Journal | None = None
 
     def __init__(self):
         self.functions: Dict[str, ExtFunction] = {}
 
     def set(self, value: ExtFunction):
+        if self.journal is not None:
+            if value.name in self.functions:
+                self.journal.record(self.functions.__setitem__, value.name, self.functions[value.name])
+            else:
+                self.journal.record(self.functions.pop, value.name)
         self.functions[value.name] = value
 
     def get(self, name):
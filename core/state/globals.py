@@ -3,6 +3,7 @@
 
 from copy import deepcopy
 from typing import List
+from core.state.journal import Journal
 from core.value import Val
 
 
@@ -27,6 +28,7 @@ class Globals:
     """
     A simple global state that stores global variables.
     """
+    journal: Journal | None = None
 
     def __init__(self):
         self.globals : List[Global] = []
@@ -36,8 +38,19 @@ class Globals:
         Adds a global variable to the state and returns the index.
         """
         self.globals.append(value)
+        if self.journal is not None:
+            self.journal.record(self.globals.pop)
         return len(self.globals) - 1
 
+    def set_value(self, name: str, value: Val):
+        """
+        Sets the value of the global variable with the given name.
+        """
+        global_var = self.get_global_by_name(name)
+        if self.journal is not None:
+            self.journal.record(setattr, global_var, "value", global_var.value)
+        global_var.value = value
+
     def __len__(self):
         return len(self.globals)
 
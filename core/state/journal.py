@@ -0,0 +1,54 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+from typing import Callable, List, Tuple
+
+
+class Journal:
+    """
+    An undo log for speculative execution. While a speculation is active, state objects record how to revert each of
+    their writes, so a speculative run can be rolled back by replaying only the logged writes in reverse order.
+    Speculations can be nested, every rollback only reverts the writes done after its own mark. Checkpoints of a
+    global state are speculations that last until they are deleted.
+    """
+
+    def __init__(self):
+        self.entries: List[Tuple[Callable, tuple]] = []
+        self.depth = 0
+
+    def begin(self) -> int:
+        """
+        Starts a (possibly nested) speculation and returns the mark to roll back to.
+        """
+        self.depth += 1
+        return len(self.entries)
+
+    def record(self, undo: Callable, *args):
+        """
+        Records how to revert a write. Does nothing if no speculation is active.
+        """
+        if self.depth:
+            self.entries.append((undo, args))
+
+    def rollback(self, mark: int):
+        """
+        Reverts all writes recorded after the given mark and ends the speculation.
+        """
+        entries = self.entries
+        while len(entries) > mark:
+            undo, args = entries.pop()
+            undo(*args)
+        self.depth -= 1
+
+    def commit(self):
+        """
+        Ends a speculation and keeps its writes. An enclosing speculation can still revert them, the log is only
+        cleared once no speculation is active anymore.
+        """
+        self.depth -= 1
+        if not self.depth:
+            self.entries.clear()
+
+    def __deepcopy__(self, memo):
+        # Copies of single sub-states keep recording into the journal of their global state
+        return self
@@ -2,6 +2,7 @@
 # SPDX-FileCopyrightText: 2025 Siemens AG
 
 from typing import List
+from core.state.journal import Journal
 from core.value import Val
 
 
@@ -9,6 +10,7 @@ class Locals:
     """
     A simple local state that stores local variables.
     """
+    journal: Journal | None = None
 
     def __init__(self):
         self.locals: List[Val] = []
@@ -20,11 +22,15 @@ class Locals:
         if not isinstance(local, Val):
             raise ValueError("Local is not of type Val")
         self.locals.append(local)
+        if self.journal is not None:
+            self.journal.record(self.locals.pop)
         return len(self.locals) - 1
 
     def __setitem__(self, key, value):
         if not isinstance(value, Val):
             raise ValueError("Local is not of type Val")
+        if self.journal is not None:
+            self.journal.record(self.locals.__setitem__, key, self.locals[key])
         self.locals[key] = value
 
     def __getitem__(self, item):
@@ -3,174 +3,173 @@
 
 import random
 import struct
-import numpy as np
+from functools import lru_cache
 from core.config.config import MEMORY_MAX_WRITE_INDEX
+from core.state.journal import Journal
+
+# Precompiled little-endian codecs for the typed loads and stores
+U8 = struct.Struct('<B')
+S8 = struct.Struct('<b')
+U16 = struct.Struct('<H')
+S16 = struct.Struct('<h')
+U32 = struct.Struct('<I')
+S32 = struct.Struct('<i')
+U64 = struct.Struct('<Q')
+F32 = struct.Struct('<f')
+F64 = struct.Struct('<d')
+
+
+@lru_cache(maxsize=None)
+def blank_image(size: int) -> bytes:
+    """
+    Returns a shared, zero initialized memory image of the given size.
+    """
+    return bytes(size)
 
 
 class Memory:
     """
     A simple memory model that supports load and store operations for various data types.
+
+    Only the first MEMORY_MAX_WRITE_INDEX bytes can be written, so only this window is stored per memory. The rest of
+    the page always equals the read-only initial image, which is shared between all copies. Loads return plain Python
+    values.
     """
+    journal: Journal | None = None
 
     def __init__(self, initial=1, maximum=1, index=0, default_page_size=65536):
         self.size = initial
         self.initial = initial
         self.maximum = maximum
-        self.memory = bytearray(self.size * default_page_size)
         self.index = index
-        self.initial_values = bytearray(self.memory)
+        self.initial_values: bytes = blank_image(self.size * default_page_size)
+        self.window = bytearray(self.initial_values[:MEMORY_MAX_WRITE_INDEX])
 
-    def i32_store(self, offset, value):
-        if offset < 0 or offset+4 > MEMORY_MAX_WRITE_INDEX:
-            raise ValueError("Memory index out of bounds")
-        struct.pack_into('<I', self.memory, offset, value & 0xFFFFFFFF)  # Store as unsigned 32-bit
+    @property
+    def memory(self) -> bytes:
+        """
+        Returns the content of the whole page.
+        """
+        return bytes(self.window) + self.initial_values[MEMORY_MAX_WRITE_INDEX:]
 
-    def i32_store8(self, offset, value):
-        if offset < 0 or offset >= MEMORY_MAX_WRITE_INDEX:
-            raise ValueError("Memory index out of bounds")
-        struct.pack_into('<B', self.memory, offset, value & 0xFF)
+    @memory.setter
+    def memory(self, value):
+        self.window = bytearray(value[:MEMORY_MAX_WRITE_INDEX])
 
-    def i32_store16(self, offset, value):
-        if offset < 0 or offset + 2 > MEMORY_MAX_WRITE_INDEX:
-            raise ValueError("Memory index out of bounds")
-        struct.pack_into('<H', self.memory, offset, value & 0xFFFF)
+    def _record_write(self, offset, size):
+        """
+        Records the bytes that are about to be overwritten, so the write can be undone.
+        """
+        if self.journal is not None:
+            self.journal.record(self.window.__setitem__, slice(offset, offset + size), self.window[offset:offset + size])
 
-    def i32_load(self, offset):
-        if offset < 0 or offset + 4 > MEMORY_MAX_WRITE_INDEX:
-            raise IndexError("Offset out of bounds")
-        return np.uint32(struct.unpack_from('<I', self.memory, offset)[0])  # Load as unsigned 32-bit
+    def _store(self, codec: struct.Struct, offset, value):
+        if offset < 0 or offset + codec.size > MEMORY_MAX_WRITE_INDEX:
+            raise ValueError("Memory index out of bounds")
+        self._record_write(offset, codec.size)
+        codec.pack_into(self.window, offset, value)
 
-    def i32_load8_s(self, offset):
-        if offset < 0 or offset >= MEMORY_MAX_WRITE_INDEX:
+    def _load(self, codec: struct.Struct, offset):
+        if offset < 0 or offset + codec.size > MEMORY_MAX_WRITE_INDEX:
             raise IndexError(f"Offset out of bounds {offset}")
-        value, = struct.unpack_from('<b', self.memory, offset)  # Load one byte and sign-extend
-        return np.int32(value)
-
-    def i32_load8_u(self, offset):
-        if offset < 0 or offset >= MEMORY_MAX_WRITE_INDEX:
-            raise IndexError("Offset out of bounds")
-        value, = struct.unpack_from('<B', self.memory, offset)  # Load one byte and zero-extend
-        return np.uint32(value)
-
-    def i32_load16_s(self, offset):
-        if offset < 0 or offset + 2 > MEMORY_MAX_WRITE_INDEX:
-            raise IndexError("Offset out of bounds")
-        value, = struct.unpack_from('<h', self.memory, offset)  # Load two bytes and sign-extend
-        return np.int32(value)
-
-    def i32_load16_u(self, offset):
-        if offset < 0 or offset + 2 > MEMORY_MAX_WRITE_INDEX:
-            raise IndexError("Offset out of bounds")
-        value, = struct.unpack_from('<H', self.memory, offset)  # Load two bytes and zero-extend
-        return np.uint32(value)
+        return codec.unpack_from(self.window, offset)[0]
 
-    def i64_store(self, offset, value):
-        if offset < 0 or offset+8 > MEMORY_MAX_WRITE_INDEX:
-            raise ValueError("Memory index out of bounds")
-        struct.pack_into('<Q', self.memory, offset, value & 0xFFFFFFFFFFFFFFFF)
+    def i32_store(self, offset, value):
+        self._store(U32, offset, value & 0xFFFFFFFF)  # Store as unsigned 32-bit
 
-    def i64_store8(self, offset, value):
-        if offset < 0 or offset >= MEMORY_MAX_WRITE_INDEX:
-            raise ValueError("Memory index out of bounds")
-        struct.pack_into('<B', self.memory, offset, value & 0xFF)
+    def i32_store8(self, offset, value):
+        self._store(U8, offset, value & 0xFF)
 
-    def i64_store16(self, offset, value):
-        if offset < 0 or offset + 2 > MEMORY_MAX_WRITE_INDEX:
-            raise ValueError("Memory index out of bounds")
-        struct.pack_into('<H', self.memory, offset, value & 0xFFFF)
+    def i32_store16(self, offset, value):
+        self._store(U16, offset, value & 0xFFFF)
 
-    def i64_store32(self, offset, value):
-        if offset < 0 or offset + 4 > MEMORY_MAX_WRITE_INDEX:
-            raise ValueError("Memory index out of bounds")
-        struct.pack_into('<I', self.memory, offset, value & 0xFFFFFFFF)
+    def i32_load(self, offset) -> int:
+        return self._load(U32, offset)  # Load as unsigned 32-bit
+
+    def i32_load8_s(self, offset) -> int:
+        return self._load(S8, offset)  # Load one byte and sign-extend
+
+    def i32_load8_u(self, offset) -> int:
+        return self._load(U8, offset)  # Load one byte and zero-extend
 
-    def i64_load(self, offset):
-        if offset < 0 or offset + 8 > MEMORY_MAX_WRITE_INDEX:
-            raise IndexError("Offset out of bounds")
-        return np.uint64(struct.unpack_from('<Q', self.memory, offset)[0])
+    def i32_load16_s(self, offset) -> int:
+        return self._load(S16, offset)  # Load two bytes and sign-extend
 
-    def i64_load8_s(self, offset):
-        if offset < 0 or offset >= MEMORY_MAX_WRITE_INDEX:
-            raise IndexError("Offset out of bounds")
-        value, = struct.unpack_from('<b', self.memory, offset)
+    def i32_load16_u(self, offset) -> int:
+        return self._load(U16, offset)  # Load two bytes and zero-extend
 
-        return np.int64(value)
+    def i64_store(self, offset, value):
+        self._store(U64, offset, value & 0xFFFFFFFFFFFFFFFF)
 
-    def i64_load8_u(self, offset):
-        if offset < 0 or offset >= MEMORY_MAX_WRITE_INDEX:
-            raise IndexError("Offset out of bounds")
-        value, = struct.unpack_from('<B', self.memory, offset)
+    def i64_store8(self, offset, value):
+        self._store(U8, offset, value & 0xFF)
 
-        return np.uint64(value)
+    def i64_store16(self, offset, value):
+        self._store(U16, offset, value & 0xFFFF)
 
-    def i64_load16_s(self, offset):
-        if offset < 0 or offset + 2 > MEMORY_MAX_WRITE_INDEX:
-            raise IndexError("Offset out of bounds")
-        value, = struct.unpack_from('<h', self.memory, offset)
+    def i64_store32(self, offset, value):
+        self._store(U32, offset, value & 0xFFFFFFFF)
 
-        return np.int64(value)
+    def i64_load(self, offset) -> int:
+        return self._load(U64, offset)
 
-    def i64_load16_u(self, offset):
-        if offset < 0 or offset + 2 > MEMORY_MAX_WRITE_INDEX:
-            raise IndexError("Offset out of bounds")
-        value, = struct.unpack_from('<H', self.memory, offset)
+    def i64_load8_s(self, offset) -> int:
+        return self._load(S8, offset)
 
-        return np.uint64(value)
+    def i64_load8_u(self, offset) -> int:
+        return self._load(U8, offset)
 
-    def i64_load32_s(self, offset):
-        if offset < 0 or offset + 4 > MEMORY_MAX_WRITE_INDEX:
-            raise IndexError("Offset out of bounds")
-        value, = struct.unpack_from('<i', self.memory, offset)
+    def i64_load16_s(self, offset) -> int:
+        return self._load(S16, offset)
 
-        return np.int64(value)
+    def i64_load16_u(self, offset) -> int:
+        return self._load(U16, offset)
 
-    def i64_load32_u(self, offset):
-        if offset < 0 or offset + 4 > MEMORY_MAX_WRITE_INDEX:
-            raise IndexError("Offset out of bounds")
-        value, = struct.unpack_from('<I', self.memory, offset)
+    def i64_load32_s(self, offset) -> int:
+        return self._load(S32, offset)
 
-        return np.uint64(value)
+    def i64_load32_u(self, offset) -> int:
+        return self._load(U32, offset)
 
     def f32_store(self, offset, value):
-        if offset < 0 or offset+4 > MEMORY_MAX_WRITE_INDEX:
-            raise ValueError("Memory index out of bounds")
-        struct.pack_into('<f', self.memory, offset, value)
+        self._store(F32, offset, value)
 
-    def f32_load(self, offset):
-        if offset < 0 or offset+4 > MEMORY_MAX_WRITE_INDEX:
-            raise IndexError("Offset out of bounds")
-        return np.float32(struct.unpack_from('<f', self.memory, offset)[0])
+    def f32_load(self, offset) -> float:
+        return self._load(F32, offset)
 
     def f64_store(self, offset, value):
-        if offset < 0 or offset+8 > MEMORY_MAX_WRITE_INDEX:
-            raise ValueError("Memory index out of bounds")
-        struct.pack_into('<d', self.memory, offset, value)
-
-    def f64_load(self, offset):
-        if offset < 0 or offset+8 > MEMORY_MAX_WRITE_INDEX:
-            raise IndexError("Offset out of bounds")
-        return np.float64(struct.unpack_from('<d', self.memory, offset)[0])
+        self._store(F64, offset, value)
 
+    def f64_load(self, offset) -> float:
+        return self._load(F64, offset)
 
     def __getitem__(self, index):
+        if isinstance(index, int) and 0 <= index < MEMORY_MAX_WRITE_INDEX:
+            return self.window[index]
         return self.memory[index]
 
     def __setitem__(self, index, value):
-        self.memory[index] = value
+        if self.journal is not None:
+            self.journal.record(self.window.__setitem__, index, self.window[index])
+        self.window[index] = value
 
     def __str__(self):
         """
         Return a string representation of the memory. First MEMORY_MAX_WRITE_INDEX bytes are shown as hex values. 64 bytes per line.
         """
         BYTES_PER_ROW = 32
-        return "\n".join([f"{i:04x}: {' '.join([f'{self.memory[i + j]:02x}' for j in range(BYTES_PER_ROW)])}" for i in
+        return "\n".join([f"{i:04x}: {' '.join([f'{self[i + j]:02x}' for j in range(BYTES_PER_ROW)])}" for i in
                           range(0, MEMORY_MAX_WRITE_INDEX, BYTES_PER_ROW)])
 
     def randomize(self):
-        self.memory = bytearray(random.choices(range(256), k=len(self.memory)))
+        """
+        Replaces the initial image with random bytes and re-initializes the memory to it.
+        """
+        self.initial_values = bytes(random.choices(range(256), k=len(self.initial_values)))
+        self.reinit_memory()
 
     def reinit_memory(self):
         """
         Re-initializes the memory to its initial values.
         """
-        self.memory = bytearray(self.initial_values)
+        self.window = bytearray(self.initial_values[:MEMORY_MAX_WRITE_INDEX])
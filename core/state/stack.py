@@ -1,8 +1,9 @@
 # SPDX-License-Identifier: MIT
 # SPDX-FileCopyrightText: 2025 Siemens AG
 
-from typing import List
+from typing import List, Tuple, Type
 from core.config.config import MAX_FUNCTION_CALL_DEPTH, MAX_STACK_SIZE
+from core.state.journal import Journal
 from core.state.locals import Locals
 from core.value import Val
 
@@ -20,20 +21,25 @@ class StackOverflowError(Exception):
 
 class StackFrame:
     """
-    A simple stack frame representation.
+    A simple stack frame representation. Next to the values, the frame keeps the types of the values in a parallel
+    list, so type checks on the top of the stack do not need to touch the values.
     """
+    journal: Journal | None = None
 
-    def __init__(self, params: List[Val] = None, stack: List[Val] = None, name=None):
+    def __init__(self, params: List[Val] = None, stack: List[Val] = None, name=None, journal: Journal = None):
+        self.journal = journal
         self.locals = Locals()
+        self.locals.journal = journal
         self.name = name
         self.stack: List[Val] = []
+        self.types: List[Type[Val]] = []
         if params:
             for param in params:
                 self.locals.add(param)
 
         if stack:
-            for val in stack:
-                self.stack.append(val)
+            self.stack.extend(stack)
+            self.types.extend(map(type, stack))
 
     def stack_push(self, value: Val):
         if not isinstance(value, Val):
@@ -41,21 +47,59 @@ class StackFrame:
         if MAX_STACK_SIZE < len(self.stack):
             raise StackOverflowError("Stack size limit reached")
         self.stack.append(value)
+        self.types.append(type(value))
+        if self.journal is not None:
+            self.journal.record(self._truncate, 1)
 
     def can_push_to_stack(self, n: int = 1):
         return MAX_STACK_SIZE >= len(self.stack) + n
 
     def stack_pop(self):
-        return self.stack.pop()
+        value = self.stack.pop()
+        self.types.pop()
+        if self.journal is not None:
+            self.journal.record(self._extend, (value,))
+        return value
 
     def stack_peek(self, n=1):
         return self.stack[-n]
 
     def stack_pop_n_in_order(self, n):
-        return [self.stack.pop() for _ in range(n)][::-1]
+        start = len(self.stack) - n
+        if start < 0:
+            raise IndexError("pop from empty stack")
+        values = self.stack[start:]
+        del self.stack[start:]
+        del self.types[start:]
+        if self.journal is not None:
+            self.journal.record(self._extend, values)
+        return values
 
     def stack_peek_n_in_order(self, n):
-        return [self.stack[-i] for i in range(1, n + 1)][::-1]
+        if n > len(self.stack):
+            raise IndexError("peek beyond the bottom of the stack")
+        return self.stack[len(self.stack) - n:]
+
+    def top_types(self, n: int) -> Tuple[Type[Val], ...]:
+        """
+        Returns the types of the top n values in stack order. Expects at least n values on the stack.
+        """
+        return tuple(self.types[len(self.types) - n:])
+
+    def top_types_match(self, types: Tuple[Type[Val], ...]) -> bool:
+        """
+        Checks if the top values have exactly the given types, the last type being the topmost value.
+        """
+        return len(types) <= len(self.types) and self.top_types(len(types)) == types
+
+    def _truncate(self, n: int):
+        start = len(self.stack) - n
+        del self.stack[start:]
+        del self.types[start:]
+
+    def _extend(self, values):
+        self.stack.extend(values)
+        self.types.extend(map(type, values))
 
     def __str__(self):
         """
@@ -70,6 +114,7 @@ class Stack:
     """
     A simple global stack representation.
     """
+    journal: Journal | None = None
 
     def __init__(self):
         self.stack_frames: List[StackFrame] = []
@@ -104,10 +149,15 @@ class Stack:
         """
         if not self.can_add_new_stack_frame():
             raise ValueError("Cannot add new stack frame, limit reached.")
-        self.stack_frames.append(StackFrame(params, stack, name=name))
+        self.stack_frames.append(StackFrame(params, stack, name=name, journal=self.journal))
+        if self.journal is not None:
+            self.journal.record(self.stack_frames.pop)
 
     def pop_frame(self):
         """
         Pops the current stack frame from the stack.
         """
-        return self.stack_frames.pop()
+        frame = self.stack_frames.pop()
+        if self.journal is not None:
+            self.journal.record(self.stack_frames.append, frame)
+        return frame
@@ -3,11 +3,15 @@
 
 import copy
 from typing import TypeVar, List, TYPE_CHECKING, Tuple
+from core.config.config import GENERATION_RETRY_BUDGET
 from core.constraints import Constraints
+from core.hooks import ExecutionHooks
+from core.state.arena import ProgramArena
 from core.state.functions import Functions
 from core.state.functions import Block
 from core.state.functions_ext import ExtFunctions
 from core.state.globals import Globals
+from core.state.journal import Journal
 from core.state.memory import Memory
 from core.state.stack import Stack
 from core.state.tables import Tables
@@ -16,11 +20,23 @@ if TYPE_CHECKING:
 T = TypeVar('T')
 
 
+# Sub-states that are restored by checkpoints and speculations
+CHECKPOINT_FIELDS = ("globals", "functions", "memory", "tables", "stack", "ext_functions", "constraints",
+                     "canary_output")
+
+
 class GlobalState:
     """
     Combines multiple states like stack, memory, and locals into one global state.
+
+    All sub-states record how to undo their writes into a shared journal. A checkpoint is a mark in that journal, so
+    creating one copies nothing and restoring one only undoes the writes done since. Sub-states are restored in place,
+    so references to them stay valid across checkpoints. A sub-state that was replaced by an assignment after the
+    checkpoint is switched back to the previous object on restore, references to the replacement have to be fetched
+    again. Short-lived speculative runs use the same journal, see begin_speculation and rollback_speculation.
     """
     def __init__(self):
+        # Journal marks by checkpoint id
         self.checkpoints = {}
         self.globals = Globals()
         self.tables = Tables()
@@ -30,74 +46,114 @@ class GlobalState:
         self.constraints = Constraints()
         self.ext_functions = ExtFunctions()
         self.canary_output = []
+        # Results of function call simulations, see can_place_function
+        self.feasibility_cache = {}
+        # How often a failed nested block or function may still be regenerated, see apply_tile_with_backtracking
+        self.retry_budget = GENERATION_RETRY_BUDGET
+        # Callbacks around applied tiles, None for the plain path, see core.hooks
+        self.hooks: ExecutionHooks | None = None
+        # The last emitted program and its version, see global_state_to_wat_program
+        self.wat_cache: Tuple[tuple, str] | None = None
+        # The last encoded binary module and its version, see global_state_to_wasm
+        self.wasm_cache: Tuple[tuple, bytes] | None = None
+        self.journal = Journal()
+        self._arena: ProgramArena | None = None
+        for sub_state in (self.globals, self.tables, self.functions, self.memory, self.stack, self.constraints,
+                          self.ext_functions):
+            sub_state.journal = self.journal
+
+    def __deepcopy__(self, memo):
+        # A copied state gets its own journal, while copies of single sub-states keep sharing it
+        memo[id(self.journal)] = Journal()
+        # The arena of the copy is rebuilt on demand
+        memo[id(self._arena)] = None
+        # Copies made while hooks are subscribed, e.g. for simulations, call the same subscribers
+        memo[id(self.hooks)] = self.hooks
+        state_copy = type(self).__new__(type(self))
+        memo[id(self)] = state_copy
+        state_copy.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        # The checkpoints are marks in the journal of this state, so they can not be restored in the copy
+        state_copy.checkpoints = {}
+        return state_copy
+
+    def __setattr__(self, name, value):
+        # Replacing a sub-state is a write as well, restoring a checkpoint switches back to the previous one
+        if name in CHECKPOINT_FIELDS and name in self.__dict__:
+            self.journal.record(object.__setattr__, self, name, self.__dict__[name])
+        object.__setattr__(self, name, value)
+
+    def get_arena(self) -> ProgramArena:
+        """
+        Returns the flat arena of all functions. The arena is cached until the functions or their tile arrays change.
+        """
+        functions = list(self.functions.functions.values())
+        if self._arena is None or not self._arena.is_current(functions):
+            self._arena = ProgramArena(functions)
+        return self._arena
 
     def get_all_tile_arrays(self)->List[List["AbstractTile"]]:
         """
         Returns a set of all tile arrays. E.g. used for postprocessing.
         """
-        tile_arrays = []
-        for function in self.functions.functions.values():
-            tile_arrays.extend(function.get_all_tile_arrays())
-        return tile_arrays
+        return self.get_arena().tile_arrays()
 
     def get_max_block_depth(self) -> int:
         """
         Returns the maximum block depth of the current state.
         """
-        max_depth = 0
-        for function in self.functions.functions.values():
-            depth = function.get_max_block_depth()
-            if depth > max_depth:
-                max_depth = depth
-        return max_depth
+        return self.get_arena().max_block_depth
 
     def get_all_blocks(self)->List[Tuple[Block, int]]:
         """
         Returns all blocks and their depth in the current state.
         """
-        blocks = []
-        for function in self.functions.functions.values():
-            blocks.extend(function.get_all_blocks(1))
-        return blocks
+        return self.get_arena().all_blocks()
 
+    def begin_speculation(self) -> int:
+        """
+        Starts recording all writes to the state and returns a mark. Rolling back to the mark only replays the writes
+        done in between, so the cost scales with the speculative work and not with the size of the state.
+        """
+        mark = self.journal.begin()
+        self.journal.record(self.canary_output.__delitem__, slice(len(self.canary_output), None))
+        return mark
+
+    def rollback_speculation(self, mark: int):
+        """
+        Reverts all writes since the given mark.
+        """
+        self.journal.rollback(mark)
 
     def create_checkpoint(self) -> int:
         """
-        Creates a checkpoint of the current state and returns the id of the checkpoint.
+        Creates a checkpoint of the current state and returns the id of the checkpoint. This is O(1), from now on the
+        writes to the state are journaled until the checkpoint is deleted.
         """
         i = 0
         while i in self.checkpoints:
             i += 1
-        self.checkpoints[i] = copy.deepcopy({"globals": self.globals,
-                                             "functions": self.functions,
-                                             "memory": self.memory,
-                                             "tables": self.tables,
-                                             "stack": self.stack,
-                                             "ext_functions": self.ext_functions,
-                                             "constraints": self.constraints,
-                                             "canary_output": self.canary_output,
-                                                })
-
+        self.checkpoints[i] = self.begin_speculation()
         return i
 
     def restore_checkpoint(self, i: int, delete=False):
         """
-        Restores the state to the state of the checkpoint with the given id.
+        Restores the state to the state of the checkpoint with the given id by undoing all writes since. Checkpoints
+        created after it are deleted, as the writes they would restore are undone.
         """
-        self.globals = copy.deepcopy(self.checkpoints[i]["globals"])
-        self.functions = copy.deepcopy(self.checkpoints[i]["functions"])
-        self.memory = copy.deepcopy(self.checkpoints[i]["memory"])
-        self.tables = copy.deepcopy(self.checkpoints[i]["tables"])
-        self.stack = copy.deepcopy(self.checkpoints[i]["stack"])
-        self.ext_functions = copy.deepcopy(self.checkpoints[i]["ext_functions"])
-        self.constraints = copy.deepcopy(self.checkpoints[i]["constraints"])
-        self.canary_output = copy.deepcopy(self.checkpoints[i]["canary_output"])
+        mark = self.checkpoints[i]
+        # Every checkpoint journals an entry when it is created, so later checkpoints have larger marks
+        for later in [j for j, later_mark in self.checkpoints.items() if later_mark > mark]:
+            del self.checkpoints[later]
+            self.journal.commit()
+        self.rollback_speculation(mark)
         if delete:
             del self.checkpoints[i]
+        else:
+            self.checkpoints[i] = self.begin_speculation()
 
     def delete_checkpoint(self, i: int):
         """
-        Deletes the checkpoint with the given id.
+        Deletes the checkpoint with the given id and keeps all writes since.
         """
         del self.checkpoints[i]
-
+        self.journal.commit()
@@ -2,6 +2,7 @@
 # SPDX-FileCopyrightText: 2025 Siemens AG
 
 from typing import Dict, List, Type
+from core.state.journal import Journal
 from core.value import Ref, RefFunc
 
 
@@ -30,13 +31,28 @@ class Tables:
     """
     A simple table state that stores all tables.
     """
+    journal: Journal | None = None
 
     def __init__(self):
         self.tables: Dict[str, Table] = {}
 
     def set(self, value: Table):
+        if self.journal is not None:
+            if value.name in self.tables:
+                self.journal.record(self.tables.__setitem__, value.name, self.tables[value.name])
+            else:
+                self.journal.record(self.tables.pop, value.name)
         self.tables[value.name] = value
 
+    def set_element(self, name: str, index: int, value: Ref):
+        """
+        Sets the element at the given index of the table with the given name.
+        """
+        elements = self.tables[name].elements
+        if self.journal is not None:
+            self.journal.record(elements.__setitem__, index, elements[index])
+        elements[index] = value
+
     def get_sorted_by_index(self)-> List[Table]:
         return sorted(self.tables.values(), key=lambda x: x.index)
 
@@ -90,8 +90,16 @@ class RandomSelectionStrategy(AbstractSelectionStrategy):
             selectable_tiles.append(tile)
 
         #Select random tile
-        if selectable_tiles:
-            selected_tile = random.choice(selectable_tiles)
-            return selected_tile
-        else:
-            raise Exception("No tile selected")
\ No newline at end of file
+        if not selectable_tiles:
+            raise Exception("No tile selected")
+        total_weight = sum(tile.selection_weight for tile in selectable_tiles)
+        if total_weight == len(selectable_tiles):
+            return random.choice(selectable_tiles)
+        # Same draw as choosing from a list with every tile repeated by its weight
+        position = random.randrange(total_weight)
+        for tile in selectable_tiles:
+            if position < tile.selection_weight:
+                if tile.selection_weight > 1:
+                    tile.selected_variant = position
+                return tile
+            position -= tile.selection_weight
\ No newline at end of file
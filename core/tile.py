@@ -1,8 +1,10 @@
 # SPDX-License-Identifier: MIT
 # SPDX-FileCopyrightText: 2025 Siemens AG
 
-from typing import List
+from typing import Callable, List, Tuple, Type
 from core.constraints import ResponseTimeConstraint, FuelConstraint, ByteCodeSizeConstraint
+from core.encoder import INSTRUCTION_ENCODINGS
+from core.formater import render_code_parts
 from core.state.functions import Function, Block
 from core.state.state import GlobalState
 from core.value import Val
@@ -17,40 +19,28 @@ class BranchOperation:
         self.target_name = target_name
         self.return_values = return_values
 
-global_apply_callbacks = []
-global_end_callbacks = []
 
-def wrap_apply_function(apply_func):
-    def wrapped_apply(self, *args, **kwargs):
-        for callback in global_apply_callbacks:
-            callback(self, *args, **kwargs)
-        res = apply_func(self, *args, **kwargs)
-        for callback in global_end_callbacks:
-            callback(self, *args, **kwargs)
-        return res
-    return wrapped_apply
-
-class ApplyMeta(type):
-    def __new__(cls, name, bases, attrs):
-        orig_apply = attrs.get('apply', None)
-
-        if callable(orig_apply):
-            def wrapped_apply(self, *args, **kwargs):
-                for callback in global_apply_callbacks:
-                    callback(self, *args, **kwargs)
-                res = orig_apply(self, *args, **kwargs)
-                for callback in global_end_callbacks:
-                    callback(self, *args, **kwargs)
-                return res
-
-            attrs['apply'] = wrapped_apply
-
-        return super().__new__(cls, name, bases, attrs)
-
-
-class AbstractTile(metaclass=ApplyMeta):
+class AbstractTile:
     metrics_dependent_on_input = False
     name = "AbstractTile"
+    # Concrete value types the tile needs on top of the stack, the last entry being the topmost value. Tiles declaring
+    # them are indexed by the tile loader. Tiles that need more than the types still override can_be_placed.
+    stack_inputs: Tuple[Type[Val], ...] | None = None
+    # Value types the tile pushes and a pure function mapping the raw input values (in stack order) to the raw output
+    # value, or a tuple of them for more than one output. Tiles declaring all three get a generic apply.
+    stack_outputs: Tuple[Type[Val], ...] | None = None
+    kernel: Callable | None = None
+    # Lower bound of get_byte_code_size. Derived from a blank instance if not given, see core.feasibility
+    min_byte_code_size: int | None = None
+    # How many plain tiles the tile stands for when a tile is drawn at random, e.g. one per parameter value. A strategy
+    # that draws one of them stores its position in selected_variant, otherwise the tile draws the parameter itself.
+    selection_weight: int = 1
+    selected_variant: int | None = None
+    # If generating the nested code of the tile restores the constraints afterward, like loops do
+    restores_constraints: bool = False
+    # The instruction of tiles that emit a single instruction without immediates, e.g. "i32.add". It gives the code,
+    # the binary encoding and the byte code size of the tile, see core.encoder.INSTRUCTION_ENCODINGS.
+    instruction: str | None = None
 
     def __init__(self, seed: int):
         self.seed = seed
@@ -58,18 +48,38 @@ class AbstractTile(metaclass=ApplyMeta):
         self.fuel_cost = 1
         self.byte_code_size = 1
 
-    @staticmethod
-    def can_be_placed(current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> bool:
+    @classmethod
+    def can_be_placed(cls, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> bool:
         """
-        Returns if the tile can be placed in the current state.
+        Returns if the tile can be placed in the current state. By default, this checks the top of the stack against
+        stack_inputs.
         """
-        raise NotImplementedError
+        if cls.stack_inputs is None:
+            raise NotImplementedError
+        return current_state.stack.get_current_frame().top_types_match(cls.stack_inputs)
+
+    @classmethod
+    def get_min_nested_tiles(cls, current_state: GlobalState) -> int:
+        """
+        Returns the minimum number of tiles placed when the function or blocks nested in the tile are generated. Tiles
+        without nested code and tiles whose nested code was already generated place none.
+        """
+        return 0
 
     def apply(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block])-> None | bool | BranchOperation:
         """
-        Applies the tile to the current state. Returns the branch operation if there is one.
+        Applies the tile to the current state. Returns the branch operation if there is one. By default, this pops
+        stack_inputs, passes their values to the kernel and pushes the result as stack_outputs.
         """
-        raise NotImplementedError
+        if self.kernel is None:
+            raise NotImplementedError
+        frame = current_state.stack.get_current_frame()
+        inputs = frame.stack_pop_n_in_order(len(self.stack_inputs))
+        result = self.kernel(*[value.value for value in inputs])
+        if len(self.stack_outputs) == 1:
+            result = (result,)
+        for output_type, value in zip(self.stack_outputs, result or ()):
+            frame.stack_push(output_type(value))
 
     def apply_constraints(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block], static_metrics=True, run_time_metrics=True) -> GlobalState:
         """
@@ -87,14 +97,40 @@ class AbstractTile(metaclass=ApplyMeta):
 
     def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
         """
-        Returns the code that the tile represents.
+        Returns the code that the tile represents. By default, this is the instruction of the tile or the rendered
+        generate_code_parts.
         """
-        raise NotImplementedError
+        if self.instruction is not None:
+            return self.instruction
+        parts = self.generate_code_parts(current_state, current_function, current_blocks)
+        if parts is None:
+            raise NotImplementedError
+        return render_code_parts(parts, current_state, current_function, current_blocks)
+
+    def generate_code_parts(self, current_state: GlobalState, current_function: Function,
+                            current_blocks: List[Block]) -> list | None:
+        """
+        Returns the code of a tile that nests code as a list of lines and CodeBody parts, see core.formater.CodeWriter.
+        Returns None for tiles whose code is given by generate_code only.
+        """
+        return None
+
+    def encode(self, encoder, current_state: GlobalState, current_function: Function,
+               current_blocks: List[Block]) -> bytes | None:
+        """
+        Returns the binary encoding of the tile, see core.encoder.ModuleEncoder for the indices of the module. Returns
+        None for tiles that nest code, their code parts are encoded instead.
+        """
+        if self.instruction is not None:
+            return INSTRUCTION_ENCODINGS[self.instruction]
+        return None
 
     def get_byte_code_size(self):
         """
-        Returns the byte code size of the tile.
+        Returns the byte code size of the tile. By default, this is the size of the encoded instruction of the tile.
         """
+        if self.instruction is not None:
+            return len(INSTRUCTION_ENCODINGS[self.instruction])
         return self.byte_code_size
 
     def get_fuel_cost(self):
@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Statistics of measured wall-clock times, see PerformanceMetric.RESPONSE_TIME in core.runner.
+"""
+
+import math
+import statistics
+from typing import List
+
+
+class TimingSummary:
+    """
+    A summary of repeated time measurements in nanoseconds. The slowest and fastest samples are trimmed before the
+    mean, the standard deviation and the confidence interval of the mean are computed.
+    """
+
+    def __init__(self, samples: List[int], trim: float, confidence: float):
+        self.samples = samples
+        ordered = sorted(samples)
+        cut = int(len(ordered) * trim)
+        kept = ordered[cut:len(ordered) - cut] or ordered
+        self.trimmed_count = len(ordered) - len(kept)
+        self.median = statistics.median(ordered)
+        self.mean = statistics.fmean(kept)
+        self.stdev = statistics.stdev(kept) if len(kept) > 1 else 0.0
+        # Normal approximation, the repetitions are meant to be large enough
+        half_width = statistics.NormalDist().inv_cdf(0.5 + confidence / 2) * self.stdev / math.sqrt(len(kept))
+        self.confidence = confidence
+        self.ci_low = self.mean - half_width
+        self.ci_high = self.mean + half_width
+
+    def __str__(self):
+        return (f"{self.mean / 1000:.2f} us (median {self.median / 1000:.2f} us, {self.confidence:.0%} CI "
+                f"[{self.ci_low / 1000:.2f}, {self.ci_high / 1000:.2f}] us, n={len(self.samples)})")
+
+
+class ResponseTimeMeasurement:
+    """
+    The measured times of a program: compiling it once, and instantiating and invoking it in every timed repetition.
+    All times are in nanoseconds.
+    """
+
+    def __init__(self, compile_time: int, instantiate: TimingSummary, invoke: TimingSummary, warmup_runs: int):
+        self.compile_time = compile_time
+        self.instantiate = instantiate
+        self.invoke = invoke
+        self.warmup_runs = warmup_runs
+
+    @property
+    def response_time(self) -> float:
+        """
+        The response time in seconds, the trimmed mean of the invocations.
+        """
+        return self.invoke.mean / 1e9
+
+    def __str__(self):
+        return (f"compile {self.compile_time / 1000:.2f} us, instantiate {self.instantiate}, "
+                f"invoke {self.invoke}")
@@ -2,10 +2,13 @@
 # SPDX-FileCopyrightText: 2025 Siemens AG
 
 import random
+import struct
 from copy import deepcopy
 from typing import List, Type, Dict
-from core.config.config import MIN_BLOCK_TILES, MIN_FUNCTION_TILES
+import numpy as np
+from core.config.config import MIN_BLOCK_TILES, MIN_FUNCTION_TILES, FEASIBILITY_CACHE_SIZE
 from core.constraints import ConstraintsViolatedError, ConstraintType
+from core.feasibility import prune_infeasible_tiles, nested_min_tiles
 from core.loader import AbstractTileLoader
 from core.state.functions import Function, Block, BlockType
 from core.state.globals import Global
@@ -27,12 +30,12 @@ def stack_matches(global_state: GlobalState, expected: List[Type[Val]]):
     """
     Checks if the last values of the current stack frame match the expected types. This function does not modify the global state.
     """
-    if len(global_state.stack.get_current_frame().stack) < len(expected):
+    types = global_state.stack.get_current_frame().types
+    offset = len(types) - len(expected)
+    if offset < 0:
         return False
-
-    stack = global_state.stack.get_current_frame().stack_peek_n_in_order(len(expected))
-    for i in range(len(stack)):
-        if not isinstance(stack[i], expected[i]):
+    for i, expected_type in enumerate(expected):
+        if not issubclass(types[offset + i], expected_type):
             return False
     return True
 
@@ -98,9 +101,63 @@ class Finish(AbstractTile):
     def generate_code(self, current_state: GlobalState, current_function: Function, current_blocks: List[Block]) -> str:
         return f""
 
+
+class GenerationSnapshot:
+    """
+    A snapshot taken before a tile generates nested code, so a failed block or function can be regenerated without
+    throwing away the whole program. Besides the global state, generating nested blocks adds blocks and locals to the
+    current function.
+    """
+
+    def __init__(self, global_state: GlobalState, current_function: Function):
+        self.global_state = global_state
+        self.current_function = current_function
+        self.checkpoint = global_state.create_checkpoint()
+        self.block_count = len(current_function.blocks)
+        self.local_count = len(current_function.local_types)
+
+    def restore(self):
+        self.global_state.restore_checkpoint(self.checkpoint, delete=True)
+        del self.current_function.blocks[self.block_count:]
+        del self.current_function.local_types[self.local_count:]
+
+    def release(self):
+        self.global_state.delete_checkpoint(self.checkpoint)
+
+
+def apply_tile_with_backtracking(tile: AbstractTile, global_state: GlobalState, current_function: Function,
+                                 current_blocks: List[Block]) -> tuple[bool, None | bool | BranchOperation]:
+    """
+    Applies a selected tile and its constraints. If the tile generates a nested block or function and that fails, the
+    state is restored and (False, None) is returned, as long as the retry budget of the state lasts. Otherwise, the
+    error is raised. Returns (True, branch operation) if the tile was applied.
+    """
+    snapshot = None
+    if global_state.retry_budget > 0 and nested_min_tiles(type(tile), global_state)[0]:
+        snapshot = GenerationSnapshot(global_state, current_function)
+    try:
+        if global_state.hooks is None:
+            branch_operation = tile.apply(global_state, current_function, current_blocks)
+        else:
+            branch_operation = global_state.hooks.apply(tile, global_state, current_function, current_blocks)
+        tile.apply_constraints(global_state, current_function, current_blocks)
+        if snapshot is not None and global_state.constraints.any_violated():
+            raise ConstraintsViolatedError()
+    except (ConstraintsViolatedError, NoTilesLeftException):
+        if snapshot is None or global_state.retry_budget <= 0:
+            raise
+        snapshot.restore()
+        global_state.retry_budget -= 1
+        return False, None
+    if snapshot is not None:
+        snapshot.release()
+    return True, branch_operation
+
+
 def can_place_function(function: Function, global_state: GlobalState)-> bool:
     """
-    Applies the given tile to the current state. Returns the branch operation if there is one.
+    Checks if the given function can be applied to the current state. The function is executed speculatively and all
+    writes are rolled back afterward.
     """
     if not stack_matches(global_state, function.inputs):
         return False
@@ -108,11 +165,65 @@ def can_place_function(function: Function, global_state: GlobalState)-> bool:
         return False
     if global_state.constraints.any_violated():
         return False
-    #Backup global state and function
-    before_generation_checkpoint = global_state.create_checkpoint()
-    function_backup = function.create_checkpoint()
-
+    # A finished function always behaves the same on the same observable state. Its only dependency on the runtime
+    # constraints is monotonic: it fits into any larger remaining budget once it fitted and fails in any smaller one.
+    key = function_feasibility_key(function, global_state)
+    runtime_constraints = global_state.constraints.get_all_by_type(ConstraintType.RUNTIME)
+    budget = tuple(constraint.get_remaining_resource() for constraint in runtime_constraints)
+    resources = tuple(constraint.resource for constraint in runtime_constraints)
+    cached = global_state.feasibility_cache.get(key)
+    if cached is not None:
+        result, cached_budget = cached
+        if result and all(cost <= remaining for cost, remaining in zip(cached_budget, budget)):
+            return True
+        if not result and all(remaining <= failed for failed, remaining in zip(cached_budget, budget)):
+            return False
+    mark = global_state.begin_speculation()
+    # Locals created during the run are the only writes to the function itself
+    global_state.journal.record(function.local_types.__delitem__, slice(len(function.local_types), None))
+    try:
+        result = _simulate_function(function, global_state)
+        # A run that fitted stores the resources it used, a failed one the budget it failed with
+        used = tuple(constraint.resource - resource for constraint, resource in zip(runtime_constraints, resources))
+    finally:
+        global_state.rollback_speculation(mark)
+    if len(global_state.feasibility_cache) >= FEASIBILITY_CACHE_SIZE:
+        global_state.feasibility_cache.clear()
+    global_state.feasibility_cache[key] = (result, used if result else budget)
+    return result
+
+def value_key(value):
+    """
+    Returns a hashable key of a value. Floats, including numpy f32 values, are keyed by their bit pattern, so -0.0 and
+    0.0 differ and NaN is equal to itself.
+    """
+    if isinstance(value, (float, np.floating)):
+        return struct.pack("<d", value)
+    return value
 
+def function_feasibility_key(function: Function, global_state: GlobalState) -> tuple:
+    """
+    Returns a key that covers everything a call to the given function can observe: the input values, the stack depth,
+    globals, tables and the writable part of the memory. The remaining runtime budget is compared separately and the
+    static constraints do not change while the function runs, so neither is part of the key.
+    """
+    frame = global_state.stack.get_current_frame()
+    inputs = frame.stack[len(frame.stack) - len(function.inputs):]
+    return (function.name,
+            tuple((type(value), value_key(value.value)) for value in inputs),
+            len(frame.stack),
+            len(global_state.stack.stack_frames),
+            tuple((type(global_var.value), value_key(global_var.value.value))
+                  for global_var in global_state.globals.globals),
+            tuple((name, tuple(element.value for element in table.elements))
+                  for name, table in global_state.tables.tables.items()),
+            bytes(global_state.memory.window),
+            tuple(type(constraint) for constraint in global_state.constraints.get_all_by_type(ConstraintType.RUNTIME)))
+
+def _simulate_function(function: Function, global_state: GlobalState)-> bool:
+    """
+    Runs the given function on the current state and returns whether it could be applied.
+    """
     global_state.stack.push_frame(global_state.stack.get_current_frame().stack_pop_n_in_order(len(function.inputs)),
                                   name=function.name)
 
@@ -122,25 +233,23 @@ def can_place_function(function: Function, global_state: GlobalState)-> bool:
             # If local does not exist, add it to the stack
             global_state.stack.get_current_frame().locals.add(function.local_types[i].get_default_value())
 
+    hooks = global_state.hooks
     for tile in function.tiles:
         # Apply before constraints to limit recursion depth before checking tile
         tile.apply_constraints(global_state, function, [], static_metrics=False)
         if global_state.constraints.any_violated():
-            global_state.restore_checkpoint(before_generation_checkpoint, delete=True)
-            function.restore_checkpoint(function_backup, delete=True)
             return False
         if not tile.can_be_placed(global_state, function, []):
-            global_state.restore_checkpoint(before_generation_checkpoint, delete=True)
-            function.restore_checkpoint(function_backup, delete=True)
             return False
-        branch_operation = tile.apply(global_state, function, [])
+        if hooks is None:
+            branch_operation = tile.apply(global_state, function, [])
+        else:
+            branch_operation = hooks.apply(tile, global_state, function, [])
         if branch_operation is not None:
             # If the tile is a branch operation, we need to apply the branch operation to the global state
             # and return the branch operation
             if isinstance(branch_operation, BranchOperation):
                 if branch_operation.target_index == 0: # If index was already counted to zero, we need to handle the return.
-                    global_state.restore_checkpoint(before_generation_checkpoint, delete=True)
-                    function.restore_checkpoint(function_backup, delete=True)
                     return True
                 else: # The next block has to handle the branch operation, but we are already at function level, so raise an error.
                     raise ValueError(f"Branch operation {branch_operation} is not valid beyond function level.")
@@ -148,13 +257,9 @@ def can_place_function(function: Function, global_state: GlobalState)-> bool:
     # Write back current stack values to the previous stack frame
     for val in global_state.stack.get_current_frame().stack:
         if not global_state.stack.get_last_frame().can_push_to_stack(1):
-            global_state.restore_checkpoint(before_generation_checkpoint, delete=True)
-            function.restore_checkpoint(function_backup, delete=True)
             return False
         global_state.stack.get_last_frame().stack_push(val)
     global_state.stack.pop_frame()
-    global_state.restore_checkpoint(before_generation_checkpoint, delete=True)
-    function.restore_checkpoint(function_backup, delete=True)
     return True
 
 def apply_function(function: Function, global_state: GlobalState)-> None | BranchOperation:
@@ -173,8 +278,12 @@ def apply_function(function: Function, global_state: GlobalState)-> None | Branc
             #If local does not exist, add it to the stack
             global_state.stack.get_current_frame().locals.add(function.local_types[i].get_default_value())
 
+    hooks = global_state.hooks
     for tile in function.tiles:
-        branch_operation = tile.apply(global_state, function, [])
+        if hooks is None:
+            branch_operation = tile.apply(global_state, function, [])
+        else:
+            branch_operation = hooks.apply(tile, global_state, function, [])
         tile.apply_constraints(global_state, function, [], static_metrics=False)
 
         if branch_operation is not None:
@@ -233,6 +342,7 @@ def generate_function(tile_loader: AbstractTileLoader, name: str, input_types: L
     while True:
         # Get all placeable tiles
         placeable_tiles = tile_loader.get_placeable_tiles(global_state, current_function=f, current_blocks=[])
+        placeable_tiles = prune_infeasible_tiles(placeable_tiles, global_state, f, [], fixed_output_types)
         # Check if function can be finished
         if compare_stack_frame_for_type_equality(global_state.stack.get_current_frame(), fixed_output_types) and MIN_FUNCTION_TILES <= len(f.tiles):
             if is_entry:
@@ -247,9 +357,10 @@ def generate_function(tile_loader: AbstractTileLoader, name: str, input_types: L
 
         tile = selection_strategy.select(placeable_tiles, global_state, f, [])(random.randint(0, 2 ** 32 - 1))
 
-        # Apply tile to global state
-        branch_operation = tile.apply(global_state, f, [])
-        tile.apply_constraints(global_state, f, [])
+        # Apply tile to global state, a failed nested block or function is discarded and another tile is selected
+        applied, branch_operation = apply_tile_with_backtracking(tile, global_state, f, [])
+        if not applied:
+            continue
         if isinstance(branch_operation, BranchOperation):
             # Now we now, that the file was an block tile and we are not returning via the conventional path. For this, we have to push a phantom result on the stack to get through static code analysis.
             if type(tile).__name__=="BlockTile":
@@ -316,16 +427,12 @@ def compare_stack_frame_for_type_equality(current_stack_frame: StackFrame, expec
     """
     if expected_var_types is None:
         return True
-    if len(current_stack_frame.stack) != len(expected_var_types):
-        return False
-    for stack_val_0, expected in zip(current_stack_frame.stack, expected_var_types):
-        if type(stack_val_0) != expected:
-            return False
-    return True
+    return current_stack_frame.types == list(expected_var_types)
 
 def can_place_block(global_state: GlobalState,function: Function, current_blocks: List[Block], block: Block, repetitions: int = 1)-> bool:
     """
-    Checks if the given block can be applied to the current state.
+    Checks if the given block can be applied to the current state. The block is executed speculatively and all writes
+    are rolled back afterward.
     """
     if not stack_matches(global_state, block.inputs):
         return False
@@ -338,45 +445,47 @@ def can_place_block(global_state: GlobalState,function: Function, current_blocks
     if global_state.constraints.any_violated():
         return False
 
-    #Backup global state and function
-    before_generation_checkpoint = global_state.create_checkpoint()
-    function_backup = function.create_checkpoint()
+    mark = global_state.begin_speculation()
+    # Locals created during the run are the only writes to the function itself
+    global_state.journal.record(function.local_types.__delitem__, slice(len(function.local_types), None))
+    try:
+        return _simulate_block(global_state, function, current_blocks, block, repetitions)
+    finally:
+        global_state.rollback_speculation(mark)
 
+def _simulate_block(global_state: GlobalState,function: Function, current_blocks: List[Block], block: Block, repetitions: int)-> bool:
+    """
+    Runs the given block on the current state and returns whether it could be applied.
+    """
     global_state.stack.push_frame(stack=global_state.stack.get_current_frame().stack_pop_n_in_order(len(block.inputs)),
                                   name=block.name)
     global_state.stack.get_current_frame().locals = global_state.stack.get_last_frame().locals
 
+    hooks = global_state.hooks
     for rep in range(repetitions):
         for tile in block.tiles:
             # Apply before constraints to limit recursion depth before checking tile
             tile.apply_constraints(global_state, function, current_blocks + [block], static_metrics=False)
             if global_state.constraints.any_violated():
-                global_state.restore_checkpoint(before_generation_checkpoint, delete=True)
-                function.restore_checkpoint(function_backup, delete=True)
                 return False
             if not tile.can_be_placed(global_state, function, current_blocks+[block]):
-                global_state.restore_checkpoint(before_generation_checkpoint, delete=True)
-                function.restore_checkpoint(function_backup, delete=True)
                 return False
-            branch_operation = tile.apply(global_state, function, current_blocks+[block])
+            if hooks is None:
+                branch_operation = tile.apply(global_state, function, current_blocks+[block])
+            else:
+                branch_operation = hooks.apply(tile, global_state, function, current_blocks+[block])
             if branch_operation is not None:
                 # If the tile is a branch operation, we need to apply the branch operation to the global state
                 # and return the branch operation
                 if isinstance(branch_operation, BranchOperation):
-                    global_state.restore_checkpoint(before_generation_checkpoint, delete=True)
-                    function.restore_checkpoint(function_backup, delete=True)
                     return True
 
     # Write back current stack values to the previous stack frame
     for val in global_state.stack.get_current_frame().stack:
         if not global_state.stack.get_last_frame().can_push_to_stack(1):
-            global_state.restore_checkpoint(before_generation_checkpoint, delete=True)
-            function.restore_checkpoint(function_backup, delete=True)
             return False
         global_state.stack.get_last_frame().stack_push(val)
     global_state.stack.pop_frame()
-    global_state.restore_checkpoint(before_generation_checkpoint, delete=True)
-    function.restore_checkpoint(function_backup, delete=True)
     return True
 
 def apply_block(global_state: GlobalState,function: Function, current_blocks: List[Block], block: Block, repetitions: int = 1)-> bool | BranchOperation:
@@ -400,9 +509,13 @@ def apply_block(global_state: GlobalState,function: Function, current_blocks: Li
             # If local does not exist, add it to the stack
             global_state.stack.get_current_frame().locals.add(function.local_types[i].get_default_value())
 
+    hooks = global_state.hooks
     for rep in range(repetitions):
         for tile in block.tiles:
-            branch_operation = tile.apply(global_state, function, current_blocks)
+            if hooks is None:
+                branch_operation = tile.apply(global_state, function, current_blocks)
+            else:
+                branch_operation = hooks.apply(tile, global_state, function, current_blocks)
             tile.apply_constraints(global_state, function, current_blocks,static_metrics=False)
             if branch_operation is not None:
                 # If the tile is a branch operation, we need to apply the branch operation to the global state
@@ -451,15 +564,17 @@ def generate_block(tile_loader: AbstractTileLoader, global_state: GlobalState, c
 
     while True:
         placeable_tiles = tile_loader.get_placeable_tiles(global_state, current_function, blocks+[block])
+        placeable_tiles = prune_infeasible_tiles(placeable_tiles, global_state, current_function, blocks+[block],
+                                                 fixed_output_types)
         if compare_stack_frame_for_type_equality(global_state.stack.get_current_frame(), fixed_output_types) and MIN_BLOCK_TILES <= len(block.tiles):
             placeable_tiles.append(Finish)
         if not placeable_tiles:
             raise NoTilesLeftException()
 
         tile = tile_loader.selection_strategy.select(placeable_tiles, global_state, current_function, blocks + [block])(random.randint(0, 2 ** 32 - 1))
-        branch_operation = tile.apply(global_state, current_function, blocks+[block])
-
-        tile.apply_constraints(global_state, current_function, blocks+[block])
+        applied, branch_operation = apply_tile_with_backtracking(tile, global_state, current_function, blocks+[block])
+        if not applied:
+            continue
 
         if isinstance(branch_operation, BranchOperation):
             if type(tile).__name__ == "BlockTile":
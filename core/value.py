@@ -11,6 +11,7 @@ class Val:
     """
     A simple Wasm value that stores a value with type information.
     """
+    __slots__ = ("value",)
 
     def __init__(self, value):
         self.value = value
@@ -40,6 +41,7 @@ class Val:
 
 #Number types
 class Num(Val):
+    __slots__ = ()
 
     def __init__(self, value):
         super().__init__(value)
@@ -49,8 +51,9 @@ class Num(Val):
 
 
 class I32(Num):
+    __slots__ = ()
 
-    def __init__(self, value=np.int32(0)):
+    def __init__(self, value=0):
         super().__init__(value)
 
     @staticmethod
@@ -59,7 +62,7 @@ class I32(Num):
 
     @staticmethod
     def get_random_val():
-        return I32(np.int32(random.randint(-2 ** 31, 2 ** 31 - 1)))
+        return I32(random.randint(-2 ** 31, 2 ** 31 - 1))
 
     @staticmethod
     def get_wasmtime_type():
@@ -70,15 +73,16 @@ class I32(Num):
 
     @staticmethod
     def get_default_value():
-        return I32(np.int32(0))
+        return I32(0)
 
     def __str__(self):
         return "I32: " + str(self.value)
 
 
 class I64(Num):
+    __slots__ = ()
 
-    def __init__(self, value=np.int64(0)):
+    def __init__(self, value=0):
         super().__init__(value)
 
     @staticmethod
@@ -91,11 +95,11 @@ class I64(Num):
 
     @staticmethod
     def get_random_val():
-        return I64(np.int64(random.randint(-2 ** 63, 2 ** 63 - 1)))
+        return I64(random.randint(-2 ** 63, 2 ** 63 - 1))
 
     @staticmethod
     def get_default_value():
-        return I64(np.int64(0))
+        return I64(0)
 
     def to_init_str(self):
         return f"i64.const {self.value}"
@@ -104,6 +108,7 @@ class I64(Num):
         return "I64: " + str(self.value)
 
 class F32(Num):
+    __slots__ = ()
 
     def __init__(self, value=np.float32(0.0)):
         super().__init__(value)
@@ -131,6 +136,7 @@ class F32(Num):
         return "F32: " + str(self.value)
 
 class F64(Num):
+    __slots__ = ()
 
     def __init__(self, value=np.float64(0.0)):
         super().__init__(value)
@@ -152,12 +158,13 @@ class F64(Num):
         return F64(np.float64(0.0))
 
     def to_init_str(self):
-        return f"f64.const {self.value}"
+        return f"f64.const {float(self.value)!r}"
 
     def __str__(self):
         return "F64: " + str(self.value)
 #Vector types
 class Vec(Val):
+    __slots__ = ()
 
     def __init__(self, value):
         super().__init__(value)
@@ -166,6 +173,7 @@ class Vec(Val):
         return "Vec: " + str(self.value)
 
 class V128(Vec):
+    __slots__ = ()
 
     def __init__(self, value=0):
         super().__init__(value)
@@ -174,6 +182,7 @@ class V128(Vec):
         return "V128: " + str(self.value)
 #Reference types
 class Ref(Val):
+    __slots__ = ()
 
     def __init__(self, value):
         super().__init__(value)
@@ -182,6 +191,7 @@ class Ref(Val):
         return "Ref: " + str(self.value)
 
 class RefFunc(Ref):
+    __slots__ = ()
 
     def __init__(self, value: Union[str, None]):
         super().__init__(value)
@@ -209,6 +219,7 @@ class RefFunc(Ref):
         return f"ref.null func"
 
 class RefExtern(Ref):
+    __slots__ = ()
 
     def __init__(self, value=None):
         super().__init__(value)
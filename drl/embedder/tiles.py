@@ -442,7 +442,8 @@ class TilesEmbedder:
         match tile.name:
             #Loops
             case "Create bounded loop":
-                return tile.rep_count
+                # The repetition count is only chosen once the loop is generated
+                return tile.rep_count if tile.rep_count is not None else 0
 
             #Functions
             case "Create and call function":
@@ -0,0 +1,91 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Generation of small programs for the tests.
+"""
+
+import random
+from typing import List, Type
+from core.builder import generate_program, tile_loader, GeneratorResult
+from core.constraints import ByteCodeSizeConstraint, FuelConstraint, ConstraintsViolatedError
+from core.instructions.globals import AbstractGlobalFactory
+from core.instructions.i32 import Int32Add, Int32Const
+from core.state.functions import Function
+from core.state.globals import Global
+from core.state.stack import StackOverflowError, StackValueError
+from core.state.state import GlobalState
+from core.strategy import RandomSelectionStrategy
+from core.util import apply_function, generate_function, NoTilesLeftException
+from core.value import I32
+
+# Seeds that generate a program with the default constraints of generate_program and FinishingSelectionStrategy
+GENERATING_SEEDS = [7, 10, 12]
+
+
+class FinishingSelectionStrategy(RandomSelectionStrategy):
+    """
+    Picks a kind of tile uniformly and finishes blocks early, so most seeds generate a program within the default
+    constraints.
+    """
+
+    def select(self, tiles: List[Type["AbstractTile"]], current_state, current_function, current_blocks):
+        finish = [tile for tile in tiles if tile.name == "Finish"]
+        if finish and random.random() < 0.1:
+            return finish[0]
+        name = random.choice(sorted({tile.name for tile in tiles}))
+        return random.choice([tile for tile in tiles if tile.name == name])
+
+
+def generate(seed: int, **kwargs) -> GeneratorResult | None:
+    """
+    Generates, runs and encodes the program of a seed.
+    """
+    return generate_program(seed, selection_strategy=FinishingSelectionStrategy(), **kwargs)
+
+
+def generate_state(seed: int, max_byte_code_size: int = 512, max_fuel: int = 2000) -> GlobalState | None:
+    """
+    Generates the program of a seed without running it. Returns None if the seed is rejected.
+    """
+    random.seed(seed)
+    global_state = GlobalState()
+    global_state.constraints.add(ByteCodeSizeConstraint(20, max_byte_code_size))
+    global_state.constraints.add(FuelConstraint(0, max_fuel))
+    global_state.stack.push_frame(params=None, stack=[], name="origin")
+    try:
+        generate_function(tile_loader, "run", [], global_state, selection_strategy=FinishingSelectionStrategy(),
+                          is_entry=True, fixed_output_types=[])
+    except (ConstraintsViolatedError, NoTilesLeftException, StackOverflowError, StackValueError):
+        return None
+    return global_state
+
+
+def counter_state(initial_value: int) -> GlobalState:
+    """
+    Returns a program that increments its global g and returns it. All counter programs use the same global name.
+    """
+    global_state = GlobalState()
+    global_state.stack.push_frame(params=None, stack=[], name="origin")
+    global_state.globals.add(Global(I32(initial_value), "g", True))
+    factory = AbstractGlobalFactory(0, None)
+    get_global, set_global = factory.create_global_get_tile("g"), factory.create_global_set_tile("g")
+    one = Int32Const(0)
+    one.value = 1
+    function = Function("run", 0, [], [I32])
+    function.tiles.extend([get_global(0), one, Int32Add(0), set_global(0), get_global(0)])
+    global_state.functions.set(function)
+    return global_state
+
+
+def run_states() -> list:
+    """
+    Returns the generated programs of the test seeds and counter programs, prepared like generate_program does.
+    """
+    global_states = []
+    for seed in GENERATING_SEEDS:
+        global_state = generate_state(seed)
+        global_state.memory.reinit_memory()
+        apply_function(global_state.functions.get("run"), global_state)
+        global_states.append(global_state)
+    return global_states + [counter_state(5), counter_state(-2)]
@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that arenas are outdated by writes to the tile arrays of their program only.
+"""
+
+import pickle
+import unittest
+from core.instructions.basic import Drop, NoOp
+from core.state.arena import ProgramArena
+from core.state.functions import Block, BlockType, Function
+
+
+class BlockTile(NoOp):
+    name = "Block"
+
+    def __init__(self, block: Block):
+        super().__init__(0)
+        self.block = block
+
+
+def new_function(name: str) -> Function:
+    function = Function(name, 0, [], [])
+    block = Block("inner", 0, BlockType.BLOCK)
+    block.tiles.append(Drop(0))
+    function.tiles.extend([NoOp(0), BlockTile(block)])
+    return function
+
+
+class ArenaTest(unittest.TestCase):
+
+    def test_layout(self):
+        function = new_function("f")
+        arena = ProgramArena([function])
+        self.assertEqual(arena.tile_arrays(), [function.tiles, function.tiles[1].block.tiles])
+        self.assertEqual([arena.opcode_names[opcode] for opcode in arena.opcodes], ["NoOp", "Block", "Drop"])
+        self.assertEqual(list(arena.node_child), [-1, 1, -1])
+        self.assertEqual(arena.max_block_depth, 2)
+
+    def test_writes_to_own_tile_arrays_outdate(self):
+        function = new_function("f")
+        arena = ProgramArena([function])
+        self.assertTrue(arena.is_current([function]))
+        function.tiles[1].block.tiles.append(NoOp(0))
+        self.assertFalse(arena.is_current([function]))
+        arena = ProgramArena([function])
+        function.tiles = type(function.tiles)(function.tiles)
+        self.assertFalse(arena.is_current([function]))
+        self.assertFalse(ProgramArena([function]).is_current([new_function("f")]))
+
+    def test_other_programs_do_not_outdate(self):
+        function = new_function("f")
+        arena = ProgramArena([function])
+        other = new_function("g")
+        other.tiles.append(NoOp(0))
+        other.tiles[1].block.tiles.pop()
+        self.assertTrue(arena.is_current([function]))
+        self.assertTrue(arena.copy().is_current([function]))
+
+    def test_pickled_arena_keeps_arrays(self):
+        arena = pickle.loads(pickle.dumps(ProgramArena([new_function("f")])))
+        self.assertEqual(list(arena.block_start), [0, 2])
+        self.assertEqual(arena.tiles, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
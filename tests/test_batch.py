@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that batch runs return the same results as running every job on its own, in the order of the jobs.
+"""
+
+import tempfile
+import unittest
+from wasmtime import wat2wasm
+from core.batch import ExecutionJob, ImportSpec, execute_job, job_from_result, run_batch
+from core.module_cache import ModuleCache
+from core.runner import WasmRunner
+from tests.programs import GENERATING_SEEDS, generate
+
+MEMORY = bytes(range(64))
+TRAPPING_MODULE = wat2wasm('(module (import "env" "memory" (memory 1)) (func (export "run") unreachable))')
+IMPORTING_MODULE = wat2wasm('''
+(module
+  (import "env" "twice" (func $twice (param i32) (result i32)))
+  (import "env" "memory" (memory 1))
+  (func (export "run") (result i32)
+    (i32.store8 (i32.const 3) (i32.const 200))
+    (call $twice (i32.load8_u (i32.const 5)))))
+''')
+
+
+def twice(value: int) -> int:
+    return 2 * value
+
+
+def new_jobs() -> list:
+    jobs = [job_from_result(generate(seed)) for seed in GENERATING_SEEDS]
+    jobs.append(ExecutionJob(TRAPPING_MODULE, MEMORY, key="trap"))
+    jobs.append(ExecutionJob(IMPORTING_MODULE, MEMORY, [ImportSpec("twice", ["i32"], ["i32"], twice)], key="import"))
+    return jobs
+
+
+def fields(result) -> tuple:
+    return result.key, result.fuel, result.return_values, result.memory_diff, result.error is None
+
+
+class BatchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.jobs = new_jobs()
+        cls.directory = tempfile.TemporaryDirectory()
+        runner = WasmRunner(module_cache=ModuleCache(cls.directory.name))
+        cls.expected = [fields(execute_job(job, runner)) for job in cls.jobs]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_single_runs(self):
+        results = dict((key, (fuel, return_values, diff, ok)) for key, fuel, return_values, diff, ok in self.expected)
+        self.assertFalse(results["trap"][3])
+        self.assertEqual(results["import"][1:], ((10,), [(3, 3, 200)], True))
+        for seed in GENERATING_SEEDS:
+            run_result = generate(seed).abstract_run_result
+            self.assertEqual(results[seed][:2], (run_result.fuel, tuple(run_result.return_values)))
+
+    def test_threads_equal_single_runs(self):
+        results = run_batch(self.jobs, workers=2, use_threads=True, chunk_size=2, module_cache_dir=self.directory.name)
+        self.assertEqual([fields(result) for result in results], self.expected)
+
+    def test_processes_equal_single_runs(self):
+        results = run_batch(self.jobs, workers=1, chunk_size=3, module_cache_dir=self.directory.name)
+        self.assertEqual([fields(result) for result in results], self.expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
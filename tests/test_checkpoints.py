@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that checkpoints of a global state restore the state and keep references to its sub-states valid.
+"""
+
+import unittest
+from core.constraints import Constraints, FuelConstraint
+from core.state.globals import Global
+from core.state.state import GlobalState
+from core.value import I32
+
+
+def new_state() -> GlobalState:
+    global_state = GlobalState()
+    global_state.constraints.add(FuelConstraint(0, 100))
+    global_state.stack.push_frame(params=None, stack=[], name="origin")
+    return global_state
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def test_reference_taken_before_checkpoint_writes_live_state(self):
+        global_state = new_state()
+        frame = global_state.stack.get_current_frame()
+        checkpoint = global_state.create_checkpoint()
+        frame.stack_push(I32(1))
+        self.assertIs(global_state.stack.get_current_frame(), frame)
+        self.assertEqual([value.value for value in global_state.stack.get_current_frame().stack], [1])
+        global_state.restore_checkpoint(checkpoint, delete=True)
+        self.assertEqual(frame.stack, [])
+        self.assertEqual(global_state.checkpoints, {})
+
+    def test_restore_undoes_writes(self):
+        global_state = new_state()
+        global_state.globals.add(Global(I32(0), "g", True))
+        checkpoint = global_state.create_checkpoint()
+        global_state.globals.set_value("g", I32(5))
+        global_state.globals.add(Global(I32(0), "h", True))
+        global_state.memory.i32_store(0, 7)
+        global_state.constraints[FuelConstraint].update_resource(10)
+        global_state.canary_output.append(3)
+        global_state.restore_checkpoint(checkpoint)
+        self.assertEqual([global_var.name for global_var in global_state.globals.globals], ["g"])
+        self.assertEqual(global_state.globals.get_global_by_name("g").value.value, 0)
+        self.assertEqual(global_state.memory.i32_load(0), 0)
+        self.assertEqual(global_state.constraints[FuelConstraint].resource, 0)
+        self.assertEqual(global_state.canary_output, [])
+        # A checkpoint that is not deleted can be restored again
+        global_state.memory.i32_store(0, 9)
+        global_state.restore_checkpoint(checkpoint, delete=True)
+        self.assertEqual(global_state.memory.i32_load(0), 0)
+
+    def test_restore_switches_back_replaced_sub_states(self):
+        global_state = new_state()
+        constraints = global_state.constraints
+        checkpoint = global_state.create_checkpoint()
+        global_state.constraints = Constraints([FuelConstraint(0, 50)])
+        global_state.restore_checkpoint(checkpoint, delete=True)
+        self.assertIs(global_state.constraints, constraints)
+
+    def test_nested_checkpoints(self):
+        global_state = new_state()
+        outer = global_state.create_checkpoint()
+        global_state.memory.i32_store(0, 1)
+        inner = global_state.create_checkpoint()
+        global_state.memory.i32_store(4, 2)
+        global_state.delete_checkpoint(inner)
+        global_state.memory.i32_store(8, 3)
+        global_state.restore_checkpoint(outer, delete=True)
+        self.assertEqual([global_state.memory.i32_load(offset) for offset in (0, 4, 8)], [0, 0, 0])
+        # Restoring an earlier checkpoint drops the later ones
+        outer = global_state.create_checkpoint()
+        global_state.create_checkpoint()
+        global_state.restore_checkpoint(outer, delete=True)
+        self.assertEqual(global_state.checkpoints, {})
+        self.assertEqual(global_state.journal.depth, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
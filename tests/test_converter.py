@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks the single-pass WAT emitter against rendering every nesting level on its own, and that the memoized program
+is written again once the code changes.
+"""
+
+import unittest
+from wasmtime import wat2wasm
+from core.converter import global_state_to_wat_program
+from core.formater import CodeBody, indent_code
+from core.instructions.basic import Drop, NoOp
+from core.instructions.i32 import Int32Const
+from core.state.functions import Block, BlockType, Function
+from core.state.globals import Global
+from core.state.state import GlobalState
+from core.tile import AbstractTile
+from core.value import I32
+from tests.programs import GENERATING_SEEDS, generate_state
+
+
+class NestedTile(AbstractTile):
+    """
+    A tile with a nested block, like the tiles created by the block factory.
+    """
+    name = "Nested"
+
+    def __init__(self, block: Block):
+        super().__init__(0)
+        self.block = block
+
+    def generate_code_parts(self, current_state, current_function, current_blocks):
+        return self.block.generate_code_parts(current_state, current_function, current_blocks)
+
+
+def block(name: str, tiles: list) -> Block:
+    nested_block = Block(name, 0, BlockType.BLOCK)
+    nested_block.tiles.extend(tiles)
+    return nested_block
+
+
+def nested_state() -> GlobalState:
+    """
+    Returns a program with two levels of nested blocks.
+    """
+    one = Int32Const(0)
+    one.value = 1
+    inner = block("block_1", [NoOp(0)])
+    outer = block("block_0", [one, Drop(0), NestedTile(inner), NoOp(0)])
+    function = Function("run", 0, [], [])
+    function.tiles.extend([NoOp(0), NestedTile(outer), NoOp(0)])
+    global_state = GlobalState()
+    global_state.functions.set(function)
+    return global_state
+
+
+def render(parts: list, global_state: GlobalState, function: Function, current_blocks: list) -> str:
+    """
+    Renders code parts recursively and indents every body on its own, like the emitter did before it wrote in a single
+    pass.
+    """
+    lines = []
+    for item in parts:
+        if isinstance(item, str):
+            lines.append(item)
+        elif isinstance(item, CodeBody):
+            lines.append(indent_code(render(item.items, global_state, function, item.current_blocks)))
+        else:
+            tile_parts = item.generate_code_parts(global_state, function, current_blocks)
+            if tile_parts is None:
+                lines.append(item.generate_code(global_state, function, current_blocks))
+            else:
+                lines.append(render(tile_parts, global_state, function, current_blocks))
+    return "\n".join(lines)
+
+
+class ConverterTest(unittest.TestCase):
+
+    def assert_functions_rendered(self, global_state: GlobalState):
+        program = global_state_to_wat_program(global_state)
+        for function in global_state.functions.functions.values():
+            if not function.is_external:
+                self.assertIn(render(function.generate_code_parts(global_state), global_state, function, []), program)
+
+    def test_single_pass_equals_recursive_rendering(self):
+        global_state = nested_state()
+        self.assert_functions_rendered(global_state)
+        self.assertIn("\n        block\n            nop\n        end\n", global_state_to_wat_program(global_state))
+        wat2wasm(global_state_to_wat_program(global_state))
+        for seed in GENERATING_SEEDS:
+            self.assert_functions_rendered(generate_state(seed))
+
+    def test_memoized_program_follows_changes(self):
+        global_state = nested_state()
+        program = global_state_to_wat_program(global_state)
+        self.assertIs(global_state_to_wat_program(global_state), program)
+        # A tile added to a nested block
+        inner = global_state.functions.get("run").tiles[1].block.tiles[2].block
+        inner.tiles.append(NoOp(0))
+        changed = global_state_to_wat_program(global_state)
+        self.assertEqual(changed.count("nop"), program.count("nop") + 1)
+        self.assertEqual(changed, global_state_to_wat_program(global_state, memoize=False))
+        # A new global
+        global_state.globals.add(Global(I32(3), "g", True))
+        self.assertIn("$g", global_state_to_wat_program(global_state))
+        self.assertEqual(global_state_to_wat_program(global_state),
+                         global_state_to_wat_program(global_state, memoize=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that datasets are read back as written, across shards, and that failed writers leave no dataset behind.
+"""
+
+import os
+import tempfile
+import unittest
+from core.builder import GeneratorResult
+from core.dataset import DatasetReader, DatasetWriter
+from core.runner import AbstractRunResult, ExternalComputeResource
+from tests.programs import GENERATING_SEEDS, generate
+
+
+def new_result(seed: int) -> GeneratorResult:
+    run_result = AbstractRunResult(seed * 3, [ExternalComputeResource(seed, seed + 1)])
+    run_result.return_values = (seed, -seed * 0.5)
+    return GeneratorResult(seed, f"(module ;; {seed}\n)", bytearray(os.urandom(50 + seed)), run_result,
+                           bytearray(os.urandom(64)), [seed, seed + 1])
+
+
+def fields(result: GeneratorResult) -> tuple:
+    run_result = result.abstract_run_result
+    return (result.seed, result.code_str, bytes(result.byte_code), bytes(result.initial_memory), result.canary_output,
+            run_result.fuel, list(run_result.return_values),
+            [(resource.cpu_cycles, resource.gpu_cycles) for resource in run_result.ext_resources])
+
+
+class DatasetTest(unittest.TestCase):
+
+    def test_read_back_across_shards(self):
+        results = [new_result(seed) for seed in range(40)]
+        # A generated program, to cover real byte code and memory
+        results.append(generate(GENERATING_SEEDS[0]))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dataset")
+            with DatasetWriter(path, max_shard_size=1024) as writer:
+                for result in results:
+                    writer.write(result)
+            self.assertFalse(os.path.exists(writer.staging_path))
+            reader = DatasetReader(path)
+            self.assertGreater(len(reader.shard_names), 1)
+            self.assertEqual(len(reader), len(results))
+            self.assertEqual(reader.seeds(), [result.seed for result in results])
+            self.assertEqual([fields(result) for result in reader], [fields(result) for result in results])
+            for i in (0, 17, len(results) - 1):
+                self.assertEqual(fields(reader[i]), fields(results[i]))
+
+    def test_failed_writer_leaves_no_dataset(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dataset")
+            with self.assertRaises(KeyError):
+                with DatasetWriter(path) as writer:
+                    writer.write(new_result(1))
+                    raise KeyError("generation failed")
+            self.assertEqual(os.listdir(directory), [])
+            # A result that can not be encoded fails finalize, not the background thread
+            writer = DatasetWriter(path)
+            writer.write(object())
+            with self.assertRaises(RuntimeError):
+                writer.finalize()
+            writer.abort()
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_existing_dataset_is_not_overwritten(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(FileExistsError):
+                DatasetWriter(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
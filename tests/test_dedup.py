@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that the canonical program hash ignores the names of a program and nothing else.
+"""
+
+import os
+import tempfile
+import unittest
+from copy import deepcopy
+from typing import Dict
+from core.builder import generate_code_parallel
+from core.converter import global_state_to_wat_program
+from core.dedup import canonical_program_hash, SeenSet
+from core.state.state import GlobalState
+from tests.programs import generate_state, FinishingSelectionStrategy, GENERATING_SEEDS
+
+NAMED_IMMEDIATES = ("function_name", "global_name", "table_name")
+
+
+def renamed(global_state: GlobalState, names: Dict[str, str]) -> GlobalState:
+    """
+    Returns a copy of the program with its functions, globals and tables renamed.
+    """
+    global_state = deepcopy(global_state)
+    global_state.functions.functions = {names.get(name, name): function
+                                        for name, function in global_state.functions.functions.items()}
+    for function in global_state.functions.functions.values():
+        function.name = names.get(function.name, function.name)
+    for global_var in global_state.globals.globals:
+        global_var.name = names.get(global_var.name, global_var.name)
+    global_state.tables.tables = {names.get(name, name): table for name, table in global_state.tables.tables.items()}
+    for table in global_state.tables.tables.values():
+        table.name = names.get(table.name, table.name)
+    for tiles in global_state.get_all_tile_arrays():
+        for tile in tiles:
+            for attribute in NAMED_IMMEDIATES:
+                if isinstance(getattr(tile, attribute, None), str):
+                    setattr(tile, attribute, names.get(getattr(tile, attribute), getattr(tile, attribute)))
+    # The tiles were changed in place, so the arena is built again
+    global_state._arena = None
+    return global_state
+
+
+def renaming(global_state: GlobalState) -> Dict[str, str]:
+    names = [name for name in global_state.functions.functions if name != "run"]
+    names += [global_var.name for global_var in global_state.globals.globals]
+    names += list(global_state.tables.tables)
+    return {name: f"renamed_{index}" for index, name in enumerate(names)}
+
+
+class CanonicalHashTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.states = [generate_state(seed) for seed in GENERATING_SEEDS]
+
+    def test_renamed_programs_hash_equal(self):
+        renamed_any = False
+        for global_state in self.states:
+            names = renaming(global_state)
+            renamed_any |= bool(names)
+            copy = renamed(global_state, names)
+            wat = global_state_to_wat_program(global_state)
+            for name, new_name in names.items():
+                wat = wat.replace(f"${name}", f"${new_name}")
+            # The copy is the same program with other names
+            self.assertEqual(global_state_to_wat_program(copy), wat)
+            self.assertEqual(canonical_program_hash(copy), canonical_program_hash(global_state))
+        self.assertTrue(renamed_any)
+
+    def test_different_programs_hash_different(self):
+        digests = {canonical_program_hash(global_state) for global_state in self.states}
+        self.assertEqual(len(digests), len(self.states))
+        changed_any = False
+        for global_state in self.states:
+            copy = deepcopy(global_state)
+            constant = next((tile for tiles in copy.get_all_tile_arrays() for tile in tiles
+                             if tile.name == "I32Const"), None)
+            if constant is None:
+                continue
+            changed_any = True
+            constant.value += 1
+            copy._arena = None
+            self.assertNotEqual(canonical_program_hash(copy), canonical_program_hash(global_state))
+        self.assertTrue(changed_any)
+
+
+class SeenSetTest(unittest.TestCase):
+
+    def test_reopened_set_keeps_digests(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "seen")
+            with SeenSet(path, capacity=2) as seen_set:
+                self.assertTrue(seen_set.add(b"a" * 16))
+                self.assertFalse(seen_set.add(b"a" * 16))
+                self.assertTrue(seen_set.add(b"b" * 16))
+            with SeenSet(path, capacity=2) as seen_set:
+                self.assertIn(b"a" * 16, seen_set)
+                # The oldest digest is forgotten once the capacity is reached
+                self.assertTrue(seen_set.add(b"c" * 16))
+                self.assertNotIn(b"a" * 16, seen_set)
+                self.assertEqual(len(seen_set), 2)
+
+    def test_parallel_generation_drops_seen_programs(self):
+        seen_set = SeenSet()
+        kwargs = dict(processes=1, shard_size=4, selection_strategy=FinishingSelectionStrategy())
+        first = list(generate_code_parallel(0, 13, seen_set=seen_set, **kwargs))
+        self.assertEqual([result.seed for result in first], GENERATING_SEEDS)
+        self.assertEqual(len(seen_set), len(GENERATING_SEEDS))
+        # Every program of a second run over the same seeds was seen before
+        self.assertEqual(list(generate_code_parallel(0, 13, seen_set=seen_set, **kwargs)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks the binary encoder against wasmtime.wat2wasm and the byte code sizes of the tiles against their encodings.
+"""
+
+import unittest
+from typing import List, Tuple
+from wasmtime import wat2wasm
+from core.converter import global_state_to_wat_program
+from core.encoder import ModuleEncoder, global_state_to_wasm
+from core.instructions.i64 import Int64Store32
+from tests.programs import GENERATING_SEEDS, generate_state
+
+
+def sections(module: bytes) -> List[Tuple[int, bytes]]:
+    """
+    Splits a module into its sections, without the custom sections like the name section.
+    """
+    result = []
+    position = 8
+    while position < len(module):
+        section_id = module[position]
+        position += 1
+        size = shift = 0
+        while True:
+            byte = module[position]
+            position += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+        if section_id != 0:
+            result.append((section_id, module[position:position + size]))
+        position += size
+    return result
+
+
+class EncoderTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.states = [generate_state(seed) for seed in GENERATING_SEEDS]
+
+    def test_states_are_generated(self):
+        self.assertNotIn(None, self.states)
+
+    def test_module_equals_wat2wasm(self):
+        for global_state in self.states:
+            expected = wat2wasm(global_state_to_wat_program(global_state, memoize=False))
+            self.assertEqual(sections(global_state_to_wasm(global_state, memoize=False)), sections(expected))
+
+    def test_byte_code_size_is_encoded_size(self):
+        for global_state in self.states:
+            encoder = ModuleEncoder([global_state])
+            encoder.encode()
+            for function in global_state.functions.functions.values():
+                for tiles in function.get_all_tile_arrays():
+                    for tile in tiles:
+                        encoded = tile.encode(encoder, global_state, function, [])
+                        if encoded is not None:
+                            self.assertEqual(len(encoded), tile.get_byte_code_size(), tile.name)
+
+    def test_instruction_tiles_emit_their_instruction(self):
+        # Memory instructions are encoded with their natural alignment and offset 0
+        self.assertEqual(Int64Store32(0).generate_code(None, None, []), "i64.store32")
+        self.assertEqual(Int64Store32(0).encode(None, None, None, []), b"\x3E\x02\x00")
+        self.assertEqual(Int64Store32(0).get_byte_code_size(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
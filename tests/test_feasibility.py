@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that the tiles removed by the feasibility bounds can not lead to a finished function.
+"""
+
+import random
+import unittest
+from unittest import mock
+from core import util
+from core.builder import tile_loader
+from core.constraints import ByteCodeSizeConstraint, FuelConstraint, ConstraintsViolatedError
+from core.feasibility import prune_infeasible_tiles, min_byte_code_size
+from core.state.functions import Function
+from core.state.stack import StackOverflowError, StackValueError
+from core.state.state import GlobalState
+from core.strategy import RandomSelectionStrategy
+from core.util import generate_function, NoTilesLeftException
+
+# Byte code sizes at which some but not all tiles are pruned at the start of a function
+MAX_BYTE_CODE_SIZES = (8, 9, 12)
+ATTEMPTS = 20
+
+
+def new_state(max_byte_code_size: int) -> GlobalState:
+    global_state = GlobalState()
+    global_state.constraints.add(ByteCodeSizeConstraint(0, max_byte_code_size))
+    global_state.constraints.add(FuelConstraint(0, 1000))
+    global_state.stack.push_frame(params=None, stack=[], name="origin")
+    return global_state
+
+
+class CheapestFirstStrategy(RandomSelectionStrategy):
+    """
+    Places the given tile first and then finishes as cheaply as possible: Finish if offered, otherwise a random tile of
+    the smallest byte code size.
+    """
+
+    def __init__(self, first_tile_name: str):
+        self.first_tile_name = first_tile_name
+        self.placed_first = False
+
+    def select(self, tiles, current_state, current_function, current_blocks):
+        if not self.placed_first:
+            self.placed_first = True
+            # The first tile is taken from all placeable tiles, it may have been pruned
+            return next(tile for tile in tile_loader.get_placeable_tiles(current_state, current_function,
+                                                                         current_blocks)
+                        if tile.name == self.first_tile_name)
+        for tile in tiles:
+            if tile.name == "Finish":
+                return tile
+        smallest = min(min_byte_code_size(tile) for tile in tiles)
+        return random.choice([tile for tile in tiles if min_byte_code_size(tile) == smallest])
+
+
+def finishes(first_tile_name: str, max_byte_code_size: int, seed: int) -> bool:
+    random.seed(seed)
+    global_state = new_state(max_byte_code_size)
+    try:
+        generate_function(tile_loader, "run", [], global_state, selection_strategy=CheapestFirstStrategy(first_tile_name),
+                          is_entry=True, fixed_output_types=[])
+    except (ConstraintsViolatedError, NoTilesLeftException, StackOverflowError, StackValueError):
+        return False
+    return True
+
+
+class PruningTest(unittest.TestCase):
+
+    def test_pruned_tiles_can_not_finish(self):
+        for max_byte_code_size in MAX_BYTE_CODE_SIZES:
+            random.seed(0)
+            global_state = new_state(max_byte_code_size)
+            function = Function("run", 0, inputs=[], outputs=[], is_external=False)
+            global_state.stack.push_frame([], name="run")
+            tiles = tile_loader.get_placeable_tiles(global_state, function, [])
+            kept = {tile.name for tile in prune_infeasible_tiles(tiles, global_state, function, [], [])}
+            pruned = {tile.name for tile in tiles} - kept
+            self.assertTrue(kept, max_byte_code_size)
+            self.assertTrue(pruned, max_byte_code_size)
+            # Later steps are not pruned, so only the byte code size constraint stops the attempts
+            with mock.patch.object(util, "prune_infeasible_tiles", lambda tiles, *args: tiles):
+                for name in pruned:
+                    self.assertFalse(any(finishes(name, max_byte_code_size, seed) for seed in range(ATTEMPTS)),
+                                     (max_byte_code_size, name))
+                self.assertTrue(any(finishes(name, max_byte_code_size, seed)
+                                    for name in kept for seed in range(ATTEMPTS)), max_byte_code_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
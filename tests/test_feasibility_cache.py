@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that function call feasibility is only reused for the same observable state and a sufficient runtime budget.
+"""
+
+import unittest
+from unittest import mock
+import numpy as np
+import core.util
+from core.constraints import FuelConstraint
+from core.instructions.basic import Drop
+from core.instructions.i32 import Int32Add, Int32Const
+from core.state.functions import Function
+from core.state.state import GlobalState
+from core.util import can_place_function, function_feasibility_key
+from core.value import I32, F32, F64
+
+
+def callee() -> Function:
+    """
+    Returns a function that takes an i32 and uses 4 fuel.
+    """
+    function = Function("callee", 0, [I32], [])
+    function.tiles.extend([Int32Const(0), Int32Const(0), Int32Add(0), Drop(0)])
+    return function
+
+
+def caller_state(*values) -> GlobalState:
+    global_state = GlobalState()
+    global_state.constraints.set_all([FuelConstraint(max_target=100)])
+    global_state.stack.push_frame(params=None, stack=[], name="run")
+    for value in values:
+        global_state.stack.get_current_frame().stack_push(value)
+    return global_state
+
+
+class FeasibilityCacheTest(unittest.TestCase):
+
+    def test_float_inputs_are_keyed_by_bits(self):
+        function = Function("callee", 0, [F32], [])
+        self.assertNotEqual(function_feasibility_key(function, caller_state(F32(np.float32(0.0)))),
+                            function_feasibility_key(function, caller_state(F32(np.float32(-0.0)))))
+        function = Function("callee", 0, [F64], [])
+        self.assertEqual(function_feasibility_key(function, caller_state(F64(np.float64("nan")))),
+                         function_feasibility_key(function, caller_state(F64(np.float64("nan")))))
+
+    def test_runtime_budget_is_compared(self):
+        function = callee()
+        global_state = caller_state(I32(3))
+        fuel = global_state.constraints[FuelConstraint]
+        with mock.patch.object(core.util, "_simulate_function", wraps=core.util._simulate_function) as simulate:
+            self.assertTrue(can_place_function(function, global_state))
+            # Used fuel does not change the key, the call fits while 4 fuel are left
+            fuel.set_resource(96)
+            self.assertTrue(can_place_function(function, global_state))
+            self.assertEqual(simulate.call_count, 1)
+            # Less than 4 fuel left
+            fuel.set_resource(97)
+            self.assertFalse(can_place_function(function, global_state))
+            self.assertEqual(simulate.call_count, 2)
+            fuel.set_resource(99)
+            self.assertFalse(can_place_function(function, global_state))
+            self.assertEqual(simulate.call_count, 2)
+            # Another input value is another key
+            global_state.stack.get_current_frame().stack_pop()
+            global_state.stack.get_current_frame().stack_push(I32(4))
+            fuel.set_resource(0)
+            self.assertTrue(can_place_function(function, global_state))
+            self.assertEqual(simulate.call_count, 3)
+        self.assertEqual(fuel.resource, 0)
+        self.assertEqual(len(global_state.stack.get_current_frame().stack), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
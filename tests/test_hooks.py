@@ -0,0 +1,61 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that execution hooks see every applied tile of their own state only and do not change the execution.
+"""
+
+import copy
+import unittest
+from core.hooks import subscribe
+from core.util import apply_function
+from tests.programs import GENERATING_SEEDS, generate_state
+
+
+def run(global_state) -> tuple:
+    """
+    Applies the run function of a generated program and returns what it produced.
+    """
+    global_state.memory.reinit_memory()
+    apply_function(global_state.functions.get("run"), global_state)
+    return (global_state.memory.memory, [value.value for value in global_state.stack.get_current_frame().stack],
+            list(global_state.canary_output))
+
+
+class HooksTest(unittest.TestCase):
+
+    def test_hooks_see_every_tile(self):
+        for seed in GENERATING_SEEDS:
+            expected = run(generate_state(seed))
+            global_state, other_state = generate_state(seed), generate_state(seed)
+            applying, applied = [], []
+
+            def before(tile, current_state, current_function, current_blocks):
+                self.assertIs(current_state, global_state)
+                applying.append(tile)
+
+            def after(tile, current_state, current_function, current_blocks):
+                # Tiles with nested code finish after the tiles they contain
+                self.assertIs(applying.pop(), tile)
+                applied.append(tile)
+
+            with subscribe(global_state, before, after):
+                self.assertEqual(run(global_state), expected)
+                # Hooks belong to one state
+                self.assertEqual(run(other_state), expected)
+            self.assertEqual(applying, [])
+            self.assertGreaterEqual(len(applied), len(global_state.functions.get("run").tiles))
+            self.assertIsNone(global_state.hooks)
+
+    def test_copies_share_hooks(self):
+        global_state = generate_state(GENERATING_SEEDS[0])
+        applied = []
+        with subscribe(global_state, end_callback=lambda tile, *args: applied.append(tile)) as hooks:
+            state_copy = copy.deepcopy(global_state)
+            self.assertIs(state_copy.hooks, hooks)
+            run(state_copy)
+        self.assertTrue(applied)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks core.integers against wasmtime on edge values and a seeded random sample of operands.
+"""
+
+import random
+import unittest
+from wasmtime import Engine, Instance, Module, Store, Trap, wat2wasm
+from core import integers
+from core.integers import IntegerTrap
+
+EDGE_VALUES_32 = [0, 1, -1, 2, -2, 7, 31, 32, 33, 0x7F, 0x80, 0xFF, 0x7FFF, 0x8000, -0x8000, 0xFFFF,
+                  2 ** 31 - 1, -2 ** 31, -2 ** 31 + 1, 0x55555555, -0x55555556]
+EDGE_VALUES_64 = EDGE_VALUES_32 + [63, 64, 65, 2 ** 32 - 1, 2 ** 32, -2 ** 32, 2 ** 63 - 1, -2 ** 63, -2 ** 63 + 1,
+                                   0x5555555555555555, -0x5555555555555556]
+RANDOM_SAMPLES = 300
+SEED = 20250
+
+UNARY = {"clz", "ctz", "popcnt", "eqz", "extend8_s", "extend16_s", "extend32_s"}
+# Operations whose operand or result type differs from their prefix
+CONVERSIONS = {"i32_wrap_i64": (["i64"], "i32"), "i64_extend_i32_s": (["i32"], "i64"),
+               "i64_extend_i32_u": (["i32"], "i64")}
+COMPARISONS = {"eqz", "eq", "ne", "lt_s", "lt_u", "le_s", "le_u", "gt_s", "gt_u", "ge_s", "ge_u"}
+
+
+def operation_names():
+    return [name for name in vars(integers) if name.startswith(("i32_", "i64_"))]
+
+
+def signature(name: str):
+    """
+    Returns the operand types and the result type of an operation.
+    """
+    if name in CONVERSIONS:
+        return CONVERSIONS[name]
+    value_type, operation = name[:3], name[4:]
+    params = [value_type] if operation in UNARY else [value_type, value_type]
+    return params, "i32" if operation in COMPARISONS else value_type
+
+
+def build_module():
+    functions = []
+    for name in operation_names():
+        params, result = signature(name)
+        body = " ".join(f"local.get {i}" for i in range(len(params)))
+        functions.append(f'(func (export "{name}") (param {" ".join(params)}) (result {result}) '
+                         f'{body} {name.replace("_", ".", 1)})')
+    store = Store(Engine())
+    module = Module(store.engine, wat2wasm("(module " + "\n".join(functions) + ")"))
+    return store, Instance(store, module, []).exports(store)
+
+
+def operands(value_type: str, arity: int, rng: random.Random):
+    edges = EDGE_VALUES_32 if value_type == "i32" else EDGE_VALUES_64
+    bits = 32 if value_type == "i32" else 64
+    edges = [integers.s32(value) if bits == 32 else integers.s64(value) for value in edges]
+    samples = [rng.randrange(-2 ** (bits - 1), 2 ** (bits - 1)) for _ in range(RANDOM_SAMPLES)]
+    if arity == 1:
+        return [(value,) for value in edges + samples]
+    return ([(a, b) for a in edges for b in edges] +
+            [(rng.choice(edges + samples), rng.choice(edges + samples)) for _ in range(RANDOM_SAMPLES)])
+
+
+class IntegerSemanticsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.store, cls.exports = build_module()
+
+    def test_operations_match_wasmtime(self):
+        rng = random.Random(SEED)
+        for name in operation_names():
+            params, _ = signature(name)
+            operation = getattr(integers, name)
+            function = self.exports[name]
+            for args in operands(params[0], len(params), rng):
+                with self.subTest(operation=name, args=args):
+                    try:
+                        expected = function(self.store, *args)
+                    except Trap:
+                        with self.assertRaises(IntegerTrap):
+                            operation(*args)
+                        continue
+                    self.assertEqual(operation(*args), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
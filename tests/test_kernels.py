@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks the generic apply of tiles with a kernel against wasmtime running the instruction of the tile.
+"""
+
+import itertools
+import unittest
+import numpy as np
+from wasmtime import Engine, Instance, Module, Store, wat2wasm
+from core.builder import tile_loader
+from core.state.state import GlobalState
+from core.value import I32, I64, F32, F64
+
+SAMPLES = {
+    I32: [0, 1, -1, 7, 2 ** 31 - 1, -2 ** 31, 300],
+    I64: [0, 1, -1, 9, 2 ** 63 - 1, -2 ** 63, 2 ** 40],
+    F32: [np.float32(value) for value in [0.0, -0.0, 1.5, -2.75, 3e38, float("nan"), float("inf"), 1e-40]],
+    F64: [np.float64(value) for value in [0.0, -0.0, 1.5, -2.75, 1e300, float("nan"), float("-inf"), 2.0 ** 70]],
+}
+WASM_TYPES = {I32: "i32", I64: "i64", F32: "f32", F64: "f64"}
+
+
+def kernel_tiles() -> list:
+    return [tile for tile in tile_loader.tiles if tile.kernel is not None and tile.instruction is not None]
+
+
+def comparable(value) -> object:
+    """
+    Returns a value that compares bitwise for numbers, except that all NaNs are equal.
+    """
+    if isinstance(value, (float, np.floating)):
+        return "nan" if np.isnan(value) else np.float64(value).tobytes()
+    return int(value)
+
+
+class KernelTest(unittest.TestCase):
+
+    def test_kernels_match_wasmtime(self):
+        tiles = kernel_tiles()
+        self.assertGreater(len(tiles), 100)
+        functions = []
+        for tile in tiles:
+            params = " ".join(WASM_TYPES[input_type] for input_type in tile.stack_inputs)
+            results = " ".join(WASM_TYPES[output_type] for output_type in tile.stack_outputs)
+            body = " ".join(f"local.get {i}" for i in range(len(tile.stack_inputs)))
+            functions.append(f'(func (export "{tile.name}") (param {params}) (result {results}) {body} '
+                             f'{tile.instruction})')
+        store = Store(Engine())
+        exports = Instance(store, Module(store.engine, wat2wasm("(module " + "\n".join(functions) + ")")),
+                           []).exports(store)
+        checked = 0
+        for tile in tiles:
+            for args in itertools.product(*(SAMPLES[input_type] for input_type in tile.stack_inputs)):
+                global_state = GlobalState()
+                global_state.stack.push_frame(params=None, stack=[], name="run")
+                frame = global_state.stack.get_current_frame()
+                for input_type, arg in zip(tile.stack_inputs, args):
+                    frame.stack_push(input_type(arg))
+                if not tile.can_be_placed(global_state, None, []):
+                    continue
+                with self.subTest(tile=tile.name, args=args):
+                    tile(0).apply(global_state, None, [])
+                    expected = exports[tile.name](store, *[arg.item() if isinstance(arg, np.generic) else arg for arg in args])
+                    expected = expected if isinstance(expected, list) else [expected]
+                    self.assertEqual([comparable(value.value) for value in frame.stack],
+                                     [comparable(value) for value in expected])
+                    checked += 1
+        self.assertGreater(checked, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
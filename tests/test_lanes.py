@@ -0,0 +1,142 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks the lane-parallel interpreter against the scalar interpreter and wasmtime.
+"""
+
+import unittest
+from typing import List, Tuple
+import numpy as np
+from wasmtime import Engine, Instance, Limits, Memory, MemoryType, Module, Store, Trap, wat2wasm
+from core.config.config import MEMORY_MAX_WRITE_INDEX
+from core.converter import global_state_to_wat_program
+from core.integers import IntegerTrap
+from core.instructions.basic import Drop
+from core.instructions.debug_tiles import Canary
+from core.instructions.i32 import Int32Const, Int32DivS
+from core.instructions.locals import AbstractLocalFactory
+from core.lanes import run_lanes
+from core.state.functions import Function
+from core.state.state import GlobalState
+from core.util import apply_function
+from core.value import I32
+from tests.programs import GENERATING_SEEDS, generate_state
+
+DIVISORS = [7, -3, 0, 1, -2 ** 31]
+
+
+def division_state() -> GlobalState:
+    """
+    Returns a program that records its input and the quotient 100 / input as canary output and returns the quotient.
+    """
+    global_state = GlobalState()
+    global_state.stack.push_frame(params=None, stack=[], name="origin")
+    function = Function("run", 0, [I32], [I32])
+    local_get = AbstractLocalFactory(0, None).create_local_get_tile(0)
+    dividend = Int32Const(0)
+    dividend.value = 100
+    function.tiles.extend([local_get(0), Canary(0), Drop(0), dividend, local_get(0), Int32DivS(0), Canary(0)])
+    global_state.functions.set(function)
+    return global_state
+
+
+def run_scalar(global_state: GlobalState, params: List[I32]) -> Tuple[list, list, bytes]:
+    """
+    Runs the entry function of a program with the scalar interpreter from its initial memory and globals.
+    """
+    global_state.memory.reinit_memory()
+    global_state.globals.reinit_globals()
+    global_state.canary_output.clear()
+    frame = global_state.stack.get_current_frame()
+    frame.stack.clear()
+    for param in params:
+        frame.stack_push(param)
+    apply_function(global_state.functions.get("run"), global_state)
+    return ([value.value for value in frame.stack], list(global_state.canary_output),
+            bytes(global_state.memory.memory[:MEMORY_MAX_WRITE_INDEX]))
+
+
+def run_wasmtime(wasm: bytes, memory_image: bytes, params: list) -> Tuple[list, bytes] | None:
+    """
+    Runs the entry function of a module with the given initial memory. Returns None if it traps.
+    """
+    store = Store(Engine())
+    memory = Memory(store, MemoryType(Limits(1, 1)))
+    memory.write(store, memory_image, 0)
+    instance = Instance(store, Module(store.engine, wasm), [memory])
+    try:
+        result = instance.exports(store)["run"](store, *params)
+    except Trap:
+        return None
+    if result is None:
+        result = []
+    elif not isinstance(result, (list, tuple)):
+        result = [result]
+    return list(result), bytes(memory.read(store, 0, MEMORY_MAX_WRITE_INDEX))
+
+
+def comparable(value) -> object:
+    """
+    Returns a value that compares like Wasm values do bitwise, NaNs are equal to each other and -0.0 differs from 0.0.
+    """
+    if isinstance(value, (float, np.floating)):
+        return "nan" if np.isnan(value) else np.float64(value).tobytes()
+    return int(value)
+
+
+class LanesTest(unittest.TestCase):
+
+    def test_lanes_match_scalar_runs_and_trap(self):
+        global_state = division_state()
+        result = run_lanes(global_state, params=[DIVISORS])
+        wasm = wat2wasm(global_state_to_wat_program(global_state))
+        for lane, divisor in enumerate(DIVISORS):
+            expected = run_wasmtime(wasm, global_state.memory.initial_values, [divisor])
+            if divisor == 0:
+                self.assertIsNone(expected)
+                self.assertEqual(result.errors[lane], "I32DivS traps")
+                self.assertIsNone(result.return_values[lane])
+                with self.assertRaises(IntegerTrap):
+                    run_scalar(global_state, [I32(divisor)])
+                continue
+            values, canary_output, memory = run_scalar(global_state, [I32(divisor)])
+            self.assertIsNone(result.errors[lane])
+            self.assertEqual([value.value for value in result.return_values[lane]], values)
+            self.assertEqual(values, expected[0])
+            self.assertEqual(result.canary_output[lane], canary_output)
+            self.assertEqual(canary_output, [divisor, values[0]])
+            self.assertEqual(bytes(result.memory[lane]), memory)
+
+    def test_generated_programs_match_scalar_runs_and_wasmtime(self):
+        rng = np.random.default_rng(0)
+        for seed in GENERATING_SEEDS:
+            global_state = generate_state(seed)
+            global_state.memory.reinit_memory()
+            initial_memory = global_state.memory.initial_values
+            images = rng.integers(0, 256, (8, MEMORY_MAX_WRITE_INDEX), dtype=np.uint8)
+            # The first lane starts with the initial memory of the program, like the scalar interpreter
+            images[0] = np.frombuffer(initial_memory[:MEMORY_MAX_WRITE_INDEX], dtype=np.uint8)
+            result = run_lanes(global_state, memory_images=images)
+            values, canary_output, memory = run_scalar(global_state, [])
+            self.assertIsNone(result.errors[0])
+            self.assertEqual([str(value) for value in result.return_values[0]],
+                             [str(value) for value in global_state.stack.get_current_frame().stack])
+            self.assertEqual(result.canary_output[0], canary_output)
+            self.assertEqual(bytes(result.memory[0]), memory)
+            wasm = wat2wasm(global_state_to_wat_program(global_state))
+            for lane, image in enumerate(images):
+                expected = run_wasmtime(wasm, bytes(image) + initial_memory[MEMORY_MAX_WRITE_INDEX:], [])
+                if result.errors[lane] is not None:
+                    # Lanes that leave the simulated part of the machine are stopped without trapping in Wasm
+                    if expected is not None:
+                        self.assertNotIn("traps", result.errors[lane])
+                    continue
+                self.assertIsNotNone(expected, (seed, lane))
+                self.assertEqual([comparable(value.value) for value in result.return_values[lane]],
+                                 [comparable(value) for value in expected[0]], (seed, lane))
+                self.assertEqual(bytes(result.memory[lane]), expected[1], (seed, lane))
+
+
+if __name__ == "__main__":
+    unittest.main()
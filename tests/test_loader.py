@@ -0,0 +1,42 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that the signature index of the tile loader finds the same static tiles as checking every tile.
+"""
+
+import random
+import unittest
+from core.loader import TileLoader
+from core.state.functions import Function
+from core.state.state import GlobalState
+from core.strategy import RandomSelectionStrategy
+from core.value import I32, I64, F32, F64, RefFunc
+
+VALUES = [I32(0), I32(1), I32(-1), I32(70000), I64(0), I64(-5), F32(0.5), F32(0.0), F64(-2.5), RefFunc(None)]
+
+
+class SignatureIndexTest(unittest.TestCase):
+
+    def test_index_matches_checking_every_tile(self):
+        loader = TileLoader("core/instructions/", RandomSelectionStrategy())
+        # Only the static tiles are compared
+        loader._factories = []
+        function = Function("run", 0, [], [])
+        random.seed(0)
+        for _ in range(300):
+            global_state = GlobalState()
+            global_state.stack.push_frame(params=None, stack=[], name="run")
+            for value in random.choices(VALUES, k=random.randint(0, 4)):
+                global_state.stack.get_current_frame().stack_push(value)
+            expected = [tile for tile in loader.tiles if tile.can_be_placed(global_state, function, [])]
+            self.assertEqual(loader.get_placeable_tiles(global_state, function, []), expected)
+
+    def test_tiles_are_imported_on_demand(self):
+        loader = TileLoader("core/instructions/", RandomSelectionStrategy())
+        self.assertEqual(loader.get_tile_type_by_name("I32Add").name, "I32Add")
+        self.assertEqual(sum(tile is not None for tile in loader._tiles), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
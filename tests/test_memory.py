@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that the memory window behaves like a full Wasm memory page for the writable bytes and the initial image.
+"""
+
+import copy
+import random
+import unittest
+from wasmtime import Instance, Module, Store, wat2wasm
+from core.config.config import MEMORY_MAX_WRITE_INDEX
+from core.state.memory import Memory
+from core.state.state import GlobalState
+
+STORES = [("i32_store", "i32", "i32.store", 4), ("i32_store8", "i32", "i32.store8", 1),
+          ("i32_store16", "i32", "i32.store16", 2), ("i64_store", "i64", "i64.store", 8),
+          ("i64_store32", "i64", "i64.store32", 4), ("f32_store", "f32", "f32.store", 4),
+          ("f64_store", "f64", "f64.store", 8)]
+LOADS = [("i32_load", "i32", "i32.load", 4), ("i32_load8_s", "i32", "i32.load8_s", 1),
+         ("i32_load16_u", "i32", "i32.load16_u", 2), ("i64_load", "i64", "i64.load", 8),
+         ("i64_load32_s", "i64", "i64.load32_s", 4), ("f64_load", "f64", "f64.load", 8)]
+MASKS = {"i32": 0xFFFFFFFF, "i64": 0xFFFFFFFFFFFFFFFF}
+
+
+def reference_module() -> str:
+    functions = []
+    for name, value_type, instruction, _ in STORES:
+        functions.append(f'(func (export "{name}") (param i32 {value_type}) local.get 0 local.get 1 {instruction})')
+    for name, value_type, instruction, _ in LOADS:
+        functions.append(f'(func (export "{name}") (param i32) (result {value_type}) local.get 0 {instruction})')
+    return '(module (memory (export "memory") 1) ' + " ".join(functions) + ")"
+
+
+def random_value(value_type: str):
+    if value_type in MASKS:
+        return random.randint(-MASKS[value_type] // 2 - 1, MASKS[value_type] // 2)
+    return float(random.choice([0.5, -3.25, 1e10, -0.0]))
+
+
+class MemoryTest(unittest.TestCase):
+
+    def test_memory_matches_wasmtime(self):
+        random.seed(3)
+        memory = Memory()
+        memory.randomize()
+        store = Store()
+        exports = Instance(store, Module(store.engine, wat2wasm(reference_module())), []).exports(store)
+        exports["memory"].write(store, memory.initial_values, 0)
+        for _ in range(200):
+            name, value_type, _, size = random.choice(STORES)
+            offset, value = random.randint(0, MEMORY_MAX_WRITE_INDEX - size), random_value(value_type)
+            getattr(memory, name)(offset, value)
+            exports[name](store, offset, value)
+            name, value_type, _, size = random.choice(LOADS)
+            offset = random.randint(0, MEMORY_MAX_WRITE_INDEX - size)
+            expected = exports[name](store, offset)
+            if value_type in MASKS:
+                self.assertEqual(getattr(memory, name)(offset) & MASKS[value_type], expected & MASKS[value_type])
+            else:
+                self.assertEqual(repr(getattr(memory, name)(offset)), repr(expected))
+        self.assertEqual(memory.memory, exports["memory"].read(store, 0, 65536))
+
+    def test_writes_outside_the_window_fail(self):
+        memory = Memory()
+        with self.assertRaises(ValueError):
+            memory.i32_store(MEMORY_MAX_WRITE_INDEX - 3, 1)
+        with self.assertRaises(IndexError):
+            memory.i64_load(MEMORY_MAX_WRITE_INDEX - 7)
+        self.assertEqual(memory[MEMORY_MAX_WRITE_INDEX], 0)
+
+    def test_copies_share_the_initial_image(self):
+        random.seed(4)
+        memory = Memory()
+        memory.randomize()
+        memory.i32_store(0, 7)
+        memory_copy = copy.deepcopy(memory)
+        self.assertIs(memory_copy.initial_values, memory.initial_values)
+        memory_copy.i32_store(0, 9)
+        self.assertEqual((memory.i32_load(0), memory_copy.i32_load(0)), (7, 9))
+        memory.reinit_memory()
+        self.assertEqual(memory.memory, memory.initial_values)
+        self.assertIs(Memory().initial_values, Memory().initial_values)
+
+    def test_speculative_writes_are_rolled_back(self):
+        global_state = GlobalState()
+        global_state.memory.i64_store(8, -1)
+        before = global_state.memory.memory
+        mark = global_state.begin_speculation()
+        global_state.memory.i32_store16(10, 0x1234)
+        global_state.memory[40] = 5
+        global_state.rollback_speculation(mark)
+        self.assertEqual(global_state.memory.memory, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that compiled modules are loaded from the cache after it is reopened, and compiled again when they can not be
+used.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from wasmtime import Instance, Module, Store, wat2wasm
+from core.module_cache import ModuleCache
+from core.runner import get_engine, get_engine_key
+
+
+def module_wasm(value: int) -> bytes:
+    return wat2wasm(f'(module (func (export "run") (result i32) (i32.const {value})))')
+
+
+class CountingCompiler:
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.calls = 0
+
+    def __call__(self, wasm: bytes) -> Module:
+        self.calls += 1
+        return Module(self.engine, wasm)
+
+
+def run(engine, module: Module) -> int:
+    store = Store(engine)
+    store.set_fuel(1000)
+    return Instance(store, module, []).exports(store)["run"](store)
+
+
+class ModuleCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = get_engine(True, "speed")
+        self.engine_key = get_engine_key(True, "speed")
+        self.compile = CountingCompiler(self.engine)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def load(self, cache: ModuleCache, wasm: bytes) -> Module:
+        return cache.load(self.engine, self.engine_key, wasm, self.compile)
+
+    def test_hit_after_reopen(self):
+        wasm = module_wasm(7)
+        self.assertEqual(run(self.engine, self.load(ModuleCache(self.directory.name), wasm)), 7)
+        cache = ModuleCache(self.directory.name)
+        self.assertEqual(run(self.engine, self.load(cache, wasm)), 7)
+        self.assertEqual((cache.hits, cache.misses, self.compile.calls), (1, 0, 1))
+
+    def test_other_engine_configuration_or_code_misses(self):
+        cache = ModuleCache(self.directory.name)
+        self.load(cache, module_wasm(1))
+        other_engine = get_engine(True, "none")
+        module = cache.load(other_engine, get_engine_key(True, "none"), module_wasm(1),
+                            CountingCompiler(other_engine))
+        self.assertEqual(run(other_engine, module), 1)
+        self.assertEqual(run(self.engine, self.load(cache, module_wasm(2))), 2)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    def test_corrupted_module_is_compiled_again(self):
+        wasm = module_wasm(3)
+        cache = ModuleCache(self.directory.name)
+        self.load(cache, wasm)
+        with open(cache.module_path(self.engine_key, wasm), "wb") as f:
+            f.write(b"not a module")
+        self.assertEqual(run(self.engine, self.load(cache, wasm)), 3)
+        self.assertEqual((cache.hits, cache.misses, self.compile.calls), (0, 2, 2))
+        # The module was stored again
+        self.load(ModuleCache(self.directory.name), wasm)
+        self.assertEqual(self.compile.calls, 2)
+
+    def test_least_recently_used_modules_are_evicted(self):
+        cache = ModuleCache(self.directory.name)
+        self.load(cache, module_wasm(1))
+        size = os.path.getsize(cache.module_path(self.engine_key, module_wasm(1)))
+        cache.max_size = 2 * size + size // 2
+        self.load(cache, module_wasm(2))
+        # The second module was used last a while ago, so it is evicted first
+        past = time.time() - 10
+        os.utime(cache.module_path(self.engine_key, module_wasm(2)), (past, past))
+        self.load(cache, module_wasm(3))
+        self.assertTrue(os.path.exists(cache.module_path(self.engine_key, module_wasm(1))))
+        self.assertFalse(os.path.exists(cache.module_path(self.engine_key, module_wasm(2))))
+        self.assertTrue(os.path.exists(cache.module_path(self.engine_key, module_wasm(3))))
+
+
+if __name__ == "__main__":
+    unittest.main()
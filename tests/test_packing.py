@@ -0,0 +1,38 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that programs packed into one module give the same results as running them separately.
+"""
+
+import unittest
+from core.encoder import global_states_to_packed_wasm
+from core.runner import WasmRunner
+from tests.programs import run_states
+
+
+def fields(result) -> tuple:
+    return result.fuel, tuple(result.return_values), len(result.ext_resources)
+
+
+class PackingTest(unittest.TestCase):
+
+    def test_packed_results_equal_separate_runs(self):
+        global_states = run_states()
+        runner = WasmRunner()
+        separate = [fields(runner.run(global_state)) for global_state in global_states]
+        self.assertEqual(separate[-2:], [(separate[-2][0], (6,), 0), (separate[-1][0], (-1,), 0)])
+        packed = [fields(result) for result in runner.run_packed(global_states)]
+        self.assertEqual(packed, separate)
+        # Every program keeps its own globals, so running the packed programs in another order gives the same results
+        packed = [fields(result) for result in runner.run_packed(global_states[::-1])]
+        self.assertEqual(packed, separate[::-1])
+
+    def test_entries_are_prefixed(self):
+        module = global_states_to_packed_wasm(run_states())
+        for k in range(5):
+            self.assertIn(f"p{k}_run".encode(), module)
+
+
+if __name__ == "__main__":
+    unittest.main()
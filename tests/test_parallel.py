@@ -0,0 +1,45 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that generating programs in worker processes gives the same programs as generate_code for a range of seeds.
+"""
+
+import unittest
+from itertools import islice
+from core.builder import generate_code, generate_code_parallel
+from tests.programs import GENERATING_SEEDS, FinishingSelectionStrategy
+
+START_SEED = 5
+SEED_COUNT = GENERATING_SEEDS[-1] - START_SEED
+
+
+def fields(result) -> tuple:
+    run_result = result.abstract_run_result
+    return (result.seed, result.code_str, bytes(result.byte_code), bytes(result.initial_memory), run_result.fuel,
+            tuple(run_result.return_values), tuple(result.canary_output))
+
+
+class ParallelGenerationTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        serial = generate_code(START_SEED, selection_strategy=FinishingSelectionStrategy())
+        cls.expected = [fields(result) for result in islice(serial, len(GENERATING_SEEDS))]
+
+    def test_serial_seeds(self):
+        self.assertEqual([result[0] for result in self.expected], GENERATING_SEEDS)
+
+    def test_parallel_equals_serial(self):
+        results = generate_code_parallel(START_SEED, SEED_COUNT, processes=2, shard_size=2,
+                                         selection_strategy=FinishingSelectionStrategy())
+        self.assertEqual([fields(result) for result in results], self.expected)
+
+    def test_unordered_yields_the_same_programs(self):
+        results = generate_code_parallel(START_SEED, SEED_COUNT, processes=2, shard_size=3, ordered=False,
+                                         selection_strategy=FinishingSelectionStrategy())
+        self.assertEqual(sorted(fields(result) for result in results), self.expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
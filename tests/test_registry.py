@@ -0,0 +1,48 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that the tile manifest is cached outside the tile directory and rebuilt when a tile module changes.
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from core import registry
+
+TILE_DIRECTORY = "core/instructions/"
+
+
+class ManifestTest(unittest.TestCase):
+
+    def test_default_path_is_outside_the_tile_directory(self):
+        path = os.path.abspath(registry.default_manifest_path(TILE_DIRECTORY))
+        self.assertFalse(path.startswith(os.path.abspath(TILE_DIRECTORY)))
+
+    def test_manifest_is_reused_until_a_file_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            manifest_path = os.path.join(directory, "cache", "manifest.json")
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                manifest = registry.load_manifest(TILE_DIRECTORY, manifest_path)
+            # Building the manifest is silent unless verbose
+            self.assertEqual(output.getvalue(), "")
+            self.assertTrue(os.path.exists(manifest_path))
+            with mock.patch.object(registry, "build_manifest", wraps=registry.build_manifest) as build:
+                self.assertEqual(registry.load_manifest(TILE_DIRECTORY, manifest_path), manifest)
+                self.assertEqual(build.call_count, 0)
+                tile_file = sorted(registry.find_python_files(TILE_DIRECTORY))[0]
+                stat = os.stat(tile_file)
+                try:
+                    os.utime(tile_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+                    registry.load_manifest(TILE_DIRECTORY, manifest_path)
+                finally:
+                    os.utime(tile_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                self.assertEqual(build.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
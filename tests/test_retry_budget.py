@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that a failed nested block or function is rolled back while the retry budget lasts, and that the budget does
+not change programs that generate without failures.
+"""
+
+import unittest
+from core.constraints import FuelConstraint
+from core.state.functions import Block, BlockType, Function
+from core.state.state import GlobalState
+from core.tile import AbstractTile
+from core.util import NoTilesLeftException, apply_tile_with_backtracking
+from core.value import I32
+from tests.programs import GENERATING_SEEDS, generate
+
+
+class FailingNestedTile(AbstractTile):
+    """
+    A tile whose nested code changes the state and then runs out of tiles.
+    """
+    name = "FailingNested"
+
+    @classmethod
+    def get_min_nested_tiles(cls, current_state: GlobalState) -> int:
+        return 1
+
+    def apply(self, current_state, current_function, current_blocks):
+        current_state.stack.get_current_frame().stack_push(I32(1))
+        current_state.memory.i32_store(0, 5)
+        current_state.constraints[FuelConstraint].update_resource(10)
+        current_function.blocks.append(Block("nested", 0, BlockType.BLOCK))
+        current_function.local_types.append(I32)
+        raise NoTilesLeftException()
+
+
+def failing_state(retry_budget: int) -> tuple:
+    global_state = GlobalState()
+    global_state.retry_budget = retry_budget
+    global_state.constraints.add(FuelConstraint(0, 100))
+    global_state.stack.push_frame(params=None, stack=[I32(7)], name="run")
+    return global_state, Function("run", 0, [], [])
+
+
+class RetryBudgetTest(unittest.TestCase):
+
+    def test_failed_nested_code_is_rolled_back(self):
+        global_state, function = failing_state(1)
+        self.assertEqual(apply_tile_with_backtracking(FailingNestedTile(0), global_state, function, []), (False, None))
+        self.assertEqual(global_state.retry_budget, 0)
+        self.assertEqual([value.value for value in global_state.stack.get_current_frame().stack], [7])
+        self.assertEqual(global_state.memory.i32_load(0), 0)
+        self.assertEqual(global_state.constraints[FuelConstraint].resource, 0)
+        self.assertEqual((function.blocks, function.local_types), ([], []))
+        # The budget is used up, so the next failure is raised
+        with self.assertRaises(NoTilesLeftException):
+            apply_tile_with_backtracking(FailingNestedTile(0), global_state, function, [])
+
+    def test_no_budget_raises(self):
+        global_state, function = failing_state(0)
+        with self.assertRaises(NoTilesLeftException):
+            apply_tile_with_backtracking(FailingNestedTile(0), global_state, function, [])
+
+    def test_budget_does_not_change_programs_without_failures(self):
+        expected = [generate(seed).byte_code for seed in GENERATING_SEEDS]
+        self.assertEqual([generate(seed, retry_budget=0).byte_code for seed in GENERATING_SEEDS], expected)
+        self.assertEqual([generate(seed, retry_budget=3).byte_code for seed in GENERATING_SEEDS], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that programs give the same results in a reused store as in a fresh one, and when stores are replaced.
+"""
+
+import unittest
+from unittest import mock
+import core.runner
+from core.runner import WasmRunner
+from tests.programs import counter_state, run_states
+
+
+def fields(result) -> tuple:
+    return result.fuel, tuple(result.return_values), len(result.ext_resources)
+
+
+class StoreReuseTest(unittest.TestCase):
+
+    def test_reused_store_gives_the_same_results(self):
+        global_states = run_states()
+        fresh = WasmRunner(store_reuse_limit=1)
+        expected = [fields(fresh.run(global_state)) for global_state in global_states]
+        reusing = WasmRunner(store_reuse_limit=100)
+        store = reusing.get_store()
+        # Every program runs twice in the same store, the counters start from their initial value each time
+        for _ in range(2):
+            self.assertEqual([fields(reusing.run(global_state)) for global_state in global_states], expected)
+        self.assertIs(reusing.get_store(), store)
+        self.assertEqual(expected[-2:], [(expected[-2][0], (6,), 0), (expected[-1][0], (-1,), 0)])
+
+    def test_store_is_replaced_after_the_limit(self):
+        runner = WasmRunner(store_reuse_limit=2)
+        first = runner.get_store()
+        self.assertIs(runner.get_store(), first)
+        second = runner.get_store()
+        self.assertIsNot(second, first)
+        self.assertIs(runner.get_store(), second)
+
+    def test_store_is_discarded_after_a_failure(self):
+        runner = WasmRunner(store_reuse_limit=100)
+        store = runner.get_store()
+        with mock.patch.object(core.runner, "run_module", side_effect=RuntimeError("trap")):
+            with self.assertRaises(RuntimeError):
+                runner.run(counter_state(0))
+        self.assertIsNot(runner.get_store(), store)
+        self.assertEqual(fields(runner.run(counter_state(0)))[1], (1,))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that the type tags of a stack frame always match its values, also after speculative runs are rolled back.
+"""
+
+import copy
+import random
+import unittest
+from core.state.stack import StackFrame
+from core.state.state import GlobalState
+from core.value import I32, I64, F32, F64, RefFunc
+
+VALUES = [I32(1), I64(2), F32(3.0), F64(4.0), RefFunc(None)]
+
+
+def assert_tags_match(test: unittest.TestCase, frame: StackFrame):
+    test.assertEqual(frame.types, [type(value) for value in frame.stack])
+
+
+class TypeTagTest(unittest.TestCase):
+
+    def test_random_operations_keep_tags(self):
+        random.seed(8)
+        global_state = GlobalState()
+        global_state.stack.push_frame(params=None, stack=[I32(0)], name="run")
+        frame = global_state.stack.get_current_frame()
+        for _ in range(50):
+            before = list(frame.stack)
+            mark = global_state.begin_speculation()
+            for _ in range(random.randint(1, 10)):
+                operation = random.randrange(3) if frame.stack else 0
+                if operation == 0 and frame.can_push_to_stack():
+                    frame.stack_push(random.choice(VALUES))
+                elif operation == 1:
+                    frame.stack_pop()
+                else:
+                    frame.stack_pop_n_in_order(random.randint(0, len(frame.stack)))
+                assert_tags_match(self, frame)
+            global_state.rollback_speculation(mark)
+            self.assertEqual(frame.stack, before)
+            assert_tags_match(self, frame)
+            # Keep a different stack for the next round
+            if frame.stack and random.random() < 0.5:
+                frame.stack_pop()
+            elif frame.can_push_to_stack():
+                frame.stack_push(random.choice(VALUES))
+        frame_copy = copy.deepcopy(frame)
+        assert_tags_match(self, frame_copy)
+        self.assertEqual(frame_copy.types, frame.types)
+
+    def test_top_types_match(self):
+        values = [I64(0), I32(1), F32(2.0)]
+        frame = StackFrame(stack=values)
+        self.assertEqual(frame.top_types(2), (I32, F32))
+        self.assertTrue(frame.top_types_match((I32, F32)))
+        self.assertTrue(frame.top_types_match(()))
+        self.assertFalse(frame.top_types_match((F32, I32)))
+        self.assertFalse(frame.top_types_match((I32, I64, I32, F32)))
+        self.assertEqual(frame.stack_pop_n_in_order(2), values[1:])
+        self.assertEqual(frame.types, [I64])
+
+
+if __name__ == "__main__":
+    unittest.main()
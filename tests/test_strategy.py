@@ -0,0 +1,45 @@
+# SPDX-License-Identifier: MIT
+# SPDX-FileCopyrightText: 2025 Siemens AG
+
+"""
+Checks that weighted tiles are drawn like a list with every tile repeated by its weight.
+"""
+
+import random
+import unittest
+from core.strategy import RandomSelectionStrategy
+from core.tile import AbstractTile
+
+
+def new_tile(name: str, weight: int = 1):
+    return type(name, (AbstractTile,), {"name": name, "selection_weight": weight})
+
+
+class WeightedSelectionTest(unittest.TestCase):
+
+    def test_weighted_draw_matches_repeated_list(self):
+        strategy = RandomSelectionStrategy()
+        for seed in range(200):
+            tiles = [new_tile("a"), new_tile("b", 5), new_tile("c"), new_tile("d", 3)]
+            repeated = [(tile, variant) for tile in tiles for variant in range(tile.selection_weight)]
+            random.seed(seed)
+            expected_tile, expected_variant = random.choice(repeated)
+            random.seed(seed)
+            tile = strategy.select(tiles, None, None, [])
+            self.assertIs(tile, expected_tile)
+            if tile.selection_weight > 1:
+                self.assertEqual(tile.selected_variant, expected_variant)
+            else:
+                self.assertIsNone(tile.selected_variant)
+
+    def test_unweighted_draw_is_unchanged(self):
+        strategy = RandomSelectionStrategy()
+        tiles = [new_tile(name) for name in "abcdef"]
+        random.seed(3)
+        expected = [random.choice(tiles) for _ in range(50)]
+        random.seed(3)
+        self.assertEqual([strategy.select(tiles, None, None, []) for _ in range(50)], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()